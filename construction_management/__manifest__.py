@@ -1,6 +1,6 @@
 {
     'name': 'Construction Management',
-    'version': '18.0.1.0',
+    'version': '18.0.1.1',
     'category': 'Construction',
     'summary': 'Manage construction projects, BOQ, progress billing, DPR, and costs',
     'author': 'Megha',
@@ -8,6 +8,7 @@
     'depends': [
         'base',
         'mail',
+        'bus',
         'project',
         'sale',
         'purchase',
@@ -20,6 +21,7 @@
     'data': [
         # 'security/security.xml',
         'security/ir.model.access.csv',
+        'data/ir_cron_data.xml',
         'views/construction_project_views.xml',
         'views/construction_boq_views.xml',
         # 'views/construction_progress_views.xml',
@@ -28,6 +30,10 @@
         'views/equipment.xml',
         'views/employee.xml',
         'views/project_timeline.xml',
+        'views/construction_timeline_template_views.xml',
+        'views/construction_project_baseline_views.xml',
+        'views/construction_project_summary_views.xml',
+        'data/construction_timeline_template_data.xml',
         'views/construction_inventory.xml',
         'views/dashboard_menu.xml',
         'views/construction_quotation_views.xml',
@@ -0,0 +1,13 @@
+from odoo import api, SUPERUSER_ID
+
+
+def migrate(cr, version):
+    """Fill the work record labor cost of the existing projects
+
+    The column is kept up to date incrementally by the work records, so the projects created
+    before it existed start from the sum of their approved work records.
+    """
+    if not version:
+        return
+    env = api.Environment(cr, SUPERUSER_ID, {})
+    env['construction.project'].search([])._rebuild_labor_cost_from_work()
@@ -0,0 +1,35 @@
+import logging
+
+_logger = logging.getLogger(__name__)
+
+# Lines classified per statement, so a large BOQ table is not rewritten in one go
+BATCH_SIZE = 50000
+
+
+def migrate(cr, version):
+    """Classify the existing BOQ lines into cost categories
+
+    The column is created and filled here, before the registry loads, so the ORM finds it
+    populated. The rules match ConstructionBOQ._guess_cost_category; ``name`` is translatable,
+    so every translation of it is searched for the equipment and subcontract keywords.
+    """
+    if not version:
+        return
+    cr.execute("ALTER TABLE construction_boq ADD COLUMN IF NOT EXISTS cost_category varchar")
+    cr.execute("SELECT COALESCE(MAX(id), 0) FROM construction_boq")
+    max_id = cr.fetchone()[0]
+    classified = 0
+    for start in range(0, max_id + 1, BATCH_SIZE):
+        cr.execute("""
+            UPDATE construction_boq
+               SET cost_category = CASE
+                       WHEN name::text ~* '(equipment|tool)' THEN 'equipment'
+                       WHEN name::text ~* 'subcontract' THEN 'subcontract'
+                       WHEN material_id IS NOT NULL THEN 'material'
+                       WHEN COALESCE(labor_hours, 0) != 0 OR COALESCE(labor_cost, 0) != 0 THEN 'labor'
+                       ELSE 'material'
+                   END
+             WHERE id >= %s AND id < %s AND cost_category IS NULL
+        """, [start, start + BATCH_SIZE])
+        classified += cr.rowcount
+    _logger.info(f"Classified {classified} BOQ lines into cost categories")
@@ -1,7 +1,13 @@
+from . import construction_dashboard_snapshot
+from . import construction_dashboard_cache
 from . import construction_boq
 from . import construction_dpr
 from . import construction_progress
 from . import construction_project
+from . import construction_task_dependency
+from . import construction_timeline_template
+from . import construction_project_baseline
+from . import construction_project_summary
 from . import construction_quality
 from . import account_analytic_line
 from . import account_move
@@ -12,5 +18,8 @@ from . import stock_move
 from . import construction_equipment
 from . import construction_employee
 from . import construction_inventory
+from . import construction_activity
+from . import construction_evm
 from . import construction_dashboard
 from . import construction_quotation
+from . import construction_benchmark
@@ -0,0 +1,154 @@
+from odoo import models, fields, api, tools
+
+
+class ConstructionActivity(models.Model):
+    _name = 'construction.activity'
+    _description = 'Construction Activity Feed'
+    _auto = False
+    _order = 'date desc, id desc'
+    _rec_name = 'activity_type'
+
+    project_id = fields.Many2one('construction.project', string='Project', readonly=True)
+    date = fields.Date(string='Date', readonly=True)
+    activity_type = fields.Selection([
+        ('dpr', 'DPR'),
+        ('quality', 'Quality'),
+        ('equipment', 'Equipment'),
+        ('work_approval', 'Work Approval'),
+        ('invoice', 'Invoice'),
+        ('payment', 'Payment'),
+    ], string='Type', readonly=True)
+    res_model = fields.Char(string='Source Model', readonly=True)
+    res_id = fields.Integer(string='Source Record', readonly=True)
+    amount = fields.Float(string='Amount', readonly=True)
+    state = fields.Char(string='Source Status', readonly=True)
+
+    # Model each activity type comes from
+    _SOURCE_MODELS = {
+        'dpr': 'construction.dpr',
+        'quality': 'construction.quality',
+        'equipment': 'construction.equipment.allocation',
+        'work_approval': 'construction.employee.work',
+        'invoice': 'account.move',
+        'payment': 'account.payment',
+    }
+
+    # Sources of the feed, as (activity type, id slot, table, project column, date expression,
+    # amount, state, condition). The source id is spread over 8 slots so every type keeps its own
+    # id space in the feed.
+    _FEED_SOURCES = [
+        ('dpr', 1, 'construction_dpr', 'project_id', 'date',
+         'NULL', 'NULL', 'date IS NOT NULL'),
+        ('quality', 2, 'construction_quality', 'project_id', 'COALESCE(inspection_date, create_date::date)',
+         'NULL', 'NULL', 'project_id IS NOT NULL'),
+        ('equipment', 3, 'construction_equipment_allocation', 'project_id', 'allocation_date',
+         'NULL', 'state', "state != 'draft'"),
+        ('work_approval', 4, 'construction_employee_work', 'project_id', 'approved_date::date',
+         'total_pay', 'state', "state = 'approved' AND approved_date IS NOT NULL"),
+        ('invoice', 5, 'account_move', 'construction_project_id', 'invoice_date',
+         'amount_total', 'state',
+         "construction_project_id IS NOT NULL AND invoice_date IS NOT NULL"
+         " AND move_type IN ('out_invoice', 'out_refund') AND state != 'draft'"),
+        ('payment', 6, 'account_payment', 'construction_project_id', 'date',
+         'amount', 'state', "construction_project_id IS NOT NULL AND state != 'draft'"),
+    ]
+
+    # Source indexes on (project, feed date), so each branch of a feed page is a range scan in
+    # feed order; the construction_dpr one is created by construction.dpr
+    _SOURCE_INDEXES = [
+        ('construction_quality_feed_index', 'construction_quality',
+         ['project_id', '(COALESCE(inspection_date, create_date::date))', 'id'], ''),
+        ('construction_equipment_allocation_project_date_index', 'construction_equipment_allocation',
+         ['project_id', 'allocation_date'], ''),
+        ('construction_employee_work_feed_index', 'construction_employee_work',
+         ['project_id', '(approved_date::date)', 'id'], "state = 'approved'"),
+        ('account_move_construction_project_index', 'account_move',
+         ['construction_project_id', 'invoice_date'], 'construction_project_id IS NOT NULL'),
+        ('account_payment_construction_project_index', 'account_payment',
+         ['construction_project_id', 'date'], 'construction_project_id IS NOT NULL'),
+    ]
+
+    _FEED_QUERY = " UNION ALL ".join(
+        f"""
+        SELECT id * 8 + {slot} AS id, {project_column} AS project_id, {date} AS date,
+               '{activity_type}'::varchar AS activity_type, '{model}'::varchar AS res_model, id AS res_id,
+               {amount}::numeric AS amount, {state}::varchar AS state
+          FROM {table}
+         WHERE {condition}
+        """
+        for (activity_type, slot, table, project_column, date, amount, state, condition), model in zip(
+            _FEED_SOURCES, _SOURCE_MODELS.values())
+    )
+
+    def init(self):
+        for index_name, table, columns, where in self._SOURCE_INDEXES:
+            tools.create_index(self._cr, index_name, table, columns, where=where)
+        tools.drop_view_if_exists(self._cr, self._table)
+        self._cr.execute(f"CREATE OR REPLACE VIEW {self._table} AS ({self._FEED_QUERY})")
+
+    def _get_readable_types_domain(self):
+        """Only list the activities whose source model the user may read"""
+        access = self.env['ir.model.access']
+        readable = [
+            activity_type for activity_type, res_model in self._SOURCE_MODELS.items()
+            if access.check(res_model, 'read', raise_exception=False)
+        ]
+        return [('activity_type', 'in', readable)]
+
+    @api.model
+    def _read_feed(self, project_ids, limit=20, cursor=None):
+        """One page of the feed of the given projects, newest first
+
+        ``cursor`` is the ``[date, id]`` of the last activity of the previous page. Each source
+        is read on its own with the keyset condition and the limit on its indexed columns, so
+        scrolling far back does not get slower and no page sorts the whole history; the
+        branches are then merged. Returns the activities and the cursor of the next page, if any.
+        """
+        readable = set(self._get_readable_types_domain()[0][2])
+        if not project_ids or not readable:
+            return self.browse(), None
+        self.env.flush_all()
+        branches, params = [], []
+        for activity_type, slot, table, project_column, date, _amount, _state, condition in self._FEED_SOURCES:
+            if activity_type not in readable:
+                continue
+            keyset = ''
+            params.append(tuple(project_ids))
+            if cursor:
+                cursor_date, cursor_id = cursor
+                # Feed ids below the cursor's, as source ids of this slot
+                keyset = f"AND ({date} < %s::date OR ({date} = %s::date AND id <= %s))"
+                params += [cursor_date, cursor_date, (cursor_id - slot - 1) // 8]
+            params.append(limit + 1)
+            branches.append(f"""
+                (SELECT id * 8 + {slot} AS id, {date} AS date
+                   FROM {table}
+                  WHERE {project_column} IN %s AND {condition} {keyset}
+                  ORDER BY {date} DESC, id DESC
+                  LIMIT %s)
+            """)
+        self.env.cr.execute(
+            " UNION ALL ".join(branches) + " ORDER BY date DESC, id DESC LIMIT %s", params + [limit + 1])
+        rows = self.env.cr.fetchall()
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = [fields.Date.to_string(rows[-1][1]), rows[-1][0]]
+        return self.browse([row[0] for row in rows]), next_cursor
+
+    @api.model
+    def _read_latest(self, project_ids, limit):
+        """The latest ``limit`` activities of each project, read with one lateral query"""
+        if not project_ids:
+            return self.browse()
+        readable = self._get_readable_types_domain()[0][2]
+        self.env.flush_all()
+        self.env.cr.execute(f"""
+            SELECT latest.id
+              FROM unnest(%s) AS project(id),
+                   LATERAL (SELECT id FROM {self._table}
+                             WHERE project_id = project.id AND activity_type IN %s
+                             ORDER BY date DESC, id DESC
+                             LIMIT %s) latest
+        """, [list(project_ids), tuple(readable) or (None,), limit])
+        return self.browse([row[0] for row in self.env.cr.fetchall()])
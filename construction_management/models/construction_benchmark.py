@@ -0,0 +1,372 @@
+from odoo import models, api
+from odoo.exceptions import UserError
+from odoo.tools import config
+from datetime import date, timedelta
+import json
+import logging
+import random
+import time
+
+_logger = logging.getLogger(__name__)
+
+BENCHMARK_PREFIX = 'BENCH-'
+BENCHMARK_SCALES = (100, 1000, 10000)
+
+# Stored project computes timed by the benchmark, recomputed from their dependencies
+BENCHMARK_COMPUTED_FIELDS = (
+    'material_cost',
+    'labor_cost',
+    'equipment_cost',
+    'total_invoiced',
+    'total_paid',
+    'progress_percent',
+)
+
+
+class ConstructionBenchmark(models.AbstractModel):
+    _name = 'construction.benchmark'
+    _description = 'Construction Dashboard Benchmark'
+
+    @api.model
+    def _run_benchmark(self, scales=BENCHMARK_SCALES, seed=42):
+        """Generate seeded data at each scale and time the dashboard and compute methods
+
+        Meant for a disposable test or demo database (e.g. from ``odoo-bin shell``): the
+        generated records are kept so that each scale only adds the projects it is missing.
+        Returns the results as JSON.
+        """
+        self._check_benchmark_access()
+
+        results = {
+            'seed': seed,
+            'date': date.today().isoformat(),
+            'version': self.env['ir.module.module'].sudo().search(
+                [('name', '=', 'construction_management')], limit=1).installed_version,
+            'scales': [],
+        }
+        for scale in sorted(scales):
+            generation = self._measure(lambda: self._generate_data(scale, seed=seed))
+            projects = self.env['construction.project'].search([('name', '=like', f'{BENCHMARK_PREFIX}%')])
+            runs = self._run_scale(projects)
+            results['scales'].append({'projects': len(projects), 'generate': generation, 'runs': runs})
+            _logger.info(f"Construction benchmark at {len(projects)} projects: {json.dumps(runs)}")
+
+        return json.dumps(results, indent=2, sort_keys=True)
+
+    @api.model
+    def _run_compute_benchmark(self, project_count=10000, seed=42):
+        """Time the grouped cost computes recomputing a whole batch of benchmark projects at once"""
+        self._check_benchmark_access()
+        self._generate_data(project_count, seed=seed)
+        projects = self.env['construction.project'].search(
+            [('name', '=like', f'{BENCHMARK_PREFIX}%')], limit=project_count)
+        results = {'seed': seed, 'projects': len(projects), 'runs': {}}
+        for fname in ('material_cost', 'total_invoiced', 'total_paid'):
+            results['runs'][f'compute_{fname}'] = self._measure_recompute(projects, fname)
+        output = json.dumps(results, indent=2, sort_keys=True)
+        _logger.info(f"Construction compute benchmark: {output}")
+        return output
+
+    def _check_benchmark_access(self):
+        """Refuse to generate benchmark data outside of a test or demo database"""
+        if not self.env.is_superuser() and not self.env.user.has_group('base.group_system'):
+            raise UserError("Only administrators can run the construction benchmark.")
+        demo = self.env['ir.module.module'].sudo().search_count([('name', '=', 'base'), ('demo', '=', True)])
+        if not config['test_enable'] and not demo:
+            raise UserError("The construction benchmark only runs on a test or demo database.")
+
+    def _measure_recompute(self, projects, fname):
+        """Wall time and query count of recomputing one stored field on the given projects"""
+        field = projects._fields[fname]
+
+        def recompute():
+            self.env.add_to_compute(field, projects)
+            projects.flush_recordset([fname])
+
+        return self._measure(recompute)
+
+    def _measure(self, func):
+        """Wall time and SQL query count of ``func``, run on a cold cache"""
+        self.env.flush_all()
+        self.env.invalidate_all()
+        queries = self.env.cr.sql_log_count
+        started = time.perf_counter()
+        func()
+        self.env.flush_all()
+        return {
+            'time_ms': round((time.perf_counter() - started) * 1000, 1),
+            'queries': self.env.cr.sql_log_count - queries,
+        }
+
+    def _run_scale(self, projects):
+        """Time every benchmarked entry point against the given projects"""
+        service = self.env['construction.dashboard.service']
+        sample = projects[:50]
+        runs = {
+            'get_dashboard_data': self._measure(lambda: service.get_dashboard_data()),
+            'compute_dashboard_sections': self._measure(lambda: service._compute_dashboard_sections()),
+            'get_project_dashboard_data': self._measure(lambda: service.get_project_dashboard_data(projects[:1].id)),
+            'get_projects_dashboard_data': self._measure(lambda: service.get_projects_dashboard_data(sample.ids)),
+        }
+        for fname in BENCHMARK_COMPUTED_FIELDS:
+            runs[f'compute_{fname}'] = self._measure_recompute(projects, fname)
+        return runs
+
+    @api.model
+    def _generate_data(self, project_count, seed=42):
+        """Create benchmark projects until there are ``project_count`` of them
+
+        The data is drawn from a generator seeded per project, so a project gets the same
+        tasks, BOQ, reports and accounting whichever scale created it.
+        """
+        existing = self.env['construction.project'].search_count([('name', '=like', f'{BENCHMARK_PREFIX}%')])
+        if existing >= project_count:
+            return self.env['construction.project']
+        masters = self._get_master_data()
+
+        projects = self.env['construction.project']
+        for batch_start in range(existing, project_count, 100):
+            batch = range(batch_start, min(batch_start + 100, project_count))
+            projects |= self._generate_batch(batch, seed, masters)
+            self.env.flush_all()
+            self.env.invalidate_all()
+        return projects
+
+    def _get_master_data(self):
+        """Shared products, employees, equipment and customers the benchmark projects use"""
+        Product = self.env['product.product']
+        products = Product.search([('default_code', '=like', f'{BENCHMARK_PREFIX}%')])
+        if not products:
+            products = Product.create([{
+                'name': f'Benchmark Material {i}',
+                'default_code': f'{BENCHMARK_PREFIX}{i:03d}',
+                'standard_price': 10.0 * (i + 1),
+            } for i in range(30)])
+
+        Employee = self.env['hr.employee']
+        employees = Employee.search([('name', '=like', f'{BENCHMARK_PREFIX}%')])
+        if not employees:
+            employees = Employee.create([{'name': f'{BENCHMARK_PREFIX}Worker {i}'} for i in range(40)])
+
+        Equipment = self.env['maintenance.equipment']
+        equipment = Equipment.search([('name', '=like', f'{BENCHMARK_PREFIX}%')])
+        if not equipment:
+            equipment = Equipment.create([{'name': f'{BENCHMARK_PREFIX}Machine {i}'} for i in range(15)])
+
+        Partner = self.env['res.partner']
+        partners = Partner.search([('name', '=like', f'{BENCHMARK_PREFIX}%')])
+        if not partners:
+            partners = Partner.create([{'name': f'{BENCHMARK_PREFIX}Customer {i}'} for i in range(20)])
+
+        return {'products': products, 'employees': employees, 'equipment': equipment, 'partners': partners}
+
+    def _generate_batch(self, indexes, seed, masters):
+        """Create the projects of the given indexes with all their dependent records"""
+        rngs = {index: random.Random(seed * 1000003 + index) for index in indexes}
+        today = date.today()
+
+        project_vals = []
+        for index in indexes:
+            rng = rngs[index]
+            start = today - timedelta(days=rng.randint(30, 720))
+            expected_material = rng.randint(50, 500) * 1000.0
+            project_vals.append({
+                'name': f'{BENCHMARK_PREFIX}{index:06d}',
+                'partner_id': rng.choice(masters['partners']).id,
+                'state': rng.choice(['draft', 'active', 'active', 'active', 'completed']),
+                'contract_value': expected_material * rng.uniform(1.5, 2.5),
+                'e_contract_value': expected_material * 2,
+                'e_material_cost': expected_material,
+                'e_labor_cost': expected_material * rng.uniform(0.3, 0.6),
+                'e_equipment_cost': expected_material * rng.uniform(0.1, 0.3),
+                'start_date': start,
+                'e_start_date': start,
+                'e_end_date': start + timedelta(days=rng.randint(180, 900)),
+            })
+        projects = self.env['construction.project'].create(project_vals)
+
+        tasks = self._generate_tasks(projects, rngs)
+        self._generate_boq(projects, rngs, masters)
+        self._generate_dprs(projects, rngs, masters)
+        self._generate_work(projects, rngs, masters, tasks)
+        self._generate_equipment(projects, rngs, masters)
+        self._generate_accounting(projects, rngs)
+        return projects
+
+    def _project_rng(self, project, rngs):
+        """Generator of the project, recovered from its benchmark name"""
+        return rngs[int(project.name[len(BENCHMARK_PREFIX):])]
+
+    def _generate_tasks(self, projects, rngs):
+        """Top-level phases with a random fan-out of subtasks"""
+        Task = self.env['project.task.simple']
+        parent_vals = []
+        for project in projects:
+            rng = self._project_rng(project, rngs)
+            start = project.start_date
+            for phase in range(rng.randint(3, 8)):
+                days = rng.randint(10, 60)
+                progress = rng.choice([0, 0, 25, 50, 75, 100])
+                parent_vals.append({
+                    'name': f'Phase {phase + 1}',
+                    'project_id': project.id,
+                    'sequence': phase,
+                    'start_date': start,
+                    'end_date': start + timedelta(days=days - 1),
+                    'progress_percent': progress,
+                    'status': 'completed' if progress == 100 else 'in_progress' if progress else 'not_started',
+                })
+                start += timedelta(days=days)
+        parents = Task.create(parent_vals)
+
+        child_vals = []
+        for parent in parents:
+            rng = self._project_rng(parent.project_id, rngs)
+            start = parent.start_date
+            for step in range(rng.randint(0, 6)):
+                days = rng.randint(2, 10)
+                progress = rng.choice([0, 50, 100])
+                child_vals.append({
+                    'name': f'{parent.name}.{step + 1}',
+                    'project_id': parent.project_id.id,
+                    'parent_id': parent.id,
+                    'sequence': step,
+                    'start_date': start,
+                    'end_date': start + timedelta(days=days - 1),
+                    'progress_percent': progress,
+                    'status': 'completed' if progress == 100 else 'in_progress' if progress else 'not_started',
+                })
+                start += timedelta(days=days)
+        return parents | Task.create(child_vals)
+
+    def _generate_boq(self, projects, rngs, masters):
+        """BOQ sections, each with material, labor and equipment lines"""
+        BOQ = self.env['construction.boq']
+        section_vals = []
+        for project in projects:
+            rng = self._project_rng(project, rngs)
+            for section in range(rng.randint(2, 5)):
+                section_vals.append({'name': f'{section + 1}', 'project_id': project.id})
+        sections = BOQ.create(section_vals)
+
+        line_vals = []
+        for section in sections:
+            rng = self._project_rng(section.project_id, rngs)
+            for line in range(rng.randint(2, 8)):
+                kind = rng.choice(['material', 'material', 'material', 'equipment', 'labor'])
+                product = rng.choice(masters['products'])
+                line_vals.append({
+                    'name': f'{section.name}.{line + 1} {"Equipment hire" if kind == "equipment" else kind.title()}',
+                    'project_id': section.project_id.id,
+                    'parent_id': section.id,
+                    'material_id': product.id if kind == 'material' else False,
+                    'quantity': rng.randint(1, 500),
+                    'unit': 'Unit',
+                    'unit_price': product.standard_price * rng.uniform(0.8, 1.2),
+                    'labor_hours': rng.randint(8, 200) if kind == 'labor' else 0,
+                })
+        BOQ.create(line_vals)
+
+    def _generate_dprs(self, projects, rngs, masters):
+        """Daily reports since the project start, each consuming a few materials"""
+        dpr_vals = []
+        for project in projects:
+            rng = self._project_rng(project, rngs)
+            elapsed = max((date.today() - project.start_date).days, 1)
+            for offset in sorted(rng.sample(range(elapsed), min(rng.randint(5, 40), elapsed))):
+                dpr_vals.append({
+                    'project_id': project.id,
+                    'date': project.start_date + timedelta(days=offset),
+                    'summary': 'Benchmark progress',
+                    'employee_count': rng.randint(2, 40),
+                    'working_hours': 8.0,
+                    'per_cost': rng.randint(30, 90),
+                    'material_used_ids': [(0, 0, {
+                        'product_id': product.id,
+                        'quantity': rng.randint(1, 50),
+                        'unit': 'Unit',
+                        'unit_cost': product.standard_price,
+                    }) for product in rng.sample(list(masters['products']), rng.randint(0, 4))],
+                })
+        self.env['construction.dpr'].create(dpr_vals)
+
+    def _generate_work(self, projects, rngs, masters, tasks):
+        """Employee work records spread over the project tasks"""
+        tasks_by_project = {}
+        for task in tasks:
+            tasks_by_project.setdefault(task.project_id.id, []).append(task.id)
+        work_vals = []
+        for project in projects:
+            rng = self._project_rng(project, rngs)
+            for _i in range(rng.randint(5, 30)):
+                start_time = rng.choice([7.0, 8.0, 9.0])
+                work_vals.append({
+                    'employee_id': rng.choice(masters['employees']).id,
+                    'project_id': project.id,
+                    'construction_task_id': rng.choice(tasks_by_project.get(project.id, [False])),
+                    'work_date': project.start_date + timedelta(days=rng.randint(0, 120)),
+                    'start_time': start_time,
+                    'end_time': start_time + rng.choice([8.0, 9.0, 10.0, 11.0]),
+                    'hourly_rate': rng.randint(15, 60),
+                    'state': rng.choice(['draft', 'confirmed', 'approved', 'approved']),
+                })
+        self.env['construction.employee.work'].create(work_vals)
+
+    def _generate_equipment(self, projects, rngs, masters):
+        """Equipment allocations with daily usage logs"""
+        allocation_vals = []
+        for project in projects:
+            rng = self._project_rng(project, rngs)
+            for _i in range(rng.randint(0, 4)):
+                allocated = project.start_date + timedelta(days=rng.randint(0, 60))
+                allocation_vals.append({
+                    'project_id': project.id,
+                    'equipment_id': rng.choice(masters['equipment']).id,
+                    'allocation_date': allocated,
+                    'return_date': allocated + timedelta(days=rng.randint(10, 90)),
+                    'hourly_rate': rng.randint(50, 400),
+                    'category': rng.choice(['owned', 'contractual']),
+                    'state': rng.choice(['allocated', 'in_use', 'in_use', 'returned']),
+                    'usage_log_ids': [(0, 0, {
+                        'date': allocated + timedelta(days=day),
+                        'hours_used': rng.randint(1, 10),
+                        'fuel_consumption': rng.randint(5, 80),
+                    }) for day in range(rng.randint(1, 15))],
+                })
+        self.env['construction.equipment.allocation'].create(allocation_vals)
+
+    def _generate_accounting(self, projects, rngs):
+        """Progress invoices and customer payments, partly posted"""
+        invoice_vals = []
+        payment_vals = []
+        for project in projects:
+            rng = self._project_rng(project, rngs)
+            for billing in range(rng.randint(0, 4)):
+                percentage = rng.choice([10, 20, 25])
+                invoice_vals.append({
+                    'move_type': 'out_invoice',
+                    'partner_id': project.partner_id.id,
+                    'construction_project_id': project.id,
+                    'progress_billing': True,
+                    'billing_percentage': percentage,
+                    'invoice_date': project.start_date + timedelta(days=30 * (billing + 1)),
+                    'invoice_line_ids': [(0, 0, {
+                        'name': f'{project.name} progress billing {percentage}%',
+                        'quantity': 1,
+                        'price_unit': project.contract_value * percentage / 100,
+                    })],
+                })
+                if rng.random() < 0.7:
+                    payment_vals.append({
+                        'payment_type': 'inbound',
+                        'partner_type': 'customer',
+                        'partner_id': project.partner_id.id,
+                        'construction_project_id': project.id,
+                        'payment_type_construction': 'progress',
+                        'amount': project.contract_value * percentage / 100,
+                        'date': project.start_date + timedelta(days=30 * (billing + 1) + 15),
+                    })
+        invoices = self.env['account.move'].create(invoice_vals)
+        invoices[:len(invoices) // 2].action_post()
+        payments = self.env['account.payment'].create(payment_vals)
+        payments[:len(payments) // 2].action_post()
@@ -1,10 +1,14 @@
 from odoo import models, fields, api
 
+# Name keywords classifying BOQ lines, shared with the migration that classified the existing lines
+EQUIPMENT_KEYWORDS = ('equipment', 'tool')
+SUBCONTRACT_KEYWORDS = ('subcontract',)
+
 
 class ConstructionBOQ(models.Model):
     _name = 'construction.boq'
     _description = 'Bill of Quantity'
-    _inherit = "translation.mixin"
+    _inherit = ['translation.mixin', 'construction.dashboard.dirty.mixin']
 
     name = fields.Char(string='BOQ Item No.', required=True, translate=True)
     project_id = fields.Many2one('construction.project', string='Project', required=True)
@@ -19,6 +23,13 @@ class ConstructionBOQ(models.Model):
 
     labor_hours = fields.Float(string='Labor Hours')
     labor_cost = fields.Float(string='Labor Cost')
+    cost_category = fields.Selection([
+        ('material', 'Material'),
+        ('labor', 'Labor'),
+        ('equipment', 'Equipment'),
+        ('subcontract', 'Subcontract'),
+    ], string='Cost Category', default='material', index=True,
+        help="Guessed from the line when it is created; changing the line later keeps the chosen category.")
     # inventory_id = fields.Many2one('construction.inventory', string='Inventory')
 
     @api.depends('quantity', 'unit_price', 'child_ids.total_price')
@@ -31,3 +42,31 @@ class ConstructionBOQ(models.Model):
                 # If no children, total = quantity * unit_price
                 rec.total_price = rec.quantity * rec.unit_price
 
+    @api.model_create_multi
+    def create(self, vals_list):
+        for vals in vals_list:
+            if not vals.get('cost_category'):
+                vals['cost_category'] = self._guess_cost_category(
+                    vals.get('name'), vals.get('material_id'), vals.get('labor_hours'), vals.get('labor_cost'))
+        return super().create(vals_list)
+
+    @api.onchange('name', 'material_id', 'labor_hours', 'labor_cost')
+    def _onchange_cost_category(self):
+        """Guess the category of new lines as they are filled in; saved lines keep theirs"""
+        for rec in self.filtered(lambda line: not line._origin):
+            rec.cost_category = self._guess_cost_category(rec.name, rec.material_id, rec.labor_hours, rec.labor_cost)
+
+    @api.model
+    def _guess_cost_category(self, name, material, labor_hours, labor_cost):
+        """Category of a line from its name keywords, its material and its labor"""
+        name = (name or '').lower()
+        if any(keyword in name for keyword in EQUIPMENT_KEYWORDS):
+            return 'equipment'
+        if any(keyword in name for keyword in SUBCONTRACT_KEYWORDS):
+            return 'subcontract'
+        if material:
+            return 'material'
+        if labor_hours or labor_cost:
+            return 'labor'
+        return 'material'
+
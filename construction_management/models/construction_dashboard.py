@@ -1,8 +1,29 @@
 from odoo import models, fields, api
+from odoo.osv import expression
+from odoo.http import request
 from datetime import datetime, date, timedelta
+import hashlib
+import json
 import logging
+import threading
+import time
 
 _logger = logging.getLogger(__name__)
+# Per-builder timings, one JSON document per line, so they can be routed and parsed on their own
+_metrics_logger = logging.getLogger(f'{__name__}.metrics')
+
+
+class _BuilderErrorHandler(logging.Handler):
+    """Collects the errors a builder logs in the current thread before falling back to sample data"""
+
+    def __init__(self):
+        super().__init__(logging.ERROR)
+        self.thread = threading.get_ident()
+        self.messages = []
+
+    def emit(self, record):
+        if record.thread == self.thread:
+            self.messages.append(record.getMessage())
 
 
 class ConstructionDashboardService(models.AbstractModel):
@@ -33,16 +54,247 @@ class ConstructionDashboardService(models.AbstractModel):
         return self.get_dashboard_data()['kpis']
 
     @api.model
-    def get_dashboard_data(self):
-        """Get both KPIs and chart data for construction dashboard"""
-        kpis = {
-            "totalProjects": self._safe_count("construction.project"),
+    def get_dashboard_data(self, token=None, filters=None, limit=None, offset=0):
+        """Get both KPIs and chart data for construction dashboard
+
+        ``filters`` may hold ``state``, ``date_from``/``date_to``, ``partner_id``, ``company_id``
+        and ``project_ids``; ``limit``/``offset`` page the per-project charts (top projects by
+        total cost first). Totals are always computed over the whole filtered set.
+        """
+        current_token = self._get_dashboard_token(params={'filters': filters, 'limit': limit, 'offset': offset})
+        if token and token == current_token:
+            return {"unchanged": True, "token": current_token}
+
+        if self._is_dashboard_debug():
+            # Debug clients get fresh builder metrics, so they bypass the shared cache
+            return self._build_dashboard_data(current_token, filters, limit, offset)
+        cache = self.env['construction.dashboard.cache'].sudo()
+        key = cache._make_key('portfolio', filters=filters, limit=limit, offset=offset)
+        return cache._get_or_compute(
+            key, current_token, lambda: self._build_dashboard_data(current_token, filters, limit, offset))
+
+    def _build_dashboard_data(self, current_token, filters=None, limit=None, offset=0):
+        """Build the portfolio dashboard payload returned by get_dashboard_data"""
+        metrics = None
+        if filters or limit or offset:
+            domain = self._build_project_domain(filters)
+            metrics = []
+            sections = self._compute_dashboard_sections(domain=domain, limit=limit, offset=offset, metrics=metrics)
+        else:
+            # Served from the stored snapshot; the refresh cron rebuilds the sections invalidated by writes
+            sections = self.env['construction.dashboard.snapshot'].sudo()._get_sections()
+        kpis = sections.pop('kpis', {})
+        result = {
+            "kpis": kpis,
+            "chartData": sections,
+            "pagination": {
+                "total": kpis.get("totalProjects", 0),
+                "limit": limit or self._get_chart_limit(),
+                "offset": offset,
+            },
+            "token": current_token,
+        }
+        if self._is_dashboard_debug():
+            result["metrics"] = metrics if metrics is not None else list(
+                self.env['construction.dashboard.snapshot'].sudo()._get_metrics().values())
+        return result
+
+    @api.model
+    def get_dashboard_cache_stats(self):
+        """Hit/miss counters of the shared dashboard cache in this worker, for monitoring"""
+        return self.env['construction.dashboard.cache'].sudo()._get_stats()
+
+    def _build_project_domain(self, filters=None):
+        """Translate dashboard filters into a construction.project domain"""
+        filters = filters or {}
+        domain = []
+        if filters.get('state'):
+            states = filters['state']
+            domain.append(('state', 'in', states if isinstance(states, list) else [states]))
+        if filters.get('date_from'):
+            domain += ['|', ('end_date', '=', False), ('end_date', '>=', filters['date_from'])]
+        if filters.get('date_to'):
+            domain += ['|', ('start_date', '=', False), ('start_date', '<=', filters['date_to'])]
+        if filters.get('partner_id'):
+            domain.append(('partner_id', '=', filters['partner_id']))
+        if filters.get('company_id'):
+            domain.append(('company_id', '=', filters['company_id']))
+        if filters.get('project_ids'):
+            domain.append(('id', 'in', filters['project_ids']))
+        return domain
+
+    def _get_chart_limit(self):
+        """Default number of projects plotted by the per-project portfolio charts"""
+        return int(self.env['ir.config_parameter'].sudo().get_param(
+            'construction_management.dashboard_chart_limit', 50))
+
+    def _scope_domain(self, project_domain, field='project_id'):
+        """Restrict a related model to the projects matched by ``project_domain``"""
+        return [(field, 'any', project_domain)] if project_domain else []
+
+    def _hot_project_domain(self, domain=None):
+        """Restrict a project domain to the projects not frozen, unless the context asks for all of them
+
+        Frozen projects are closed and their figures no longer move; the portfolio totals read
+        them from their summaries, the other builders leave them out.
+        """
+        if self.env.context.get('construction_include_frozen'):
+            return domain or []
+        return expression.AND([domain or [], [('is_frozen', '=', False)]])
+
+    # Tables feeding the project dashboard, with the condition selecting one project's rows and
+    # the column dating their latest change
+    _PROJECT_TOKEN_SOURCES = [
+        ('construction_project', 'id = %(project_id)s', 'write_date'),
+        ('project_task_simple', 'project_id = %(project_id)s', 'write_date'),
+        ('construction_boq', 'project_id = %(project_id)s', 'write_date'),
+        ('construction_dpr', 'project_id = %(project_id)s', 'write_date'),
+        ('construction_dpr_material', 'project_id = %(project_id)s', 'write_date'),
+        ('construction_quality', 'project_id = %(project_id)s', 'write_date'),
+        ('construction_employee_work', 'project_id = %(project_id)s', 'write_date'),
+        ('construction_equipment_allocation', 'project_id = %(project_id)s', 'write_date'),
+        # Append-only and without write_date: its latest date tells a new baseline
+        ('construction_project_baseline', 'project_id = %(project_id)s', 'date'),
+    ]
+
+    def _get_dashboard_token(self, project_id=None, params=None):
+        """Cheap version token of a dashboard scope, changing whenever its data may have changed
+
+        The portfolio dashboard is served from the snapshot table, so its version is the
+        snapshot's; a project dashboard is computed live, so its version is the row count and
+        latest write_date of every table feeding it. The request ``params`` (filters, paging,
+        options) are part of the token, so a client changing them never gets ``unchanged``.
+        """
+        if project_id:
+            query = " UNION ALL ".join(
+                f"SELECT '{table}', COUNT(*), MAX({version})::timestamp FROM {table} WHERE {condition}"
+                for table, condition, version in self._PROJECT_TOKEN_SOURCES
+            )
+            self.env.cr.execute(query, {'project_id': project_id})
+            # The earned value planned moves with the date, so a project dashboard lasts a day at most
+            versions = self.env.cr.fetchall() + [fields.Date.context_today(self)]
+        else:
+            versions = self.env['construction.dashboard.snapshot'].sudo()._get_version()
+        raw = repr(versions) + json.dumps(params or {}, sort_keys=True, default=str)
+        return hashlib.sha1(raw.encode()).hexdigest()[:16]
+
+    def _get_dashboard_sections(self):
+        """Map each portfolio dashboard section to its builder and the shared inputs it takes"""
+        return {
+            "kpis": ("_get_portfolio_kpis", ("totals", "project_domain")),
+            "projectProgressChart": ("_get_project_progress_chart", ("rows",)),
+            "costBreakdown": ("_get_cost_breakdown", ("totals",)),
+            "equipmentAllocation": ("_get_equipment_allocation_chart", ("project_domain",)),
+            "laborProductivity": ("_get_labor_productivity", ("project_domain",)),
+            "materialConsumption": ("_get_material_consumption", ("project_domain",)),
+            "assetsEstimationChart": ("_get_assets_summary", ("totals",)),
+            "projectTimeline": ("_get_project_timeline", ("project_domain",)),
+            "costComparison": ("_get_project_cost_comparison_chart", ("rows",)),
+            "inventoryAllocationChart": ("_get_inventory_allocation_chart", ("project_domain",)),
+            "earnedValue": ("_get_earned_value", ("project_domain",)),
+            # Baselines keep recording frozen projects, so the trend covers every project
+            "costTrend": ("_get_cost_trend", ("domain",)),
+        }
+
+    def _compute_dashboard_sections(self, sections=None, domain=None, limit=None, offset=0, metrics=None,
+                                    options=None):
+        """Compute the requested sections, reading portfolio sums and rows once for all of them
+
+        ``options`` maps a section to extra keyword arguments of its builder (e.g. the window of
+        materialConsumption). The timings of every builder are appended to ``metrics`` when a list is given.
+        """
+        registry = self._get_dashboard_sections()
+        sections = sections or list(registry)
+        metrics = metrics if metrics is not None else []
+        shared_inputs = {name for section in sections for name in registry[section][1]}
+        shared = {
+            "totals": None,
+            "rows": None,
+            "domain": domain,
+            "project_domain": self._hot_project_domain(domain),
+        }
+        if "totals" in shared_inputs:
+            shared["totals"] = self._run_builder("totals", "_get_portfolio_totals", metrics, domain)
+        if "rows" in shared_inputs:
+            shared["rows"] = self._run_builder("rows", "_get_portfolio_rows", metrics, domain, limit, offset)
+
+        result = {}
+        for section in sections:
+            method, inputs = registry[section]
+            result[section] = self._run_builder(
+                section, method, metrics, *[shared[name] for name in inputs], **(options or {}).get(section, {}))
+        return result
+
+    def _run_builder(self, key, method, metrics, *args, **kwargs):
+        """Call a dashboard builder, recording its wall time, SQL query count and row count
+
+        Builders catch their own errors and serve sample data instead; those errors are
+        picked up from the log so the metrics tell a fallback from real data.
+        """
+        handler = _BuilderErrorHandler()
+        _logger.addHandler(handler)
+        queries = self.env.cr.sql_log_count
+        started = time.perf_counter()
+        try:
+            result = getattr(self, method)(*args, **kwargs)
+        finally:
+            _logger.removeHandler(handler)
+        entry = {
+            'builder': key,
+            'method': method,
+            'time_ms': round((time.perf_counter() - started) * 1000, 1),
+            'queries': self.env.cr.sql_log_count - queries,
+            'rows': self._count_rows(result),
+            'fallback': bool(handler.messages),
+        }
+        if handler.messages:
+            entry['errors'] = handler.messages
+        metrics.append(entry)
+        self._log_builder_metrics(entry)
+        return result
+
+    def _count_rows(self, data):
+        """Number of rows in a builder result; per-project results add up their projects"""
+        if isinstance(data, (list, tuple)):
+            return len(data)
+        if isinstance(data, dict):
+            if data and all(isinstance(key, int) for key in data):
+                return sum(self._count_rows(value) for value in data.values())
+            return 1 if data else 0
+        return 0
+
+    def _log_builder_metrics(self, entry):
+        """Log the metrics of a builder, as a warning when it ran over its slow threshold"""
+        threshold = self._get_slow_builder_threshold(entry['builder'])
+        if entry['fallback']:
+            _metrics_logger.warning(json.dumps(dict(entry, event='dashboard_builder_fallback')))
+        elif threshold and entry['time_ms'] > threshold:
+            _metrics_logger.warning(json.dumps(dict(entry, event='dashboard_builder_slow', threshold_ms=threshold)))
+        else:
+            _metrics_logger.info(json.dumps(dict(entry, event='dashboard_builder')))
+
+    def _get_slow_builder_threshold(self, key):
+        """Slow threshold of a builder in milliseconds; a per-builder parameter overrides the global one"""
+        params = self.env['ir.config_parameter'].sudo()
+        threshold = params.get_param(f'construction_management.dashboard_slow_builder_ms.{key}') \
+            or params.get_param('construction_management.dashboard_slow_builder_ms', 500)
+        return float(threshold)
+
+    def _is_dashboard_debug(self):
+        """Whether the RPC comes from a client in debug mode, which also gets the builder metrics"""
+        return bool(request and request.session.debug)
+
+    def _get_portfolio_kpis(self, totals=None, project_domain=None):
+        """Get the KPI cards of the portfolio dashboard"""
+        totals = totals or self._get_portfolio_totals(project_domain)
+        return {
+            "totalProjects": totals['count'],
             # "totalinventory": self._safe_count("construction.inventory"),
-            "employees": self._safe_count("construction.employee.work"),
-            "totalProjectCosts": self._get_total_project_costs(),
-            "actualProjectCosts": self._get_actual_project_costs(),
-            "varianceCosts": self._get_project_cost_variance(),
-            # "totalContractValue": self._get_total_contract_value(),
+            "employees": self._safe_count("construction.employee.work", self._scope_domain(project_domain)),
+            "totalProjectCosts": self._get_total_project_costs(totals),
+            "actualProjectCosts": self._get_actual_project_costs(totals),
+            "varianceCosts": self._get_project_cost_variance(totals),
+            # "totalContractValue": self._get_total_contract_value(totals),
             # "totalProjectCosts": self._get_total_project_costs(),
             # # "profitMargin": self._get_profit_margin(),
             # "overallProgress": self._get_overall_progress(),
@@ -53,56 +305,90 @@ class ConstructionDashboardService(models.AbstractModel):
             # "materialsOnSite": self._get_materials_on_site(),
         }
 
-        chart_data = {
-            "projectProgressChart": self._get_project_progress_chart(),
-            "costBreakdown": self._get_cost_breakdown(),
-            "equipmentAllocation": self._get_equipment_allocation_chart(),
-            "laborProductivity": self._get_labor_productivity(),
-            "materialConsumption": self._get_material_consumption(),
-            "assetsEstimationChart": self._get_assets_summary(),
-            "projectTimeline": self._get_project_timeline(),
-            "costComparison": self._get_project_cost_comparison_chart(),
-            "inventoryAllocationChart": self._get_inventory_allocation_chart(),
+    def _get_portfolio_totals(self, domain=None):
+        """Aggregate all portfolio cost sums, one grouped query over the open projects and one over
+        the summaries of the frozen ones"""
+        aggregates = {
+            'material': 'material_cost',
+            'labor': 'labor_cost',
+            'equipment': 'equipment_cost',
+            'total': 'total_cost',
+            'e_material': 'e_material_cost',
+            'e_labor': 'e_labor_cost',
+            'e_equipment': 'e_equipment_cost',
+            'e_total': 'e_total_cost',
+            'contract': 'contract_value',
+            'invoiced': 'total_invoiced',
+            'paid': 'total_paid',
         }
+        totals = dict.fromkeys(aggregates, 0.0)
+        totals['count'] = 0
+        try:
+            groups = [(self.env['construction.project'], self._hot_project_domain(domain))]
+            if not self.env.context.get('construction_include_frozen'):
+                frozen_domain = expression.AND([domain or [], [('is_frozen', '=', True)]])
+                groups.append((self.env['construction.project.summary'], [('project_id', 'any', frozen_domain)]))
+            for model, model_domain in groups:
+                [row] = model._read_group(
+                    model_domain,
+                    groupby=[],
+                    aggregates=['__count'] + [f'{field}:sum' for field in aggregates.values()],
+                )
+                totals['count'] += row[0]
+                for key, value in zip(aggregates, row[1:]):
+                    totals[key] += value or 0.0
+        except Exception as e:
+            _logger.error(f"Error in _get_portfolio_totals: {e}")
+        return totals
 
-        return {
-            "kpis": kpis,
-            "chartData": chart_data
-        }
+    def _get_portfolio_rows(self, domain=None, limit=None, offset=0):
+        """Read the per-project values used by the portfolio charts in one query, largest projects first"""
+        try:
+            return self.env['construction.project'].search_read(
+                self._hot_project_domain(domain),
+                ['name', 'progress_percent', 'contract_value', 'total_cost', 'e_total_cost',
+                 'state', 'start_date', 'end_date'],
+                offset=offset,
+                limit=limit or self._get_chart_limit(),
+                order='total_cost desc, id',
+            )
+        except Exception as e:
+            _logger.error(f"Error in _get_portfolio_rows: {e}")
+            return []
 
-    def _get_total_contract_value(self):
+    def _get_total_contract_value(self, totals=None):
         """Get total contract value of all projects"""
         try:
-            projects = self.env['construction.project'].search([])
-            total = self._safe_sum(projects, 'contract_value')
+            totals = totals or self._get_portfolio_totals()
+            total = totals['contract']
             return f"${total:,.2f}" if total else "$0.00"
         except Exception:
             return "$0.00"
 
-    def _get_total_project_costs(self):
+    def _get_total_project_costs(self, totals=None):
         """Get total costs across all projects"""
         try:
-            projects = self.env['construction.project'].search([])
-            total = self._safe_sum(projects, 'e_total_cost')
+            totals = totals or self._get_portfolio_totals()
+            total = totals['e_total']
             return f"₹{total:,.2f}" if total else "$0.00"
         except Exception:
             return "$0.00"
 
-    def _get_actual_project_costs(self):
+    def _get_actual_project_costs(self, totals=None):
         """Get total costs across all projects"""
         try:
-            projects = self.env['construction.project'].search([])
-            total = self._safe_sum(projects, 'total_cost')
+            totals = totals or self._get_portfolio_totals()
+            total = totals['total']
             return f"₹{total:,.2f}" if total else "$0.00"
         except Exception:
             return "$0.00"
 
-    def _get_project_cost_variance(self):
+    def _get_project_cost_variance(self, totals=None):
         """Calculate total cost variance across all projects"""
         try:
-            projects = self.env['construction.project'].search([])
-            total_estimated = self._safe_sum(projects, 'e_total_cost')  # Estimated cost
-            total_actual = self._safe_sum(projects, 'total_cost')  # Actual cost
+            totals = totals or self._get_portfolio_totals()
+            total_estimated = totals['e_total']  # Estimated cost
+            total_actual = totals['total']  # Actual cost
             variance_percentage = round(((total_actual - total_estimated) / total_estimated) * 100, 1)
             return f"₹{abs(variance_percentage):,.2f}%" if variance_percentage else "₹0.00"
         except Exception:
@@ -131,27 +417,36 @@ class ConstructionDashboardService(models.AbstractModel):
         except Exception:
             return "0%"
 
-    def _get_inventory_allocation_chart(self):
+    def _get_inventory_allocation_chart(self, project_domain=None):
         """Get inventory allocation of materials across projects"""
         try:
-            boq_items = self.env['construction.boq'].search([])
+            # Material -> stock index, keyed by project for project-scoped inventory
+            # and by False for inventory shared across projects
+            stock = {}
+            for material, project, current_stock in self.env['construction.inventory']._read_group(
+                [],
+                groupby=['material_id', 'project_id'],
+                aggregates=['current_stock:sum'],
+            ):
+                stock[(material.id, project.id)] = current_stock
+
+            # Required quantities grouped per project and material
+            required = self.env['construction.boq']._read_group(
+                [('project_id', '!=', False), ('material_id', '!=', False)] + self._scope_domain(project_domain),
+                groupby=['project_id', 'material_id'],
+                aggregates=['quantity:sum'],
+            )
 
             project_allocations = {}
-            for boq in boq_items:
-                if boq.project_id and boq.material_id:
-                    project_name = boq.project_id.name
-
-                    # Get the inventory for this material
-                    inventory = self.env['construction.inventory'].search([
-                        ('material_id', '=', boq.material_id.id)
-                    ], limit=1)
-
-                    if inventory:
-                        # Calculate allocation: min(required_qty, available_stock)
-                        allocated = min(boq.quantity, inventory.current_stock)
-                        project_allocations[project_name] = project_allocations.get(project_name, 0) + allocated
-
-            labels = list(project_allocations.keys())
+            for project, material, quantity in required:
+                # Project-scoped stock first, shared stock otherwise
+                available = stock.get((material.id, project.id), stock.get((material.id, False)))
+                if available is None:
+                    continue
+                # Calculate allocation: min(required_qty, available_stock)
+                project_allocations[project] = project_allocations.get(project, 0) + min(quantity, available)
+
+            labels = [project.name for project in project_allocations]
             data = list(project_allocations.values())
 
             # If no data, return demo values
@@ -166,21 +461,22 @@ class ConstructionDashboardService(models.AbstractModel):
                 "data": [100, 150],
             }
 
-    def _get_project_progress_chart(self):
+    def _get_project_progress_chart(self, rows=None):
         """Get progress data for all active projects"""
         try:
-            projects = self.env['construction.project'].search([])
+            if rows is None:
+                rows = self._get_portfolio_rows()
 
             data = []
-            for project in projects:
+            for project in rows:
                 data.append({
-                    'projectName': project.name,
-                    'progress': project.progress_percent or 0,
-                    'contractValue': project.contract_value or 0,
-                    'totalCost': project.total_cost or 0,
-                    'status': project.state,
-                    'startDate': project.start_date.strftime('%Y-%m-%d') if project.start_date else None,
-                    'endDate': project.end_date.strftime('%Y-%m-%d') if project.end_date else None,
+                    'projectName': project['name'],
+                    'progress': project['progress_percent'] or 0,
+                    'contractValue': project['contract_value'] or 0,
+                    'totalCost': project['total_cost'] or 0,
+                    'status': project['state'],
+                    'startDate': project['start_date'].strftime('%Y-%m-%d') if project['start_date'] else None,
+                    'endDate': project['end_date'].strftime('%Y-%m-%d') if project['end_date'] else None,
                 })
 
             # If no data, return sample data
@@ -204,18 +500,19 @@ class ConstructionDashboardService(models.AbstractModel):
                  'status': 'active'},
             ]
 
-    def _get_project_cost_comparison_chart(self):
+    def _get_project_cost_comparison_chart(self, rows=None):
         """Get contract value vs total cost for all projects"""
         try:
-            projects = self.env['construction.project'].search([])
+            if rows is None:
+                rows = self._get_portfolio_rows()
 
             data = []
-            for project in projects:
+            for project in rows:
                 data.append({
-                    'projectName': project.name,
-                    'expectedValue': float(project.e_total_cost or 0),
-                    'totalCost': float(project.total_cost or 0),
-                    'status': project.state,
+                    'projectName': project['name'],
+                    'expectedValue': float(project['e_total_cost'] or 0),
+                    'totalCost': float(project['total_cost'] or 0),
+                    'status': project['state'],
                 })
 
             return data
@@ -223,14 +520,14 @@ class ConstructionDashboardService(models.AbstractModel):
             _logger.error(f"Error in _get_project_cost_comparison_chart: {e}")
             return []
 
-    def _get_cost_breakdown(self):
+    def _get_cost_breakdown(self, totals=None):
         """Get cost breakdown by category across all projects"""
         try:
-            projects = self.env['construction.project'].search([])
+            totals = totals or self._get_portfolio_totals()
 
-            total_material = self._safe_sum(projects, 'material_cost')
-            total_labor = self._safe_sum(projects, 'labor_cost')
-            total_equipment = self._safe_sum(projects, 'equipment_cost')
+            total_material = totals['material']
+            total_labor = totals['labor']
+            total_equipment = totals['equipment']
 
             data = [
                 {'category': 'Materials', 'amount': total_material, 'percentage': 0},
@@ -260,51 +557,18 @@ class ConstructionDashboardService(models.AbstractModel):
                 {'category': 'Equipment', 'amount': 50000, 'percentage': 11.1},
             ]
 
-    def _get_monthly_progress(self):
-        """Get monthly progress data for current year"""
-        try:
-            current_year = datetime.now().year
-            monthly_data = {}
-
-            # Get DPR records for the year to track monthly progress
-            dpr_records = self.env['construction.dpr'].search([
-                ('date', '>=', f'{current_year}-01-01'),
-                ('date', '<', f'{current_year + 1}-01-01')
-            ])
-
-            for dpr in dpr_records:
-                month_name = dpr.date.strftime('%B')
-                if month_name not in monthly_data:
-                    monthly_data[month_name] = {
-                        'projects': set(),
-                        'labor_hours': 0,
-                        'employee_count': 0
-                    }
-
-                monthly_data[month_name]['projects'].add(dpr.project_id.id)
-                monthly_data[month_name]['labor_hours'] += dpr.labor_hours or 0
-                monthly_data[month_name]['employee_count'] += dpr.employee_count or 0
-
-            # Convert to list format
-            month_names = ['January', 'February', 'March', 'April', 'May', 'June',
-                           'July', 'August', 'September', 'October', 'November', 'December']
+    def _get_period(self, date_from=None, date_to=None):
+        """Resolve an optional date range, defaulting to the current calendar year"""
+        today = fields.Date.context_today(self)
+        date_from = fields.Date.to_date(date_from) or today.replace(month=1, day=1)
+        date_to = fields.Date.to_date(date_to) or today.replace(month=12, day=31)
+        return date_from, date_to
 
-            data = []
-            for month in month_names:
-                if month in monthly_data:
-                    data.append({
-                        'month': month,
-                        'activeProjects': len(monthly_data[month]['projects']),
-                        'laborHours': monthly_data[month]['labor_hours'],
-                        'employeeCount': monthly_data[month]['employee_count']
-                    })
-                else:
-                    data.append({
-                        'month': month,
-                        'activeProjects': 0,
-                        'laborHours': 0,
-                        'employeeCount': 0
-                    })
+    def _get_monthly_progress(self, date_from=None, date_to=None):
+        """Get monthly progress data for current year (or the given date range)"""
+        try:
+            date_from, date_to = self._get_period(date_from, date_to)
+            data = self.env['construction.dpr.daily']._get_monthly([], date_from, date_to)
 
             # If no data, return sample data
             if not any(item['activeProjects'] for item in data):
@@ -325,17 +589,14 @@ class ConstructionDashboardService(models.AbstractModel):
                 {'month': 'February', 'activeProjects': 4, 'laborHours': 640, 'employeeCount': 32},
             ]
 
-    def _get_equipment_allocation_chart(self):
+    def _get_equipment_allocation_chart(self, project_domain=None):
         """Get equipment allocation status"""
         try:
-            allocations = self.env['construction.equipment.allocation'].search([])
-
-            status_data = {}
-            for allocation in allocations:
-                status = allocation.state
-                if status not in status_data:
-                    status_data[status] = 0
-                status_data[status] += 1
+            status_data = dict(self.env['construction.equipment.allocation']._read_group(
+                self._scope_domain(project_domain),
+                groupby=['state'],
+                aggregates=['__count'],
+            ))
 
             data = []
             for status, count in status_data.items():
@@ -362,48 +623,54 @@ class ConstructionDashboardService(models.AbstractModel):
                 {'status': 'Available', 'count': 12},
             ]
 
-    def _get_labor_productivity(self):
-        """Get labor productivity metrics"""
+    def _get_labor_productivity(self, project_domain=None, date_from=None, date_to=None, limit=10):
+        """Get labor productivity metrics (current month by default), top projects by hours worked"""
         try:
-            current_month = datetime.now().replace(day=1)
-            work_records = self.env['construction.employee.work'].search([
-                ('work_date', '>=', current_month),
+            date_from = fields.Date.to_date(date_from) or fields.Date.context_today(self).replace(day=1)
+            domain = [
+                ('work_date', '>=', date_from),
                 ('state', 'in', ['confirmed', 'approved'])
-            ])
+            ] + self._scope_domain(project_domain)
+            if date_to:
+                domain.append(('work_date', '<=', date_to))
+
+            Work = self.env['construction.employee.work']
+            hours_by_project = Work._read_group(
+                domain,
+                groupby=['project_id'],
+                aggregates=['working_hours:sum'],
+                order='working_hours:sum desc, project_id',
+                limit=limit,
+            )
 
-            if not work_records:
+            if not hours_by_project:
                 return [
                     {'project': 'Sample Project A', 'hoursWorked': 320, 'productivity': 85.5},
                     {'project': 'Sample Project B', 'hoursWorked': 280, 'productivity': 92.1},
                 ]
 
-            # Group by project
-            project_data = {}
-            for work in work_records:
-                project_name = work.project_id.name
-                if project_name not in project_data:
-                    project_data[project_name] = {
-                        'total_hours': 0,
-                        'completed_tasks': 0
-                    }
-
-                project_data[project_name]['total_hours'] += work.working_hours or 0
-                if hasattr(work, 'construction_task_id') and work.construction_task_id:
-                    if hasattr(work.construction_task_id, 'status') and work.construction_task_id.status == 'completed':
-                        project_data[project_name]['completed_tasks'] += 1
+            completed_by_project = dict(Work._read_group(
+                domain + [
+                    ('project_id', 'in', [project.id for project, _hours in hours_by_project]),
+                    ('construction_task_id.status', '=', 'completed'),
+                ],
+                groupby=['project_id'],
+                aggregates=['__count'],
+            ))
 
             data = []
-            for project, stats in project_data.items():
+            for project, total_hours in hours_by_project:
                 # Calculate productivity as completed tasks per hour * 100
-                productivity = (stats['completed_tasks'] / stats['total_hours'] * 100) if stats[
-                                                                                              'total_hours'] > 0 else 0
+                total_hours = total_hours or 0
+                completed_tasks = completed_by_project.get(project, 0)
+                productivity = (completed_tasks / total_hours * 100) if total_hours > 0 else 0
                 data.append({
-                    'project': project,
-                    'hoursWorked': stats['total_hours'],
+                    'project': project.name,
+                    'hoursWorked': total_hours,
                     'productivity': round(productivity, 1)
                 })
 
-            return data[:10]  # Limit to top 10
+            return data
         except Exception as e:
             _logger.error(f"Error in _get_labor_productivity: {e}")
             return [
@@ -411,37 +678,57 @@ class ConstructionDashboardService(models.AbstractModel):
                 {'project': 'Sample Project B', 'hoursWorked': 280, 'productivity': 92.1},
             ]
 
-    def _get_material_consumption(self):
-        """Get material consumption trends"""
+    def _get_consumption_period(self, window='month', date_from=None, date_to=None):
+        """Resolve a material consumption window (7d, 30d, month, quarter or custom) to a date range"""
+        today = fields.Date.context_today(self)
+        if window == '7d':
+            return today - timedelta(days=6), None
+        if window == '30d':
+            return today - timedelta(days=29), None
+        if window == 'month':
+            return today.replace(day=1), None
+        if window == 'quarter':
+            return today.replace(month=3 * ((today.month - 1) // 3) + 1, day=1), None
+        if window == 'custom' and date_from:
+            return fields.Date.to_date(date_from), fields.Date.to_date(date_to)
+        raise ValueError(f"Unknown material consumption window: {window}")
+
+    def _get_material_consumption(self, project_domain=None, window='month', date_from=None, date_to=None,
+                                  by_project=False, limit=10):
+        """Get material consumption trends, top materials by cost over the window
+
+        With ``by_project`` the top materials are given per project instead. An unknown ``window``
+        raises a ValueError rather than falling back to sample data.
+        """
+        date_from, date_to = self._get_consumption_period(window, date_from, date_to)
         try:
-            current_month = datetime.now().replace(day=1)
-            dpr_materials = self.env['construction.dpr.material'].search([
-                ('dpr_id.date', '>=', current_month)
-            ])
-
-            material_data = {}
-            for material in dpr_materials:
-                product_name = material.product_id.name
-                if product_name not in material_data:
-                    material_data[product_name] = {
-                        'quantity': 0,
-                        'cost': 0
-                    }
-
-                material_data[product_name]['quantity'] += material.quantity or 0
-                material_data[product_name]['cost'] += material.total_cost or 0
-
-            data = []
-            for material, stats in material_data.items():
-                data.append({
-                    'material': material,
-                    'quantity': stats['quantity'],
-                    'totalCost': stats['cost']
-                })
+            project_ids = None
+            if project_domain:
+                project_ids = tuple(self.env['construction.project'].search(project_domain, order='id').ids)
+            rows = self.env['construction.dpr.material']._get_consumption(
+                date_from, date_to, project_ids, by_project, limit)
+
+            if by_project:
+                projects = {}
+                for project_id, project_name, product_id, product_name, quantity, cost in rows:
+                    projects.setdefault(project_id, {
+                        'projectId': project_id,
+                        'project': project_name,
+                        'materials': [],
+                    })['materials'].append({
+                        'material': product_name,
+                        'productId': product_id,
+                        'quantity': quantity,
+                        'totalCost': cost
+                    })
+                return list(projects.values())
 
-            # Sort by cost descending and limit to top 10
-            data.sort(key=lambda x: x['totalCost'], reverse=True)
-            data = data[:10]
+            data = [{
+                'material': product_name,
+                'productId': product_id,
+                'quantity': quantity,
+                'totalCost': cost
+            } for _project_id, _project_name, product_id, product_name, quantity, cost in rows]
 
             # If no data, return sample data
             if not data:
@@ -460,15 +747,15 @@ class ConstructionDashboardService(models.AbstractModel):
                 {'material': 'Steel Bars', 'quantity': 200, 'totalCost': 15000},
             ]
 
-    def _get_financial_summary(self):
+    def _get_financial_summary(self, totals=None):
         """Get financial summary data"""
         try:
-            projects = self.env['construction.project'].search([])
+            totals = totals or self._get_portfolio_totals()
 
-            total_contract = self._safe_sum(projects, 'contract_value')
-            total_invoiced = self._safe_sum(projects, 'total_invoiced')
-            total_paid = self._safe_sum(projects, 'total_paid')
-            total_costs = self._safe_sum(projects, 'total_cost')
+            total_contract = totals['contract']
+            total_invoiced = totals['invoiced']
+            total_paid = totals['paid']
+            total_costs = totals['total']
 
             data = {
                 'totalContract': total_contract,
@@ -508,22 +795,22 @@ class ConstructionDashboardService(models.AbstractModel):
                 'collectionProgress': 83.3,
             }
 
-    def _get_assets_summary(self):
+    def _get_assets_summary(self, totals=None):
         """Get actual vs expected asset estimation costs"""
         try:
-            projects = self.env['construction.project'].search([])
+            totals = totals or self._get_portfolio_totals()
 
             actual = {
-                'material': sum(projects.mapped('material_cost')),
-                'labor': sum(projects.mapped('labor_cost')),
-                'equipment': sum(projects.mapped('equipment_cost')),
-                'total': sum(projects.mapped('total_cost')),
+                'material': totals['material'],
+                'labor': totals['labor'],
+                'equipment': totals['equipment'],
+                'total': totals['total'],
             }
             expected = {
-                'material': sum(projects.mapped('e_material_cost')),
-                'labor': sum(projects.mapped('e_labor_cost')),
-                'equipment': sum(projects.mapped('e_equipment_cost')),
-                'total': sum(projects.mapped('e_total_cost')),
+                'material': totals['e_material'],
+                'labor': totals['e_labor'],
+                'equipment': totals['e_equipment'],
+                'total': totals['e_total'],
             }
 
             return {
@@ -537,7 +824,7 @@ class ConstructionDashboardService(models.AbstractModel):
                 'expected': {'material': 0, 'labor': 0, 'equipment': 0, 'total': 0},
             }
 
-    def _get_project_timeline(self):
+    def _get_project_timeline(self, project_domain=None):
         """Get upcoming project milestones and deadlines"""
         try:
             today = date.today()
@@ -547,7 +834,7 @@ class ConstructionDashboardService(models.AbstractModel):
                 ('end_date', '>=', today),
                 ('end_date', '<=', upcoming_date),
                 ('status', '!=', 'completed')
-            ])
+            ] + self._scope_domain(project_domain))
 
             data = []
             for task in tasks:
@@ -583,16 +870,231 @@ class ConstructionDashboardService(models.AbstractModel):
                  'daysRemaining': 5, 'progress': 80, 'status': 'in_progress', 'isOverdue': False},
             ]
 
+    def _get_earned_value(self, project_domain=None, limit=None):
+        """Get the earned value of the portfolio and of the projects furthest over their budget"""
+        try:
+            Project = self.env['construction.project']
+            evm = self.env['construction.evm']
+            metrics = evm._compute_projects(Project.search(project_domain or []).ids)
+            worst = sorted(metrics.items(), key=lambda item: item[1]['vac'])[:limit or self._get_chart_limit()]
+            names = {project.id: project.name for project in Project.browse([project_id for project_id, _ in worst])}
+            return {
+                'statusDate': fields.Date.to_string(fields.Date.context_today(self)),
+                'totals': evm._summarize(metrics.values()),
+                'projects': [
+                    dict(project_metrics, projectId=project_id, project=names[project_id])
+                    for project_id, project_metrics in worst
+                ],
+            }
+        except Exception as e:
+            _logger.error(f"Error in _get_earned_value: {e}")
+            return {}
+
+    def _get_cost_trend(self, project_domain=None, date_from=None, date_to=None):
+        """Get the portfolio cost, billing and progress curves, read from the project baselines"""
+        try:
+            project_ids = self.env['construction.project'].search(project_domain).ids if project_domain else None
+            date_from = date_from or fields.Date.context_today(self) - timedelta(days=365)
+            return [
+                {
+                    'date': point['date'],
+                    'materialCost': point['material_cost'],
+                    'laborCost': point['labor_cost'],
+                    'equipmentCost': point['equipment_cost'],
+                    'totalCost': point['total_cost'],
+                    'invoiced': point['total_invoiced'],
+                    'paid': point['total_paid'],
+                    'progress': round(point['progress_percent'], 1),
+                }
+                for point in self.env['construction.project.baseline']._read_trend(project_ids, date_from, date_to)
+            ]
+        except Exception as e:
+            _logger.error(f"Error in _get_cost_trend: {e}")
+            return []
+
+    @api.model
+    def get_dashboard_widget(self, widget_key, params=None):
+        """Get the data of a single dashboard widget so clients can load widgets independently
+
+        When ``params`` carries the ``token`` returned by a previous call and nothing changed in
+        the widget's scope since, only ``{'unchanged': True}`` is returned. Portfolio widgets also
+        take ``filters``, ``limit``/``offset`` and builder ``options`` (e.g. ``{'window': '7d'}`` for
+        materialConsumption), which are computed live instead of read from the snapshot.
+        """
+        params = params or {}
+        widgets = self._get_dashboard_widgets()
+        if widget_key not in widgets:
+            return {'error': f'Unknown dashboard widget: {widget_key}'}
+
+        scope, method = widgets[widget_key]
+        current_token = self._get_dashboard_token(
+            params.get('project_id') if scope == 'project' else None,
+            params=dict({key: value for key, value in params.items() if key != 'token'}, widget=widget_key),
+        )
+        if params.get('token') and params['token'] == current_token:
+            return {'unchanged': True, 'token': current_token}
+
+        metrics = []
+        try:
+            if scope == 'portfolio' and (params.get('filters') or params.get('limit') or params.get('offset')
+                                         or params.get('options')):
+                data = self._compute_dashboard_sections(
+                    [widget_key],
+                    domain=self._build_project_domain(params.get('filters')),
+                    limit=params.get('limit'),
+                    offset=params.get('offset') or 0,
+                    metrics=metrics,
+                    options={widget_key: params.get('options') or {}},
+                )[widget_key]
+            elif scope == 'portfolio':
+                snapshot = self.env['construction.dashboard.snapshot'].sudo()
+                data = snapshot._get_section(widget_key)
+                metrics = [entry for key, entry in snapshot._get_metrics().items() if key == widget_key]
+            else:
+                project = self.env['construction.project'].browse(params.get('project_id'))
+                if not project.exists():
+                    return {'error': 'Project not found'}
+                data = self._run_builder(widget_key, method, metrics, project)
+        except Exception as e:
+            _logger.error(f"Error in get_dashboard_widget({widget_key}): {e}")
+            return {'error': str(e)}
+
+        result = {
+            'key': widget_key,
+            'data': data,
+            'token': current_token,
+        }
+        if self._is_dashboard_debug():
+            result['metrics'] = metrics
+        return result
+
+    def _get_dashboard_widgets(self):
+        """Registry of the widgets served by get_dashboard_widget, as (scope, builder method)"""
+        widgets = {section: ('portfolio', None) for section in self._get_dashboard_sections()}
+        widgets.update({
+            'project.kpis': ('project', '_get_project_kpis'),
+            'project.taskProgress': ('project', '_get_project_task_progress'),
+            'project.costBreakdown': ('project', '_get_project_cost_breakdown'),
+            'project.monthlyProgress': ('project', '_get_project_monthly_progress'),
+            'project.materialConsumption': ('project', '_get_project_material_consumption'),
+            'project.laborUtilization': ('project', '_get_project_labor_utilization'),
+            'project.timeline': ('project', '_get_project_timeline_chart'),
+            'project.boqProgress': ('project', '_get_project_boq_progress'),
+            'project.costComparison': ('project', '_get_project_cost_comparison'),
+            'project.recentActivities': ('project', '_get_project_recent_activities'),
+            'project.earnedValue': ('project', '_get_project_earned_value'),
+            'project.trend': ('project', '_get_project_trend'),
+        })
+        return widgets
+
     #Individual Dashboard
     @api.model
-    def get_project_dashboard_data(self, project_id):
+    def get_project_dashboard_data(self, project_id, token=None):
         """Get comprehensive dashboard data for a specific project"""
         try:
             project = self.env['construction.project'].browse(project_id)
             if not project.exists():
                 return {'error': 'Project not found'}
 
-            # Project KPIs
+            current_token = self._get_dashboard_token(project.id)
+            if token and token == current_token:
+                return {'unchanged': True, 'token': current_token}
+
+            if self._is_dashboard_debug():
+                metrics = []
+                data = self.get_projects_dashboard_data([project.id], metrics=metrics)[project.id]
+                return dict(data, token=current_token, metrics=metrics)
+
+            cache = self.env['construction.dashboard.cache'].sudo()
+            data = cache._get_or_compute(
+                cache._make_key('project', project_id=project.id),
+                current_token,
+                lambda: self.get_projects_dashboard_data([project.id])[project.id],
+            )
+            return dict(data, token=current_token)
+
+        except Exception as e:
+            _logger.error(f"Error in get_project_dashboard_data: {e}")
+            return {'error': str(e)}
+
+    @api.model
+    def get_projects_dashboard_data(self, project_ids, metrics=None):
+        """Get the project dashboard data of several projects at once, keyed by project id
+
+        Every builder reads all the projects with grouped queries, so the number of queries
+        does not grow with the number of projects. The timings of every builder are appended
+        to ``metrics`` when a list is given.
+        """
+        projects = self.env['construction.project'].browse(project_ids).exists()
+        metrics = metrics if metrics is not None else []
+
+        def run(key, method):
+            return self._run_builder(key, method, metrics, projects)
+
+        kpis = run('project.kpis', '_get_projects_kpis')
+        task_progress = run('project.taskProgress', '_get_projects_task_progress')
+        cost_breakdown = run('project.costBreakdown', '_get_projects_cost_breakdown')
+        monthly_progress = run('project.monthlyProgress', '_get_projects_monthly_progress')
+        material_consumption = run('project.materialConsumption', '_get_projects_material_consumption')
+        labor_utilization = run('project.laborUtilization', '_get_projects_labor_utilization')
+        timeline = run('project.timeline', '_get_projects_timeline_chart')
+        boq_progress = run('project.boqProgress', '_get_projects_boq_progress')
+        cost_comparison = run('project.costComparison', '_get_projects_cost_comparison')
+        recent_activities = run('project.recentActivities', '_get_projects_recent_activities')
+        earned_value = run('project.earnedValue', '_get_projects_earned_value')
+        trend = run('project.trend', '_get_projects_trend')
+
+        result = {}
+        for project in projects:
+            result[project.id] = {
+                'kpis': kpis.get(project.id, {}),
+                'chartData': {
+                    'taskProgress': task_progress.get(project.id, []),
+                    'costBreakdown': cost_breakdown.get(project.id, []),
+                    'monthlyProgress': monthly_progress.get(project.id, []),
+                    'materialConsumption': material_consumption.get(project.id, []),
+                    'laborUtilization': labor_utilization.get(project.id, []),
+                    'timeline': timeline.get(project.id, []),
+                    'boqProgress': boq_progress.get(project.id, {}),
+                    'costComparison': cost_comparison.get(project.id, {}),
+                    'earnedValue': earned_value.get(project.id, []),
+                    'trend': trend.get(project.id, []),
+                },
+                'recentActivities': recent_activities.get(project.id, []),
+            }
+        return result
+
+    def _count_by_project(self, model, projects, domain=None):
+        """Number of records of ``model`` per project, in one grouped query"""
+        return {
+            project.id: count
+            for project, count in self.env[model]._read_group(
+                [('project_id', 'in', projects.ids)] + (domain or []),
+                groupby=['project_id'],
+                aggregates=['__count'],
+            )
+        }
+
+    def _get_project_kpis(self, project):
+        """Get the KPI cards of the project dashboard"""
+        return self._get_projects_kpis(project).get(project.id, {})
+
+    def _get_projects_kpis(self, projects):
+        """Get the KPI cards of the project dashboard for several projects"""
+        task_counts = {project.id: {} for project in projects}
+        for project, status, count in self.env['project.task.simple']._read_group(
+            [('project_id', 'in', projects.ids)],
+            groupby=['project_id', 'status'],
+            aggregates=['__count'],
+        ):
+            task_counts[project.id][status] = count
+        boq_counts = self._count_by_project('construction.boq', projects)
+        dpr_counts = self._count_by_project('construction.dpr', projects)
+        quality_counts = self._count_by_project('construction.quality', projects)
+        earned_value = self.env['construction.evm']._compute_projects(projects.ids)
+
+        result = {}
+        for project in projects:
             kpis = {
                 'projectName': project.name,
                 'contractValue': project.contract_value or 0,
@@ -603,16 +1105,17 @@ class ConstructionDashboardService(models.AbstractModel):
                 'equipmentCost': project.equipment_cost or 0,
                 'progress': project.progress_percent or 0,
                 'status': project.state,
-                'totalTasks': len(project.timeline_ids),
-                'completedTasks': len(project.timeline_ids.filtered(lambda t: t.status == 'completed')),
-                'activeTasks': len(project.timeline_ids.filtered(lambda t: t.status == 'in_progress')),
-                'totalBOQItems': len(project.boq_ids),
-                'totalDPRs': len(project.dpr_ids),
-                'totalQualityRecords': len(project.quality_ids),
+                'totalTasks': sum(task_counts[project.id].values()),
+                'completedTasks': task_counts[project.id].get('completed', 0),
+                'activeTasks': task_counts[project.id].get('in_progress', 0),
+                'totalBOQItems': boq_counts.get(project.id, 0),
+                'totalDPRs': dpr_counts.get(project.id, 0),
+                'totalQualityRecords': quality_counts.get(project.id, 0),
                 'startDate': project.start_date.strftime('%Y-%m-%d') if project.start_date else None,
                 'endDate': project.end_date.strftime('%Y-%m-%d') if project.end_date else None,
                 'expectedStartDate': project.e_start_date.strftime('%Y-%m-%d') if project.e_start_date else None,
                 'expectedEndDate': project.e_end_date.strftime('%Y-%m-%d') if project.e_end_date else None,
+                'earnedValue': earned_value.get(project.id, {}),
             }
 
             # Calculate additional metrics
@@ -636,197 +1139,180 @@ class ConstructionDashboardService(models.AbstractModel):
                 kpis['costVariance'] = 0
                 kpis['costVarianceMsg'] = "No expected cost available"
 
-            # Chart data
-            chart_data = {
-                'taskProgress': self._get_project_task_progress(project),
-                'costBreakdown': self._get_project_cost_breakdown(project),
-                'monthlyProgress': self._get_project_monthly_progress(project),
-                'materialConsumption': self._get_project_material_consumption(project),
-                'laborUtilization': self._get_project_labor_utilization(project),
-                'timeline': self._get_project_timeline_chart(project),
-                'boqProgress': self._get_project_boq_progress(project),
-                'costComparison': self._get_project_cost_comparison(project),
-            }
-
-            return {
-                'kpis': kpis,
-                'chartData': chart_data,
-                'recentActivities': self._get_project_recent_activities(project),
-            }
-
-        except Exception as e:
-            _logger.error(f"Error in get_project_dashboard_data: {e}")
-            return {'error': str(e)}
+            result[project.id] = kpis
+        return result
 
     def _get_project_task_progress(self, project):
         """Get task progress for the project (including subtasks)"""
+        return self._get_projects_task_progress(project).get(project.id, [])
+
+    def _get_projects_task_progress(self, projects):
+        """Get the progress of the main tasks of several projects, with their number of subtasks
+
+        Subtasks are left to the timeline, which fetches them as their parent is expanded.
+        """
         try:
-            tasks = self.env['project.task.simple'].search([('project_id', '=', project.id)])
-            data = []
-            for task in tasks:
-                data.append({
-                    'taskName': task.display_name,  # shows indentation for hierarchy
-                    'progress': task.progress_percent or 0,
-                    'status': task.status,
-                    'startDate': task.start_date.strftime('%Y-%m-%d') if task.start_date else None,
-                    'endDate': task.end_date.strftime('%Y-%m-%d') if task.end_date else None,
-                    'duration': task.duration or 0,
-                    'assignedTo': task.assigned_to.name if task.assigned_to else 'Unassigned',
-                    'isSubtask': task.is_subtask,
-                    'parent': task.parent_id.display_name if task.parent_id else None,
+            Task = self.env['project.task.simple']
+            tasks = Task.search([('project_id', 'in', projects.ids), ('parent_id', '=', False)])
+            child_counts = {
+                parent.id: count
+                for parent, count in Task._read_group([('parent_id', 'in', tasks.ids)], ['parent_id'], ['__count'])
+            }
+            rows = tasks.read(['project_id', 'display_name', 'progress_percent', 'status', 'start_date',
+                               'end_date', 'duration', 'assigned_to'])
+            result = {project.id: [] for project in projects}
+            for row in rows:
+                result[row['project_id'][0]].append({
+                    'id': row['id'],
+                    'taskName': row['display_name'],
+                    'progress': row['progress_percent'] or 0,
+                    'status': row['status'],
+                    'startDate': row['start_date'].strftime('%Y-%m-%d') if row['start_date'] else None,
+                    'endDate': row['end_date'].strftime('%Y-%m-%d') if row['end_date'] else None,
+                    'duration': row['duration'] or 0,
+                    'assignedTo': row['assigned_to'][1] if row['assigned_to'] else 'Unassigned',
+                    'isSubtask': False,
+                    'parentId': None,
+                    'childCount': child_counts.get(row['id'], 0),
                 })
-            return data
+            return result
         except Exception as e:
-            _logger.error(f"Error in _get_project_task_progress: {e}")
-            return []
+            _logger.error(f"Error in _get_projects_task_progress: {e}")
+            return {}
 
     def _get_project_cost_breakdown(self, project):
         """Get cost breakdown for the project"""
-        try:
-            total = project.total_cost or 0
-            if total == 0:
-                return []
-
-            data = [
-                {
-                    'category': 'Materials',
-                    'amount': project.material_cost or 0,
-                    'percentage': round(((project.material_cost or 0) / total) * 100, 1)
-                },
-                {
-                    'category': 'Labor',
-                    'amount': project.labor_cost or 0,
-                    'percentage': round(((project.labor_cost or 0) / total) * 100, 1)
-                },
-                {
-                    'category': 'Equipment',
-                    'amount': project.equipment_cost or 0,
-                    'percentage': round(((project.equipment_cost or 0) / total) * 100, 1)
-                },
-                {
-                    'category': 'Contract',
-                    'amount': project.contract_value or 0,
-                    'percentage': round(((project.contract_value or 0) / total) * 100, 1)
-                }
-            ]
-            return data
-        except Exception as e:
-            _logger.error(f"Error in _get_project_cost_breakdown: {e}")
-            return []
+        return self._get_projects_cost_breakdown(project).get(project.id, [])
 
-    def _get_project_monthly_progress(self, project):
-        """Get monthly progress for the project"""
+    def _get_projects_cost_breakdown(self, projects):
+        """Get cost breakdown for several projects"""
         try:
-            current_year = datetime.now().year
-            dpr_records = project.dpr_ids.filtered(
-                lambda d: d.date and d.date.year == current_year
-            )
-
-            monthly_data = {}
-            for dpr in dpr_records:
-                month_name = dpr.date.strftime('%B')
-                if month_name not in monthly_data:
-                    monthly_data[month_name] = {
-                        'laborHours': 0,
-                        'employeeCount': 0,
-                        'dprCount': 0
+            result = {}
+            for project in projects:
+                total = project.total_cost or 0
+                if total == 0:
+                    result[project.id] = []
+                    continue
+
+                result[project.id] = [
+                    {
+                        'category': 'Materials',
+                        'amount': project.material_cost or 0,
+                        'percentage': round(((project.material_cost or 0) / total) * 100, 1)
+                    },
+                    {
+                        'category': 'Labor',
+                        'amount': project.labor_cost or 0,
+                        'percentage': round(((project.labor_cost or 0) / total) * 100, 1)
+                    },
+                    {
+                        'category': 'Equipment',
+                        'amount': project.equipment_cost or 0,
+                        'percentage': round(((project.equipment_cost or 0) / total) * 100, 1)
+                    },
+                    {
+                        'category': 'Contract',
+                        'amount': project.contract_value or 0,
+                        'percentage': round(((project.contract_value or 0) / total) * 100, 1)
                     }
+                ]
+            return result
+        except Exception as e:
+            _logger.error(f"Error in _get_projects_cost_breakdown: {e}")
+            return {}
 
-                monthly_data[month_name]['laborHours'] += dpr.labor_hours or 0
-                monthly_data[month_name]['employeeCount'] += dpr.employee_count or 0
-                monthly_data[month_name]['dprCount'] += 1
-
-            month_names = ['January', 'February', 'March', 'April', 'May', 'June',
-                           'July', 'August', 'September', 'October', 'November', 'December']
-
-            data = []
-            for month in month_names:
-                if month in monthly_data:
-                    data.append({
-                        'month': month,
-                        'laborHours': monthly_data[month]['laborHours'],
-                        'employeeCount': monthly_data[month]['employeeCount'],
-                        'dprCount': monthly_data[month]['dprCount']
-                    })
-                else:
-                    data.append({
-                        'month': month,
-                        'laborHours': 0,
-                        'employeeCount': 0,
-                        'dprCount': 0
-                    })
+    def _get_project_monthly_progress(self, project, date_from=None, date_to=None):
+        """Get monthly progress for the project (current year or the given date range)"""
+        return self._get_projects_monthly_progress(project, date_from, date_to).get(project.id, [])
 
-            return data
+    def _get_projects_monthly_progress(self, projects, date_from=None, date_to=None):
+        """Get monthly progress for several projects (current year or the given date range)"""
+        try:
+            date_from, date_to = self._get_period(date_from, date_to)
+            return self.env['construction.dpr.daily']._get_monthly_by_project(projects.ids, date_from, date_to)
         except Exception as e:
-            _logger.error(f"Error in _get_project_monthly_progress: {e}")
-            return []
+            _logger.error(f"Error in _get_projects_monthly_progress: {e}")
+            return {}
 
     def _get_project_material_consumption(self, project):
         """Get material consumption for the project"""
-        try:
-            boq_items = project.boq_ids
-            data = []
+        return self._get_projects_material_consumption(project).get(project.id, [])
 
+    def _get_projects_material_consumption(self, projects):
+        """Get the top 10 BOQ material costs of several projects"""
+        try:
+            boq_items = self.env['construction.boq'].search([
+                ('project_id', 'in', projects.ids),
+                ('material_id', '!=', False),
+            ])
+            result = {project.id: [] for project in projects}
             for boq in boq_items:
-                if boq.material_id:
-                    data.append({
-                        'material': boq.material_id.name,
-                        'requiredQuantity': boq.quantity or 0,
-                        'unitPrice': boq.unit_price or 0,
-                        'totalPrice': boq.total_price or 0,
-                        'unit': boq.unit or 'Unit'
-                    })
+                result[boq.project_id.id].append({
+                    'material': boq.material_id.name,
+                    'requiredQuantity': boq.quantity or 0,
+                    'unitPrice': boq.unit_price or 0,
+                    'totalPrice': boq.total_price or 0,
+                    'unit': boq.unit or 'Unit'
+                })
 
-            # Sort by total price descending
-            data.sort(key=lambda x: x['totalPrice'], reverse=True)
-            return data[:10]  # Top 10 materials
+            # Sort by total price descending, top 10 materials
+            for project_id, data in result.items():
+                data.sort(key=lambda x: x['totalPrice'], reverse=True)
+                result[project_id] = data[:10]
+            return result
         except Exception as e:
-            _logger.error(f"Error in _get_project_material_consumption: {e}")
-            return []
+            _logger.error(f"Error in _get_projects_material_consumption: {e}")
+            return {}
 
-    def _get_project_labor_utilization(self, project):
+    def _get_project_labor_utilization(self, project, date_from=None, date_to=None, limit=None):
         """Get labor utilization for the project"""
-        try:
-            # Get employee work records for this project
-            work_records = self.env['construction.employee.work'].search([
-                ('project_id', '=', project.id),
-                ('state', 'in', ['confirmed', 'approved'])
-            ])
-
-            employee_data = {}
-            for work in work_records:
-                emp_name = work.employee_id.name if work.employee_id else 'Unknown'
-                if emp_name not in employee_data:
-                    employee_data[emp_name] = {
-                        'totalHours': 0,
-                        'workDays': 0
-                    }
+        return self._get_projects_labor_utilization(project, date_from, date_to, limit).get(project.id, [])
 
-                employee_data[emp_name]['totalHours'] += work.working_hours or 0
-                employee_data[emp_name]['workDays'] += 1
+    def _get_projects_labor_utilization(self, projects, date_from=None, date_to=None, limit=None):
+        """Get labor utilization per employee for several projects, busiest employees first
 
-            data = []
-            for emp_name, stats in employee_data.items():
-                data.append({
-                    'employee': emp_name,
-                    'totalHours': stats['totalHours'],
-                    'workDays': stats['workDays'],
-                    'avgHoursPerDay': round(stats['totalHours'] / stats['workDays'], 1) if stats['workDays'] > 0 else 0
+        ``limit`` keeps the top employees of each project.
+        """
+        try:
+            domain = [('project_id', 'in', projects.ids), ('state', 'in', ['confirmed', 'approved'])]
+            if date_from:
+                domain.append(('work_date', '>=', date_from))
+            if date_to:
+                domain.append(('work_date', '<=', date_to))
+            groups = self.env['construction.employee.work']._read_group(
+                domain,
+                groupby=['project_id', 'employee_id'],
+                aggregates=['working_hours:sum', '__count'],
+                order='working_hours:sum desc, employee_id',
+            )
+            result = {project.id: [] for project in projects}
+            for project, employee, total_hours, work_days in groups:
+                if limit and len(result[project.id]) >= limit:
+                    continue
+                result[project.id].append({
+                    'employee': employee.name if employee else 'Unknown',
+                    'totalHours': total_hours or 0,
+                    'workDays': work_days,
+                    'avgHoursPerDay': round((total_hours or 0) / work_days, 1) if work_days > 0 else 0
                 })
-
-            return data
+            return result
         except Exception as e:
-            _logger.error(f"Error in _get_project_labor_utilization: {e}")
-            return []
+            _logger.error(f"Error in _get_projects_labor_utilization: {e}")
+            return {}
 
     def _get_project_timeline_chart(self, project):
         """Get timeline chart data for the project"""
-        try:
-            tasks = project.timeline_ids.sorted('start_date')
-            data = []
+        return self._get_projects_timeline_chart(project).get(project.id, [])
 
+    def _get_projects_timeline_chart(self, projects):
+        """Get timeline chart data for several projects"""
+        try:
+            tasks = self.env['project.task.simple'].search(
+                [('project_id', 'in', projects.ids)], order='start_date, id'
+            )
+            result = {project.id: [] for project in projects}
             for task in tasks:
-                data.append({
+                result[task.project_id.id].append({
                     'taskName': task.name,
                     'startDate': task.start_date.strftime('%Y-%m-%d') if task.start_date else None,
                     'endDate': task.end_date.strftime('%Y-%m-%d') if task.end_date else None,
@@ -834,85 +1320,218 @@ class ConstructionDashboardService(models.AbstractModel):
                     'status': task.status,
                     'duration': task.duration or 0
                 })
+            return result
+        except Exception as e:
+            _logger.error(f"Error in _get_projects_timeline_chart: {e}")
+            return {}
 
-            return data
+    def _get_project_earned_value(self, project):
+        """Get the earned value of the top-level tasks of the project"""
+        return self._get_projects_earned_value(project).get(project.id, [])
+
+    def _get_projects_earned_value(self, projects):
+        """Get the earned value of the top-level tasks of several projects"""
+        try:
+            metrics = self.env['construction.evm']._compute_root_tasks(projects.ids)
+            task_ids = [row['taskId'] for rows in metrics.values() for row in rows]
+            names = {task.id: task.name for task in self.env['project.task.simple'].browse(task_ids)}
+            return {
+                project.id: [dict(row, taskName=names[row['taskId']]) for row in metrics.get(project.id, [])]
+                for project in projects
+            }
         except Exception as e:
-            _logger.error(f"Error in _get_project_timeline_chart: {e}")
-            return []
+            _logger.error(f"Error in _get_projects_earned_value: {e}")
+            return {}
+
+    def _get_project_trend(self, project):
+        """Get the cost, billing and progress curves of the project"""
+        return self._get_projects_trend(project).get(project.id, [])
+
+    def _get_projects_trend(self, projects, date_from=None):
+        """Get the cost, billing and progress curves of several projects over the last year, from their baselines"""
+        try:
+            result = {project.id: [] for project in projects}
+            date_from = date_from or fields.Date.context_today(self) - timedelta(days=365)
+            for baseline in self.env['construction.project.baseline'].search_read(
+                [('project_id', 'in', projects.ids), ('date', '>=', date_from)],
+                ['project_id', 'date', 'total_cost', 'total_invoiced', 'total_paid', 'progress_percent'],
+                order='project_id, date',
+            ):
+                result[baseline['project_id'][0]].append({
+                    'date': fields.Date.to_string(baseline['date']),
+                    'totalCost': baseline['total_cost'],
+                    'invoiced': baseline['total_invoiced'],
+                    'paid': baseline['total_paid'],
+                    'progress': baseline['progress_percent'],
+                })
+            return result
+        except Exception as e:
+            _logger.error(f"Error in _get_projects_trend: {e}")
+            return {}
 
     def _get_project_boq_progress(self, project):
         """Get BOQ progress for the project"""
-        try:
-            boq_items = project.boq_ids
-            total_items = len(boq_items)
-            completed_items = len(boq_items.filtered(lambda b: getattr(b, 'status', 'pending') == 'completed'))
+        return self._get_projects_boq_progress(project).get(
+            project.id, {'totalItems': 0, 'completedItems': 0, 'pendingItems': 0, 'completionRate': 0}
+        )
 
-            data = {
-                'totalItems': total_items,
-                'completedItems': completed_items,
-                'pendingItems': total_items - completed_items,
-                'completionRate': round((completed_items / total_items) * 100, 1) if total_items > 0 else 0
-            }
+    def _get_projects_boq_progress(self, projects):
+        """Get BOQ progress for several projects"""
+        try:
+            total_counts = self._count_by_project('construction.boq', projects)
+            completed_counts = {}
+            if 'status' in self.env['construction.boq']._fields:
+                completed_counts = self._count_by_project('construction.boq', projects, [('status', '=', 'completed')])
 
-            return data
+            result = {}
+            for project in projects:
+                total_items = total_counts.get(project.id, 0)
+                completed_items = completed_counts.get(project.id, 0)
+                result[project.id] = {
+                    'totalItems': total_items,
+                    'completedItems': completed_items,
+                    'pendingItems': total_items - completed_items,
+                    'completionRate': round((completed_items / total_items) * 100, 1) if total_items > 0 else 0
+                }
+            return result
         except Exception as e:
-            _logger.error(f"Error in _get_project_boq_progress: {e}")
-            return {'totalItems': 0, 'completedItems': 0, 'pendingItems': 0, 'completionRate': 0}
+            _logger.error(f"Error in _get_projects_boq_progress: {e}")
+            return {}
 
     def _get_project_cost_comparison(self, project):
         """Get cost comparison between expected and actual"""
+        return self._get_projects_cost_comparison(project).get(project.id, {})
+
+    def _get_projects_cost_comparison(self, projects):
+        """Get cost comparison between expected and actual for several projects"""
         try:
-            data = {
-                'expected': {
-                    'material': project.e_material_cost or 0,
-                    'labor': project.e_labor_cost or 0,
-                    'equipment': project.e_equipment_cost or 0,
-                    'contract': project.e_contract_value or 0,
-                    'total': project.e_total_cost or 0
-                },
-                'actual': {
-                    'material': project.material_cost or 0,
-                    'labor': project.labor_cost or 0,
-                    'equipment': project.equipment_cost or 0,
-                    'contract': project.contract_value or 0,
-                    'total': project.total_cost or 0
+            result = {}
+            for project in projects:
+                result[project.id] = {
+                    'expected': {
+                        'material': project.e_material_cost or 0,
+                        'labor': project.e_labor_cost or 0,
+                        'equipment': project.e_equipment_cost or 0,
+                        'contract': project.e_contract_value or 0,
+                        'total': project.e_total_cost or 0
+                    },
+                    'actual': {
+                        'material': project.material_cost or 0,
+                        'labor': project.labor_cost or 0,
+                        'equipment': project.equipment_cost or 0,
+                        'contract': project.contract_value or 0,
+                        'total': project.total_cost or 0
+                    }
                 }
-            }
-
-            return data
+            return result
         except Exception as e:
-            _logger.error(f"Error in _get_project_cost_comparison: {e}")
+            _logger.error(f"Error in _get_projects_cost_comparison: {e}")
             return {}
 
     def _get_project_recent_activities(self, project):
         """Get recent activities for the project"""
+        return self._get_projects_recent_activities(project).get(project.id, [])
+
+    @api.model
+    def get_project_activities(self, project_id, limit=20, cursor=None):
+        """Get one page of a project's activity history, newest first
+
+        Pass the returned ``cursor`` back to get the next page; it is ``None`` on the last page.
+        """
         try:
-            activities = []
+            activities, next_cursor = self.env['construction.activity']._read_feed([project_id], limit, cursor)
+            return {'activities': self._format_activities(activities), 'cursor': next_cursor}
+        except Exception as e:
+            _logger.error(f"Error in get_project_activities: {e}")
+            return {'error': str(e)}
 
-            # Recent DPRs
-            recent_dprs = project.dpr_ids.sorted('date', reverse=True)[:5]
-            for dpr in recent_dprs:
-                activities.append({
-                    'type': 'DPR',
-                    'title': f'Daily Progress Report - {dpr.date.strftime("%Y-%m-%d")}',
-                    'date': dpr.date.strftime('%Y-%m-%d'),
-                    'description': dpr.summary or 'Daily progress updated'
-                })
+    @api.model
+    def get_project_timeline(self, project_id, date_from=None, date_to=None, expanded_ids=None, limit=200, offset=0):
+        """Get the timeline rows of a project visible in a date window
 
-            # Recent quality records
-            recent_quality = project.quality_ids.sorted('create_date', reverse=True)[:3]
-            for quality in recent_quality:
-                activities.append({
-                    'type': 'Quality',
-                    'title': f'Quality Check - {quality.name}',
-                    'date': quality.create_date.strftime('%Y-%m-%d') if quality.create_date else '',
-                    'description': 'Quality inspection completed'
+        Only the main tasks overlapping the window and the subtasks of ``expanded_ids`` are
+        returned, each with its number of subtasks. Pass ``nextOffset`` back to get the next
+        main tasks; it is ``None`` on the last page.
+        """
+        try:
+            rows, next_offset = self.env['project.task.simple']._read_timeline_window(
+                project_id, date_from, date_to, expanded_ids, limit, offset)
+            tasks = []
+            for row in rows:
+                tasks.append({
+                    'id': row['id'],
+                    'name': row['name'],
+                    'parentId': row['parent_id'][0] if row['parent_id'] else None,
+                    'level': row['level'],
+                    'startDate': fields.Date.to_string(row['start_date']),
+                    'endDate': fields.Date.to_string(row['end_date']),
+                    'duration': row['duration'] or 0,
+                    'progress': row['progress_percent'] or 0,
+                    'status': row['status'],
+                    'assignedTo': row['assigned_to'][1] if row['assigned_to'] else 'Unassigned',
+                    'earlyStart': fields.Date.to_string(row['early_start']),
+                    'lateFinish': fields.Date.to_string(row['late_finish']),
+                    'totalFloat': row['total_float'],
+                    'isCritical': row['is_critical'],
+                    'expanded': row['expanded'],
+                    'childCount': row['childCount'],
                 })
+            return {'tasks': tasks, 'nextOffset': next_offset}
+        except Exception as e:
+            _logger.error(f"Error in get_project_timeline: {e}")
+            return {'error': str(e)}
 
-            # Sort by date descending
-            activities.sort(key=lambda x: x['date'], reverse=True)
-            return activities[:10]  # Return top 10 recent activities
+    def _get_projects_recent_activities(self, projects, limit=10):
+        """Get recent activities for several projects"""
+        try:
+            result = {project.id: [] for project in projects}
+            activities = self.env['construction.activity']._read_latest(projects.ids, limit)
+            for activity, data in zip(activities, self._format_activities(activities)):
+                result[activity.project_id.id].append(data)
+            return result
 
         except Exception as e:
-            _logger.error(f"Error in _get_project_recent_activities: {e}")
-            return []
\ No newline at end of file
+            _logger.error(f"Error in _get_projects_recent_activities: {e}")
+            return {}
+
+    def _format_activities(self, activities):
+        """Turn activity feed rows into the cards of the project dashboard"""
+        sources = {}
+        for activity in activities:
+            sources.setdefault(activity.res_model, []).append(activity.res_id)
+        # One read per source model; the feed only lists models the user can read
+        records = {
+            res_model: {record.id: record for record in self.env[res_model].browse(ids)}
+            for res_model, ids in sources.items()
+        }
+
+        data = []
+        for activity in activities:
+            record = records[activity.res_model][activity.res_id]
+            date_str = activity.date.strftime('%Y-%m-%d') if activity.date else ''
+            if activity.activity_type == 'dpr':
+                title = f'Daily Progress Report - {date_str}' if date_str else 'Daily Progress Report'
+                description = record.summary or 'Daily progress updated'
+            elif activity.activity_type == 'quality':
+                title = f'Quality Check - {record.display_name}'
+                description = 'Quality inspection completed'
+            elif activity.activity_type == 'equipment':
+                title = f'Equipment Allocated - {record.equipment_id.name or record.name}'
+                description = f'Status: {activity.state.replace("_", " ").title()}'
+            elif activity.activity_type == 'work_approval':
+                title = f'Work Approved - {record.employee_id.name}'
+                description = f'{record.working_hours or 0} hours approved'
+            elif activity.activity_type == 'invoice':
+                title = f'Invoice {record.name}'
+                description = f'Amount: {activity.amount or 0:,.2f}'
+            else:
+                title = f'Payment {record.name}'
+                description = f'Amount: {activity.amount or 0:,.2f}'
+            data.append({
+                'id': activity.id,
+                'type': dict(activity._fields['activity_type'].selection)[activity.activity_type],
+                'title': title,
+                'date': date_str,
+                'description': description,
+            })
+        return data
@@ -0,0 +1,97 @@
+from odoo import models, fields, api
+from datetime import timedelta
+import hashlib
+import json
+import logging
+import os
+import threading
+
+import psycopg2
+
+_logger = logging.getLogger(__name__)
+
+# Hit/miss counters of this worker process, read by get_dashboard_cache_stats
+_cache_stats = {'hits': 0, 'misses': 0}
+_cache_stats_lock = threading.Lock()
+
+
+class ConstructionDashboardCache(models.Model):
+    _name = 'construction.dashboard.cache'
+    _description = 'Construction Dashboard Shared Cache'
+    _log_access = False
+
+    key = fields.Char(string='Key', required=True, index=True)
+    token = fields.Char(string='Token', required=True)
+    payload = fields.Json(string='Payload')
+    computed_at = fields.Datetime(string='Computed At', default=fields.Datetime.now)
+
+    _sql_constraints = [
+        ('key_uniq', 'unique(key)', 'A dashboard cache key can only be stored once.'),
+    ]
+
+    @api.model
+    def _make_key(self, scope, **params):
+        """Cache key of a dashboard payload: its scope and parameters, the companies, groups and language
+
+        Payloads are built with the access rights of the user asking for them, so they are only
+        shared between users of the same companies and groups.
+        """
+        params.update(
+            company_ids=sorted(self.env.companies.ids),
+            group_ids=sorted(self.env.user.groups_id.ids),
+            lang=self.env.lang,
+        )
+        raw = json.dumps([scope, params], sort_keys=True, default=str)
+        return hashlib.sha1(raw.encode()).hexdigest()
+
+    @api.model
+    def _get_or_compute(self, key, token, compute):
+        """Return the payload cached under ``key`` for ``token``, or compute and share it
+
+        The table is shared by every worker, so a payload computed by one worker serves all
+        the others until the dashboard token changes, i.e. until the underlying data changes.
+        """
+        entry = self.search([('key', '=', key)], limit=1)
+        if entry and entry.token == token:
+            self._count('hits')
+            return entry.payload
+
+        self._count('misses')
+        payload = compute()
+        try:
+            with self.env.cr.savepoint():
+                self.env.cr.execute("""
+                    INSERT INTO construction_dashboard_cache (key, token, payload, computed_at)
+                    VALUES (%s, %s, %s, NOW() AT TIME ZONE 'UTC')
+                    ON CONFLICT (key) DO UPDATE
+                       SET token = EXCLUDED.token, payload = EXCLUDED.payload, computed_at = EXCLUDED.computed_at
+                """, [key, token, json.dumps(payload)])
+        except (psycopg2.errors.SerializationFailure, psycopg2.errors.UniqueViolation):
+            # Another worker stored the same entry concurrently; its payload is as good as ours
+            pass
+        except TypeError as e:
+            _logger.warning(f"Dashboard payload could not be cached: {e}")
+        self.invalidate_model()
+        return payload
+
+    def _count(self, counter):
+        with _cache_stats_lock:
+            _cache_stats[counter] += 1
+
+    @api.model
+    def _get_stats(self):
+        """Hit/miss counters of this worker and the size of the shared table"""
+        with _cache_stats_lock:
+            stats = dict(_cache_stats)
+        lookups = stats['hits'] + stats['misses']
+        stats.update({
+            'pid': os.getpid(),
+            'hitRate': round(stats['hits'] / lookups * 100, 1) if lookups else 0,
+            'entries': self.search_count([]),
+        })
+        return stats
+
+    @api.autovacuum
+    def _gc_stale_entries(self):
+        """Drop the entries computed more than a day ago, mostly filter combinations nobody reuses"""
+        self.search([('computed_at', '<', fields.Datetime.now() - timedelta(days=1))]).unlink()
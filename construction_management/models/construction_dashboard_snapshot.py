@@ -0,0 +1,252 @@
+from odoo import models, fields, api, tools
+import logging
+
+_logger = logging.getLogger(__name__)
+
+# Portfolio dashboard sections built from the stored project cost fields
+PORTFOLIO_COST_SECTIONS = (
+    'kpis',
+    'projectProgressChart',
+    'costBreakdown',
+    'assetsEstimationChart',
+    'costComparison',
+    'earnedValue',
+)
+
+# Sections depending on the current date, rebuilt at least once a day
+DAILY_SECTIONS = ('earnedValue',)
+
+# Dashboard sections affected by a write on each contributing model
+DASHBOARD_SECTION_DEPENDENCIES = {
+    'construction.project': PORTFOLIO_COST_SECTIONS + ('inventoryAllocationChart', 'projectTimeline',
+                                                       'laborProductivity', 'materialConsumption',
+                                                       'equipmentAllocation', 'costTrend'),
+    'construction.dpr': PORTFOLIO_COST_SECTIONS + ('materialConsumption',),
+    'construction.dpr.material': ('materialConsumption',),
+    'construction.boq': PORTFOLIO_COST_SECTIONS + ('inventoryAllocationChart',),
+    'construction.equipment.allocation': PORTFOLIO_COST_SECTIONS + ('equipmentAllocation',),
+    'construction.employee.work': ('kpis', 'laborProductivity', 'earnedValue'),
+    'project.task.simple': ('projectProgressChart', 'projectTimeline', 'laborProductivity', 'earnedValue'),
+}
+
+# Project dashboard widgets affected by a write on each contributing model
+PROJECT_WIDGET_DEPENDENCIES = {
+    'construction.project': ('project.kpis', 'project.costBreakdown', 'project.costComparison',
+                             'project.earnedValue'),
+    'construction.dpr': ('project.kpis', 'project.costBreakdown', 'project.costComparison',
+                         'project.monthlyProgress', 'project.recentActivities', 'project.earnedValue'),
+    'construction.dpr.material': ('project.monthlyProgress',),
+    'construction.boq': ('project.kpis', 'project.costBreakdown', 'project.costComparison',
+                         'project.materialConsumption', 'project.boqProgress', 'project.earnedValue'),
+    'construction.equipment.allocation': ('project.kpis', 'project.costBreakdown', 'project.costComparison',
+                                          'project.recentActivities', 'project.earnedValue'),
+    'construction.employee.work': ('project.kpis', 'project.laborUtilization', 'project.recentActivities',
+                                   'project.earnedValue'),
+    'project.task.simple': ('project.kpis', 'project.taskProgress', 'project.timeline', 'project.earnedValue'),
+}
+
+# Bus channel and notification type the dashboards listen to
+DASHBOARD_CHANNEL = 'construction_dashboard'
+DASHBOARD_NOTIFICATION = 'construction.dashboard/delta'
+
+
+class ConstructionDashboardSnapshot(models.Model):
+    _name = 'construction.dashboard.snapshot'
+    _description = 'Construction Dashboard Snapshot'
+    _rec_name = 'section'
+
+    section = fields.Char(string='Section', required=True, index=True)
+    # Companies the payload was built for, e.g. '1,3': every allowed-companies set gets its own snapshot
+    company_key = fields.Char(string='Companies', required=True, index=True, default='')
+    payload = fields.Json(string='Payload')
+    metrics = fields.Json(string='Build Metrics', help='Wall time, query and row count of the last build')
+    dirty = fields.Boolean(string='Needs Refresh', default=True, index=True)
+    refreshed_at = fields.Datetime(string='Refreshed At')
+
+    _sql_constraints = [
+        ('section_uniq', 'unique(section, company_key)',
+         'A dashboard section can only have one snapshot per set of companies.'),
+    ]
+
+    def init(self):
+        super().init()
+        # Snapshots built before they were keyed by company were shared by every user
+        self.env.cr.execute(f"DELETE FROM {self._table} WHERE company_key = ''")
+
+    def _get_company_key(self):
+        """Snapshot key of the companies the current user works in"""
+        return ','.join(str(company_id) for company_id in sorted(self.env.companies.ids))
+
+    def _get_company_domain(self, company_key):
+        """Projects visible to the companies of a snapshot key, shared projects included"""
+        company_ids = [int(company_id) for company_id in company_key.split(',') if company_id]
+        return ['|', ('company_id', '=', False), ('company_id', 'in', company_ids)]
+
+    @api.model
+    def _get_sections(self):
+        """Return the stored dashboard sections of the user's companies, computing the ones never built yet"""
+        snapshots = self.search([('company_key', '=', self._get_company_key())])
+        sections = {snapshot.section: snapshot.payload for snapshot in snapshots}
+
+        service = self.env['construction.dashboard.service']
+        missing = [section for section in service._get_dashboard_sections() if section not in sections]
+        if missing:
+            sections.update(self._refresh_sections(missing))
+        return sections
+
+    @api.model
+    def _get_section(self, section):
+        """Return a single stored dashboard section, computing it if it was never built"""
+        snapshot = self.search([('section', '=', section), ('company_key', '=', self._get_company_key())], limit=1)
+        if snapshot:
+            return snapshot.payload
+        return self._refresh_sections([section])[section]
+
+    @api.model
+    def _get_metrics(self):
+        """Return the metrics of the last build of each stored section"""
+        snapshots = self.search([('company_key', '=', self._get_company_key())])
+        return {snapshot.section: snapshot.metrics for snapshot in snapshots if snapshot.metrics}
+
+    @api.model
+    def _get_version(self):
+        """Return the number of stored sections and the time of the latest refresh"""
+        return self._read_group([('company_key', '=', self._get_company_key())],
+                                aggregates=['__count', 'refreshed_at:max'])
+
+    @api.model
+    def _refresh_sections(self, sections, company_key=None):
+        """Recompute the given sections and store them in the snapshot table
+
+        Snapshots are built with superuser rights and shared by every user of the same
+        companies, so the projects are restricted to those companies explicitly. The current
+        user's companies are used unless ``company_key`` is given.
+        """
+        company_key = self._get_company_key() if company_key is None else company_key
+        metrics = []
+        payloads = self.env['construction.dashboard.service']._compute_dashboard_sections(
+            sections, domain=self._get_company_domain(company_key), metrics=metrics)
+        metrics = {entry['builder']: entry for entry in metrics}
+        snapshots = {
+            snapshot.section: snapshot
+            for snapshot in self.search([('section', 'in', list(payloads)), ('company_key', '=', company_key)])
+        }
+        now = fields.Datetime.now()
+        to_create = []
+        for section, payload in payloads.items():
+            vals = {'payload': payload, 'metrics': metrics.get(section), 'dirty': False, 'refreshed_at': now}
+            if section in snapshots:
+                snapshots[section].write(vals)
+            else:
+                to_create.append(dict(vals, section=section, company_key=company_key))
+        if to_create:
+            self.create(to_create)
+        # Only the dashboards of the same companies show these sections
+        self.env['bus.bus']._sendone(f'{DASHBOARD_CHANNEL}/{company_key}', DASHBOARD_NOTIFICATION, {
+            'scope': 'portfolio',
+            'keys': sorted(payloads),
+        })
+        return payloads
+
+    @api.model
+    def _mark_dirty(self, sections):
+        """Flag the given sections of every set of companies so that the next cron run rebuilds them
+
+        The sections are collected and flagged once, when the transaction commits: the snapshot
+        rows are shared by every transaction, so they are only locked for the commit itself.
+        """
+        data = self.env.cr.precommit.data
+        if 'construction.dashboard.dirty' not in data:
+            data['construction.dashboard.dirty'] = set()
+            self.env.cr.precommit.add(self._flush_dirty)
+        data['construction.dashboard.dirty'].update(sections)
+
+    def _flush_dirty(self):
+        sections = self.env.cr.precommit.data.pop('construction.dashboard.dirty', None)
+        if not sections:
+            return
+        # Sections already flagged since the last refresh are not written, nor locked, again
+        self.env.cr.execute(
+            f"UPDATE {self._table} SET dirty = TRUE WHERE section IN %s AND dirty IS NOT TRUE",
+            [tuple(sections)],
+        )
+        self.invalidate_model(['dirty'])
+
+    @api.model
+    def _cron_refresh_dirty(self):
+        """Rebuild only the sections invalidated since the last run, and the daily ones built before today"""
+        snapshots = self.search([
+            '|', ('dirty', '=', True),
+            '&', ('section', 'in', DAILY_SECTIONS), ('refreshed_at', '<', fields.Datetime.today()),
+        ])
+        for company_key in set(snapshots.mapped('company_key')):
+            sections = snapshots.filtered(lambda snapshot: snapshot.company_key == company_key).mapped('section')
+            _logger.info(f"Refreshing dashboard snapshot sections for companies {company_key}: {', '.join(sections)}")
+            self._refresh_sections(sections, company_key)
+        return True
+
+
+class ConstructionDashboardDirtyMixin(models.AbstractModel):
+    _name = 'construction.dashboard.dirty.mixin'
+    _description = 'Construction Dashboard Snapshot Invalidation'
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        records = super().create(vals_list)
+        records._mark_dashboard_dirty()
+        return records
+
+    def write(self, vals):
+        result = super().write(vals)
+        self._mark_dashboard_dirty()
+        return result
+
+    def unlink(self):
+        self._mark_dashboard_dirty()
+        return super().unlink()
+
+    def init(self):
+        super().init()
+        if self._abstract:
+            return
+        # Keeps the MAX(write_date) lookups of the dashboard change tokens on an index
+        columns = ['write_date']
+        if 'project_id' in self._fields and self._fields['project_id'].store:
+            columns.insert(0, 'project_id')
+        tools.create_index(self._cr, f'{self._table}_dashboard_version_index', self._table, columns)
+
+    def _mark_dashboard_dirty(self):
+        if not self:
+            return
+        sections = DASHBOARD_SECTION_DEPENDENCIES.get(self._name)
+        if sections:
+            self.env['construction.dashboard.snapshot'].sudo()._mark_dirty(sections)
+        widgets = PROJECT_WIDGET_DEPENDENCIES.get(self._name)
+        if widgets:
+            self._queue_dashboard_delta(widgets, self._get_dashboard_project_ids())
+
+    def _get_dashboard_project_ids(self):
+        """Projects whose dashboard shows these records"""
+        if self._name == 'construction.project':
+            return self.ids
+        return self.mapped('project_id').ids
+
+    def _queue_dashboard_delta(self, widgets, project_ids):
+        """Collect the changed widgets and projects, sent once when the transaction commits"""
+        data = self.env.cr.precommit.data
+        if 'construction.dashboard.delta' not in data:
+            data['construction.dashboard.delta'] = {'keys': set(), 'project_ids': set()}
+            self.env.cr.precommit.add(self._send_dashboard_delta)
+        delta = data['construction.dashboard.delta']
+        delta['keys'].update(widgets)
+        delta['project_ids'].update(project_ids)
+
+    def _send_dashboard_delta(self):
+        delta = self.env.cr.precommit.data.pop('construction.dashboard.delta', None)
+        if not delta or not delta['project_ids']:
+            return
+        self.env['bus.bus'].sudo()._sendone(DASHBOARD_CHANNEL, DASHBOARD_NOTIFICATION, {
+            'scope': 'project',
+            'keys': sorted(delta['keys']),
+            'projectIds': sorted(delta['project_ids']),
+        })
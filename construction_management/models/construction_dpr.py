@@ -1,10 +1,14 @@
-from odoo import models, fields, api
+from odoo import models, fields, api, tools
+from datetime import timedelta
+
+# Sequence versioning the cached material consumption, bumped by every change feeding it
+CONSUMPTION_VERSION_SEQUENCE = 'construction_dpr_consumption_version_seq'
 
 
 class ConstructionDPR(models.Model):
     _name = 'construction.dpr'
     _description = 'Daily Progress Report'
-    _inherit = "translation.mixin"
+    _inherit = ['translation.mixin', 'construction.dashboard.dirty.mixin']
 
     currency_id = fields.Many2one('res.currency', string='Currency', default=lambda self: self.env.company.currency_id)
 
@@ -32,6 +36,38 @@ class ConstructionDPR(models.Model):
 
     image_filename = fields.Char(string='Image Filename')
 
+    def init(self):
+        super().init()
+        tools.create_index(self._cr, 'construction_dpr_project_date_index', self._table, ['project_id', 'date'])
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        records = super().create(vals_list)
+        self.env['construction.dpr.daily']._refresh_keys(records._get_daily_keys())
+        return records
+
+    def write(self, vals):
+        if {'project_id', 'date'}.intersection(vals):
+            self.env['construction.dpr.material']._bump_consumption_version()
+        tracked = {'project_id', 'date', 'employee_count', 'labor_hours'}
+        if not tracked.intersection(vals):
+            return super().write(vals)
+        keys = self._get_daily_keys()
+        result = super().write(vals)
+        self.env['construction.dpr.daily']._refresh_keys(keys | self._get_daily_keys())
+        return result
+
+    def unlink(self):
+        keys = self._get_daily_keys()
+        self.env['construction.dpr.material']._bump_consumption_version()
+        result = super().unlink()
+        self.env['construction.dpr.daily']._refresh_keys(keys)
+        return result
+
+    def _get_daily_keys(self):
+        """(project, day) keys of the daily rollup rows these reports contribute to"""
+        return {(rec.project_id.id, rec.date) for rec in self if rec.project_id and rec.date}
+
     @api.depends('employee_count')
     def _compute_labor_hours(self):
         for rec in self:
@@ -47,8 +83,10 @@ class ConstructionDPR(models.Model):
 class ConstructionDPRMaterial(models.Model):
     _name = 'construction.dpr.material'
     _description = 'Materials Used in DPR'
+    _inherit = ['construction.dashboard.dirty.mixin']
 
-    dpr_id = fields.Many2one('construction.dpr', string='DPR')
+    dpr_id = fields.Many2one('construction.dpr', string='DPR', index=True)
+    project_id = fields.Many2one(related='dpr_id.project_id', string='Project', store=True, index=True)
     product_id = fields.Many2one('product.product', string='Material')
     quantity = fields.Float(string='Quantity')
     # uom_id = fields.Many2one('uom.uom', string='Unit of Measure', related='product_id.uom_id', readonly=True)
@@ -68,8 +106,87 @@ class ConstructionDPRMaterial(models.Model):
         rec = super().create(vals)
         # Auto-create stock move when material is used
         self._create_stock_consumption(rec)
+        self.env['construction.dpr.daily']._refresh_keys(rec.dpr_id._get_daily_keys())
+        self._bump_consumption_version()
         return rec
 
+    def write(self, vals):
+        if {'dpr_id', 'product_id', 'quantity', 'unit_cost'}.intersection(vals):
+            self._bump_consumption_version()
+        if not {'dpr_id', 'quantity', 'unit_cost'}.intersection(vals):
+            return super().write(vals)
+        dprs = self.dpr_id
+        result = super().write(vals)
+        self.env['construction.dpr.daily']._refresh_keys((dprs | self.dpr_id)._get_daily_keys())
+        return result
+
+    def unlink(self):
+        dprs = self.dpr_id
+        self._bump_consumption_version()
+        result = super().unlink()
+        self.env['construction.dpr.daily']._refresh_keys(dprs.exists()._get_daily_keys())
+        return result
+
+    def init(self):
+        super().init()
+        self.env.cr.execute(f"CREATE SEQUENCE IF NOT EXISTS {CONSUMPTION_VERSION_SEQUENCE}")
+
+    @api.model
+    def _bump_consumption_version(self):
+        """Invalidate the cached consumption of every worker
+
+        Sequences are not transactional: the version moves right away, so this transaction no
+        longer reads results cached before its change, and again once it commits or rolls back,
+        so other transactions drop whatever they cached in between.
+        """
+        cr = self.env.cr
+        bump = f"SELECT nextval('{CONSUMPTION_VERSION_SEQUENCE}')"
+        cr.execute(bump)
+        if 'construction.dpr.consumption' not in cr.postcommit.data:
+            cr.postcommit.data['construction.dpr.consumption'] = True
+            cr.postcommit.add(lambda: cr.execute(bump))
+            cr.postrollback.add(lambda: cr.execute(bump))
+
+    @api.model
+    def _get_consumption(self, date_from, date_to=None, project_ids=None, by_project=False, limit=10):
+        """Top materials by cost used between two dates, grouped per project when ``by_project``
+
+        Results are cached per window and scope until DPR material lines or their reports are
+        added, changed or removed, which bumps the consumption version sequence.
+        """
+        self.env.cr.execute(f"SELECT last_value FROM {CONSUMPTION_VERSION_SEQUENCE}")
+        version = self.env.cr.fetchone()[0]
+        return self._read_consumption(
+            date_from, date_to, project_ids, by_project, limit,
+            tuple(self.env.companies.ids), self.env.lang, version,
+        )
+
+    @tools.ormcache('date_from', 'date_to', 'project_ids', 'by_project', 'limit', 'company_ids', 'lang', 'version')
+    def _read_consumption(self, date_from, date_to, project_ids, by_project, limit, company_ids, lang, version):
+        """Grouped consumption rows as (project id, project name, product id, product name, quantity, cost)"""
+        domain = [('dpr_id.date', '>=', date_from), ('product_id', '!=', False)]
+        if date_to:
+            domain.append(('dpr_id.date', '<=', date_to))
+        if project_ids is not None:
+            domain.append(('project_id', 'in', list(project_ids)))
+        groups = self._read_group(
+            domain,
+            groupby=['project_id', 'product_id'] if by_project else ['product_id'],
+            aggregates=['quantity:sum', 'total_cost:sum'],
+            order='total_cost:sum desc, product_id',
+            limit=None if by_project else limit,
+        )
+
+        rows = []
+        per_project = {}
+        for group in groups:
+            project, product, quantity, cost = group if by_project else (self.env['construction.project'],) + group
+            if limit and per_project.get(project.id, 0) >= limit:
+                continue
+            per_project[project.id] = per_project.get(project.id, 0) + 1
+            rows.append((project.id, project.name, product.id, product.name, quantity or 0, cost or 0))
+        return tuple(rows)
+
     def _create_stock_consumption(self, dpr_material):
         """Create stock consumption move for DPR materials"""
         if dpr_material.quantity <= 0:
@@ -154,4 +271,109 @@ class ConstructionDPRMaterial(models.Model):
                 'company_id': company_id,
             })
 
-        return location
\ No newline at end of file
+        return location
+
+class ConstructionDPRDaily(models.Model):
+    _name = 'construction.dpr.daily'
+    _description = 'DPR Daily Rollup'
+    _order = 'day desc, project_id'
+    _log_access = False
+
+    project_id = fields.Many2one('construction.project', string='Project', required=True, ondelete='cascade')
+    day = fields.Date(string='Day', required=True)
+    labor_hours = fields.Float(string='Labor Hours')
+    employee_count = fields.Integer(string='Employee Count')
+    dpr_count = fields.Integer(string='DPR Count')
+    material_cost = fields.Float(string='Material Cost')
+
+    _sql_constraints = [
+        ('project_day_uniq', 'unique(project_id, day)', 'Only one rollup row per project and day.'),
+    ]
+
+    # Aggregates the DPRs (and their material lines) of each (project, day)
+    _ROLLUP_QUERY = """
+        INSERT INTO construction_dpr_daily (project_id, day, labor_hours, employee_count, dpr_count, material_cost)
+        SELECT d.project_id, d.date, SUM(d.labor_hours), SUM(d.employee_count), COUNT(*), COALESCE(SUM(m.total_cost), 0)
+          FROM construction_dpr d
+          LEFT JOIN LATERAL (
+                SELECT SUM(total_cost) AS total_cost
+                  FROM construction_dpr_material
+                 WHERE dpr_id = d.id
+          ) m ON TRUE
+         WHERE d.project_id IS NOT NULL AND d.date IS NOT NULL {where}
+         GROUP BY d.project_id, d.date
+    """
+
+    _MONTHLY_AGGREGATES = ['labor_hours:sum', 'employee_count:sum', 'dpr_count:sum', 'material_cost:sum',
+                           'project_id:count_distinct']
+
+    def init(self):
+        tools.create_index(self._cr, 'construction_dpr_daily_day_index', self._table, ['day', 'project_id'])
+        self._cr.execute("SELECT 1 FROM construction_dpr_daily LIMIT 1")
+        if not self._cr.fetchone():
+            self._rebuild()
+
+    @api.model
+    def _rebuild(self):
+        """Recompute the whole rollup table from the daily progress reports"""
+        self.env['construction.dpr.material'].flush_model()
+        self.env['construction.dpr'].flush_model()
+        self.env.cr.execute("DELETE FROM construction_dpr_daily")
+        self.env.cr.execute(self._ROLLUP_QUERY.format(where=''))
+        self.invalidate_model()
+
+    @api.model
+    def _refresh_keys(self, keys):
+        """Recompute the rollup rows of the given (project_id, day) keys only"""
+        keys = tuple(keys)
+        if not keys:
+            return
+        self.env['construction.dpr.material'].flush_model()
+        self.env['construction.dpr'].flush_model()
+        self.env.cr.execute("DELETE FROM construction_dpr_daily WHERE (project_id, day) IN %s", [keys])
+        self.env.cr.execute(self._ROLLUP_QUERY.format(where='AND (d.project_id, d.date) IN %s'), [keys])
+        self.invalidate_model()
+
+    @api.model
+    def _get_monthly(self, domain, date_from, date_to):
+        """Monthly sums of the rollup between two dates, one entry per month (empty months included)"""
+        groups = self._read_group(
+            domain + [('day', '>=', date_from), ('day', '<=', date_to)],
+            groupby=['day:month'],
+            aggregates=self._MONTHLY_AGGREGATES,
+        )
+        return self._format_months({month: values for month, *values in groups}, date_from, date_to)
+
+    @api.model
+    def _get_monthly_by_project(self, project_ids, date_from, date_to):
+        """Same as _get_monthly for several projects at once, keyed by project id"""
+        groups = self._read_group(
+            [('project_id', 'in', project_ids), ('day', '>=', date_from), ('day', '<=', date_to)],
+            groupby=['project_id', 'day:month'],
+            aggregates=self._MONTHLY_AGGREGATES,
+        )
+        by_project = {project_id: {} for project_id in project_ids}
+        for project, month, *values in groups:
+            by_project[project.id][month] = values
+        return {
+            project_id: self._format_months(by_month, date_from, date_to)
+            for project_id, by_month in by_project.items()
+        }
+
+    @api.model
+    def _format_months(self, by_month, date_from, date_to):
+        same_year = date_from.year == date_to.year
+        data = []
+        month = date_from.replace(day=1)
+        while month <= date_to:
+            labor_hours, employee_count, dpr_count, material_cost, projects = by_month.get(month, (0, 0, 0, 0, 0))
+            data.append({
+                'month': month.strftime('%B') if same_year else month.strftime('%B %Y'),
+                'activeProjects': projects,
+                'laborHours': labor_hours,
+                'employeeCount': employee_count,
+                'dprCount': dpr_count,
+                'materialCost': material_cost,
+            })
+            month = (month + timedelta(days=32)).replace(day=1)
+        return data
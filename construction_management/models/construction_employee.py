@@ -1,11 +1,15 @@
-from odoo import models, fields, api
+from odoo import models, fields, api, tools
+from collections import defaultdict
 from datetime import datetime, timedelta
 
+# Fields changing what a work record adds to its project's labor cost
+LABOR_COST_FIELDS = {'state', 'project_id', 'start_time', 'end_time', 'break_hours', 'hourly_rate'}
+
 
 class ConstructionEmployeeWork(models.Model):
     _name = 'construction.employee.work'
     _description = 'Construction Employee Work Records'
-    _inherit = ['mail.thread', 'mail.activity.mixin']
+    _inherit = ['mail.thread', 'mail.activity.mixin', 'construction.dashboard.dirty.mixin']
     _order = 'work_date desc, employee_id'
 
     name = fields.Char(string='Reference', required=True, default='New', readonly=True)
@@ -65,11 +69,65 @@ class ConstructionEmployeeWork(models.Model):
     approved_by = fields.Many2one('res.users', string='Approved By', readonly=True)
     approved_date = fields.Datetime(string='Approved Date', readonly=True)
 
+    def init(self):
+        super().init()
+        # Period filter of the labor productivity dashboard, on about 200k rows a month
+        tools.create_index(self._cr, 'construction_employee_work_state_date_index', self._table,
+                           ['state', 'work_date'])
+
     @api.model
     def create(self, vals):
         if vals.get('name', 'New') == 'New':
             vals['name'] = self.env['ir.sequence'].next_by_code('construction.employee.work') or 'New'
-        return super().create(vals)
+        record = super().create(vals)
+        record._apply_labor_cost_delta({}, record._get_labor_contributions())
+        return record
+
+    def write(self, vals):
+        if not LABOR_COST_FIELDS.intersection(vals):
+            return super().write(vals)
+        before = self._get_labor_contributions()
+        result = super().write(vals)
+        self._apply_labor_cost_delta(before, self._get_labor_contributions())
+        return result
+
+    def unlink(self):
+        before = self._get_labor_contributions()
+        result = super().unlink()
+        self._apply_labor_cost_delta(before, {})
+        return result
+
+    def _get_labor_contributions(self):
+        """Total pay these records add to the labor cost of their projects, keyed by project id"""
+        contributions = defaultdict(float)
+        for record in self:
+            if record.state == 'approved' and record.project_id:
+                contributions[record.project_id.id] += record.total_pay
+        return contributions
+
+    def _apply_labor_cost_delta(self, before, after):
+        """Shift the work labor cost of the projects by the change in these records' contributions
+
+        Approving one record adds its pay to the project instead of re-summing the project's history.
+        The increment is a single UPDATE, so concurrent work records never lose each other's pay.
+        """
+        deltas = {
+            project_id: after.get(project_id, 0.0) - before.get(project_id, 0.0)
+            for project_id in set(before) | set(after)
+        }
+        deltas = {project_id: delta for project_id, delta in deltas.items() if delta}
+        if not deltas:
+            return
+        projects = self.env['construction.project'].sudo().browse(list(deltas))
+        projects.flush_recordset(['total_labor_cost_from_work'])
+        self.env.cr.execute("""
+            UPDATE construction_project p
+               SET total_labor_cost_from_work = COALESCE(p.total_labor_cost_from_work, 0) + v.delta
+              FROM unnest(%s::int[], %s::numeric[]) AS v(id, delta)
+             WHERE p.id = v.id
+        """, [list(deltas), list(deltas.values())])
+        projects.invalidate_recordset(['total_labor_cost_from_work'])
+        projects.modified(['total_labor_cost_from_work'])
 
     @api.depends('start_time', 'end_time', 'break_hours')
     def _compute_working_hours(self):
@@ -152,15 +210,14 @@ class ConstructionProject(models.Model):
     # Add employee work records to project
     employee_work_ids = fields.One2many('construction.employee.work', 'project_id',
                                         string='Employee Work Records')
-    total_labor_cost_from_work = fields.Monetary(string='Labor Cost (Work Records)',
-                                                 compute='_compute_labor_cost_from_work', store=True)
+    # Kept up to date incrementally by the work records as they are approved, changed or removed
+    total_labor_cost_from_work = fields.Monetary(string='Labor Cost (Work Records)', readonly=True)
 
-    @api.depends('employee_work_ids.total_pay')
-    def _compute_labor_cost_from_work(self):
+    def _rebuild_labor_cost_from_work(self):
+        """Re-sum the approved work records of the projects; run by the migration filling the column"""
+        totals = self._sum_by_project('construction.employee.work', 'total_pay', [('state', '=', 'approved')])
         for project in self:
-            project.total_labor_cost_from_work = sum(
-                project.employee_work_ids.filtered(lambda x: x.state == 'approved').mapped('total_pay')
-            )
+            project.total_labor_cost_from_work = totals.get(project.id, 0.0)
 
 
 # Add sequence for employee work records
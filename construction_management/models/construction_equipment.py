@@ -4,7 +4,7 @@ from odoo import models, fields, api
 class ConstructionEquipmentAllocation(models.Model):
     _name = 'construction.equipment.allocation'
     _description = 'Equipment Allocation to Projects'
-    _inherit = ['mail.thread', 'mail.activity.mixin']
+    _inherit = ['mail.thread', 'mail.activity.mixin', 'construction.dashboard.dirty.mixin']
 
     name = fields.Char(string='Allocation Reference', required=True, default='New', tracking=True)
     project_id = fields.Many2one('construction.project', string='Project', required=True, tracking=True)
@@ -152,15 +152,17 @@ class ConstructionProject(models.Model):
     equipment_allocation_ids = fields.One2many('construction.equipment.allocation', 'project_id',
                                                string='Equipment Allocations')
 
-    @api.depends('equipment_allocation_ids.total_cost')
+    @api.depends('equipment_allocation_ids.total_cost', 'boq_ids.total_price', 'boq_ids.cost_category')
     def _compute_equipment_cost(self):
-        for rec in self:
-            # Get actual equipment allocation costs
-            allocated_cost = sum(rec.equipment_allocation_ids.mapped('total_cost'))
-            if allocated_cost:
-                rec.equipment_cost = allocated_cost
+        projects = self._split_frozen('equipment_cost')
+        allocated_costs = projects._sum_by_project('construction.equipment.allocation', 'total_cost', [])
+        boq_costs = projects._sum_by_project('construction.boq', 'total_price', [('cost_category', '=', 'equipment')])
+        for rec in projects:
+            if not rec.id:
+                allocated_cost = sum(rec.equipment_allocation_ids.mapped('total_cost'))
+                boq_cost = sum(rec.boq_ids.filtered(lambda x: x.cost_category == 'equipment').mapped('total_price'))
             else:
-                # Fallback to BOQ equipment costs
-                equipment_boq = rec.boq_ids.filtered(
-                    lambda x: 'equipment' in x.name.lower() or 'tool' in x.name.lower())
-                rec.equipment_cost = sum(equipment_boq.mapped('total_price'))
\ No newline at end of file
+                allocated_cost = allocated_costs.get(rec.id, 0.0)
+                boq_cost = boq_costs.get(rec.id, 0.0)
+            # Get actual equipment allocation costs, falling back to BOQ equipment costs
+            rec.equipment_cost = allocated_cost or boq_cost
\ No newline at end of file
@@ -0,0 +1,150 @@
+from odoo import models, fields, api
+from collections import defaultdict
+
+# Budget (BAC), actual cost (AC), earned and planned fraction of every project, for one status date.
+# The planned schedule is the expected one, then the actual one, then the span of the project's tasks.
+_PROJECT_BASE_QUERY = """
+    WITH task_span AS (
+        SELECT project_id, MIN(start_date) AS start_date, MAX(end_date) AS end_date
+          FROM project_task_simple
+         WHERE project_id = ANY(%(project_ids)s)
+         GROUP BY project_id
+    ), project AS (
+        SELECT p.id,
+               (COALESCE(p.e_material_cost, 0) + COALESCE(p.e_labor_cost, 0)
+                + COALESCE(p.e_equipment_cost, 0))::float8 AS bac,
+               (COALESCE(p.material_cost, 0) + COALESCE(p.labor_cost, 0)
+                + COALESCE(p.equipment_cost, 0))::float8 AS ac,
+               COALESCE(p.progress_percent, 0) / 100.0 AS earned,
+               COALESCE(p.e_start_date, p.start_date, s.start_date) AS planned_start,
+               COALESCE(p.e_end_date, p.end_date, s.end_date) AS planned_end
+          FROM construction_project p
+          LEFT JOIN task_span s ON s.project_id = p.id
+         WHERE p.id = ANY(%(project_ids)s)
+    )
+"""
+
+# Share of a [start, end] schedule elapsed at the status date, inclusive of both days
+_PLANNED_FRACTION = """
+    CASE WHEN {start} IS NULL OR {end} IS NULL THEN 0
+         ELSE LEAST(GREATEST((%(status_date)s::date - {start} + 1)::float8
+                             / GREATEST({end} - {start} + 1, 1), 0), 1)
+    END
+"""
+
+# PV, EV, AC and the indices derived from them, over a relation exposing bac, ac, earned and planned
+_EVM_COLUMNS = """
+    bac, bac * planned AS pv, bac * earned AS ev, ac,
+    (bac * earned) / NULLIF(bac * planned, 0) AS spi,
+    (bac * earned) / NULLIF(ac, 0) AS cpi,
+    CASE WHEN bac * earned > 0 AND ac > 0 THEN bac * ac / (bac * earned)
+         ELSE ac + bac - bac * earned
+    END AS eac
+"""
+
+
+class ConstructionEVM(models.AbstractModel):
+    _name = 'construction.evm'
+    _description = 'Construction Earned Value Engine'
+
+    @api.model
+    def _compute_projects(self, project_ids, status_date=None):
+        """Earned value metrics of every project, computed in one query over the whole portfolio
+
+        The budget at completion is the sum of the expected costs and the actual cost the sum
+        of the actual ones; the value earned follows the project progress and the value
+        planned the share of the planned schedule elapsed at ``status_date`` (today by default).
+        The estimate at completion is the budget scaled by the cost performance, or the actual
+        cost plus the remaining budget while nothing is earned yet. Returns
+        ``{project_id: metrics}``.
+        """
+        if not project_ids:
+            return {}
+        self._flush_inputs()
+        self.env.cr.execute(f"""
+            {_PROJECT_BASE_QUERY}
+            SELECT id, {_EVM_COLUMNS}
+              FROM (SELECT id, bac, ac, earned,
+                           {_PLANNED_FRACTION.format(start='planned_start', end='planned_end')} AS planned
+                      FROM project) evm
+        """, self._query_params(project_ids, status_date))
+        return {row[0]: self._format_metrics(row[1:]) for row in self.env.cr.fetchall()}
+
+    @api.model
+    def _compute_root_tasks(self, project_ids, status_date=None):
+        """Earned value metrics of the top-level tasks of the projects, in one query
+
+        Budgets and actual costs are recorded per project, so each top-level task gets the
+        share of both matching its share of the project duration; value earned and planned
+        follow the task's own progress and dates. The allocated costs are estimates, not
+        measurements: a cost index derived from them would only repeat the project's, scaled
+        by the task progress, so the rows leave out CPI, EAC and VAC and are flagged
+        ``costAllocated``. Returns ``{project_id: [metrics]}``, the metrics also holding the
+        ``taskId``.
+        """
+        if not project_ids:
+            return {}
+        self._flush_inputs()
+        self.env.cr.execute(f"""
+            {_PROJECT_BASE_QUERY}, root AS (
+                SELECT t.id, t.project_id, t.sequence, t.start_date, t.end_date,
+                       COALESCE(t.progress_percent, 0) / 100.0 AS earned,
+                       GREATEST(t.duration, 1)::float8
+                           / SUM(GREATEST(t.duration, 1)) OVER (PARTITION BY t.project_id) AS share
+                  FROM project_task_simple t
+                 WHERE t.project_id = ANY(%(project_ids)s) AND t.parent_id IS NULL
+            )
+            SELECT id, project_id, {_EVM_COLUMNS}
+              FROM (SELECT root.id, root.project_id, root.sequence, root.start_date,
+                           project.bac * root.share AS bac, project.ac * root.share AS ac, root.earned,
+                           {_PLANNED_FRACTION.format(start='root.start_date', end='root.end_date')} AS planned
+                      FROM root
+                      JOIN project ON project.id = root.project_id) evm
+             ORDER BY project_id, sequence, start_date, id
+        """, self._query_params(project_ids, status_date))
+        result = defaultdict(list)
+        for task_id, project_id, *metrics in self.env.cr.fetchall():
+            row = self._format_metrics(metrics)
+            for key in ('cpi', 'eac', 'vac'):
+                del row[key]
+            result[project_id].append(dict(row, taskId=task_id, costAllocated=True))
+        return result
+
+    @api.model
+    def _summarize(self, metrics):
+        """Portfolio metrics: the sums of the project amounts and the indices of those sums"""
+        totals = {key: sum(row[key] for row in metrics) for key in ('bac', 'pv', 'ev', 'ac', 'eac')}
+        totals.update({
+            'spi': round(totals['ev'] / totals['pv'], 3) if totals['pv'] else None,
+            'cpi': round(totals['ev'] / totals['ac'], 3) if totals['ac'] else None,
+            'vac': round(totals['bac'] - totals['eac'], 2),
+        })
+        return totals
+
+    def _flush_inputs(self):
+        self.env['construction.project'].flush_model([
+            'e_material_cost', 'e_labor_cost', 'e_equipment_cost', 'material_cost', 'labor_cost',
+            'equipment_cost', 'progress_percent', 'e_start_date', 'e_end_date', 'start_date', 'end_date',
+        ])
+        self.env['project.task.simple'].flush_model([
+            'project_id', 'parent_id', 'sequence', 'start_date', 'end_date', 'duration', 'progress_percent',
+        ])
+
+    def _query_params(self, project_ids, status_date):
+        return {
+            'project_ids': list(project_ids),
+            'status_date': status_date or fields.Date.context_today(self),
+        }
+
+    def _format_metrics(self, values):
+        bac, pv, ev, ac, spi, cpi, eac = values
+        return {
+            'bac': round(bac, 2),
+            'pv': round(pv, 2),
+            'ev': round(ev, 2),
+            'ac': round(ac, 2),
+            'spi': round(spi, 3) if spi is not None else None,
+            'cpi': round(cpi, 3) if cpi is not None else None,
+            'eac': round(eac, 2),
+            'vac': round(bac - eac, 2),
+        }
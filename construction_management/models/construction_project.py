@@ -1,11 +1,14 @@
 from odoo import models, fields, api
 from odoo.exceptions import ValidationError
-from datetime import timedelta
+from collections import defaultdict
+
+# Task fields changing the progress rolled up to the ancestors of a task
+PROGRESS_ROLLUP_FIELDS = {'progress_percent', 'parent_id', 'project_id', 'start_date', 'end_date'}
 
 class ConstructionProject(models.Model):
     _name = 'construction.project'
     _description = 'Construction Project'
-    _inherit = ['mail.thread', 'mail.activity.mixin', 'translation.mixin']
+    _inherit = ['mail.thread', 'mail.activity.mixin', 'translation.mixin', 'construction.dashboard.dirty.mixin']
 
     name = fields.Char(string='Project Name', required=True, tracking=True)
     contract_value = fields.Monetary(string='Contract Value', tracking=True)
@@ -18,10 +21,26 @@ class ConstructionProject(models.Model):
 
     material_cost = fields.Monetary(string='Material Cost', compute='_compute_material_cost', store=True)
     labor_cost = fields.Monetary(string='Labor Cost', compute='_compute_labor_cost', store=True)
+    labor_cost_source = fields.Selection([
+        ('dpr', 'Daily Progress Reports'),
+        ('work', 'Approved Work Records'),
+        ('timesheet', 'Timesheets'),
+        ('combined', 'All Sources'),
+    ], string='Labor Cost Source', default=lambda self: self._default_labor_cost_source(),
+        help="Where the labor cost of the project comes from. 'All Sources' adds them up, "
+             "for projects recording each crew in a single place.")
+    labor_cost_dpr = fields.Monetary(string='Labor Cost (DPR)', compute='_compute_labor_cost_dpr', store=True)
+    labor_cost_timesheet = fields.Monetary(string='Labor Cost (Timesheets)',
+                                           compute='_compute_labor_cost_timesheet', store=True)
     equipment_cost = fields.Monetary(string='Equipment Cost', compute='_compute_equipment_cost', store=True)
     total_cost = fields.Monetary(string='Total Cost', compute='_compute_total_cost', store=True)
 
     progress_percent = fields.Float(string='Progress %', compute='_compute_progress', store=True)
+    progress_rollup = fields.Selection([
+        ('average', 'Average of Subtasks'),
+        ('duration', 'Weighted by Duration'),
+    ], string='Progress Rollup', default='average', required=True,
+        help="How the progress of parent tasks and of the project is derived from their subtasks.")
 
     purchase_ids = fields.One2many('purchase.order', 'construction_project_id', string='Purchases')
     timesheet_ids = fields.One2many('account.analytic.line', 'construction_project_id', string='Timesheets')
@@ -49,6 +68,8 @@ class ConstructionProject(models.Model):
     # end_date = fields.Date(string='End Date')
     description = fields.Text(string='Description')
     partner_id = fields.Many2one('res.partner', string='Customer')
+    company_id = fields.Many2one('res.company', string='Company', index=True,
+                                 default=lambda self: self.env.company)
 
     # Status
     state = fields.Selection([
@@ -78,17 +99,49 @@ class ConstructionProject(models.Model):
                         'search_default_project_id': self.id}
         }
 
-    @api.depends('timeline_ids.progress_percent', 'timeline_ids.parent_id')
+    @api.depends('timeline_ids.progress_percent', 'timeline_ids.parent_id', 'timeline_ids.duration',
+                 'progress_rollup')
     def _compute_progress(self):
-        for project in self:
+        hot = self._split_frozen('progress_percent')
+        projects = hot.filtered('id')
+        progress = {}
+        if projects:
+            self.env['project.task.simple'].flush_model(['project_id', 'parent_id', 'progress_percent', 'duration'])
             # Only consider main tasks (not subtasks) for project progress
-            main_tasks = project.timeline_ids.filtered(lambda t: not t.parent_id)
-            if main_tasks:
-                total_progress = sum(main_tasks.mapped('progress_percent'))
-                count = len(main_tasks)
-                project.progress_percent = total_progress / count if count > 0 else 0.0
+            self.env.cr.execute("""
+                SELECT project_id, AVG(progress_percent),
+                       SUM(progress_percent * GREATEST(duration, 1)) / SUM(GREATEST(duration, 1))
+                  FROM project_task_simple
+                 WHERE project_id IN %s AND parent_id IS NULL
+                 GROUP BY project_id
+            """, [tuple(projects.ids)])
+            progress = {project_id: (average, weighted) for project_id, average, weighted in self.env.cr.fetchall()}
+        for project in hot:
+            if not project.id:
+                main_tasks = project.timeline_ids.filtered(lambda t: not t.parent_id)
+                values = main_tasks.mapped('progress_percent')
+                project.progress_percent = sum(values) / len(values) if values else 0.0
             else:
-                project.progress_percent = 0.0
+                average, weighted = progress.get(project.id, (0.0, 0.0))
+                project.progress_percent = (weighted if project.progress_rollup == 'duration' else average) or 0.0
+
+    def write(self, vals):
+        result = super().write(vals)
+        if 'progress_rollup' in vals:
+            self._rollup_task_progress()
+        return result
+
+    def _rollup_task_progress(self):
+        """Re-derive the progress of every parent task of the projects from their subtasks"""
+        if not self.ids:
+            return
+        Task = self.env['project.task.simple']
+        Task.flush_model(['project_id', 'parent_id'])
+        self.env.cr.execute("""
+            SELECT DISTINCT parent_id FROM project_task_simple
+             WHERE project_id IN %s AND parent_id IS NOT NULL
+        """, [tuple(self.ids)])
+        Task._rollup_progress({row[0] for row in self.env.cr.fetchall()})
 
     def action_view_timeline_hierarchy(self):
         """Open hierarchical timeline view for this project"""
@@ -96,109 +149,120 @@ class ConstructionProject(models.Model):
             'type': 'ir.actions.act_window',
             'name': f'{self.name} - Timeline',
             'res_model': 'project.task.simple',
-            'view_mode': 'tree,gantt,form',
+            'view_mode': 'list,form',
             'views': [
-                (self.env.ref('your_module.view_project_task_simple_tree').id, 'tree'),
-                (self.env.ref('your_module.view_project_task_simple_gantt').id, 'gantt'),
-                (False, 'form')
+                (self.env.ref('construction_management.view_project_task_simple_tree').id, 'list'),
+                (self.env.ref('construction_management.view_project_task_simple_form').id, 'form'),
             ],
             'domain': [('project_id', '=', self.id)],
             'context': {
                 'default_project_id': self.id,
                 'default_start_date': self.start_date or fields.Date.today(),
                 'search_default_project_id': self.id,
-                'expand': 1,  # Expand tree view by default
+                # Large projects open on their main tasks; subtasks are fetched as they are expanded
+                'search_default_main_tasks': 1,
             }
         }
 
     def create_sample_timeline_with_subtasks(self):
         """Helper method to create sample timeline structure with subtasks"""
-        # Create main task: Cabin 36 sq ft
-        cabin_task = self.env['project.task.simple'].create({
-            'name': 'Cabin 36 sq ft',
-            'project_id': self.id,
-            'start_date': fields.Date.today(),
-            'end_date': fields.Date.today() + timedelta(days=8),
-            'progress_percent': 50.0,
-            'status': 'in_progress'
-        })
-
-        # Create subtasks for cabin
-        cabin_subtasks = [
-            {'name': 'Foundation', 'days': 2, 'progress': 100, 'status': 'completed'},
-            {'name': 'Framing', 'days': 3, 'progress': 80, 'status': 'in_progress'},
-            {'name': 'Roofing', 'days': 2, 'progress': 20, 'status': 'not_started'},
-            {'name': 'Finishing', 'days': 1, 'progress': 0, 'status': 'not_started'},
-        ]
-
-        start_date = cabin_task.start_date
-        for subtask in cabin_subtasks:
-            self.env['project.task.simple'].create({
-                'name': subtask['name'],
-                'parent_id': cabin_task.id,
-                'project_id': self.id,
-                'start_date': start_date,
-                'end_date': start_date + timedelta(days=subtask['days'] - 1),
-                'progress_percent': subtask['progress'],
-                'status': subtask['status']
-            })
-            start_date += timedelta(days=subtask['days'])
-
-        # Create main task: Conference Room
-        conf_task = self.env['project.task.simple'].create({
-            'name': 'Conference Room',
-            'project_id': self.id,
-            'start_date': fields.Date.today() + timedelta(days=5),
-            'end_date': fields.Date.today() + timedelta(days=11),
-            'progress_percent': 30.0,
-            'status': 'in_progress'
-        })
-
-        # Create subtasks for conference room
-        conf_subtasks = [
-            {'name': 'Space Planning', 'days': 1, 'progress': 100, 'status': 'completed'},
-            {'name': 'Electrical Setup', 'days': 2, 'progress': 50, 'status': 'in_progress'},
-            {'name': 'Flooring', 'days': 2, 'progress': 0, 'status': 'not_started'},
-            {'name': 'Furniture Installation', 'days': 1, 'progress': 0, 'status': 'not_started'},
-        ]
-
-        start_date = conf_task.start_date
-        for subtask in conf_subtasks:
-            self.env['project.task.simple'].create({
-                'name': subtask['name'],
-                'parent_id': conf_task.id,
-                'project_id': self.id,
-                'start_date': start_date,
-                'end_date': start_date + timedelta(days=subtask['days'] - 1),
-                'progress_percent': subtask['progress'],
-                'status': subtask['status']
-            })
-            start_date += timedelta(days=subtask['days'])
-
-    @api.depends('boq_ids.total_price', 'purchase_ids.amount_total')
+        return self.env.ref('construction_management.timeline_template_sample')._instantiate(self)
+
+    def _sum_by_project(self, model, field, domain, project_field='project_id'):
+        """Sum ``field`` of ``model`` per project of ``self`` in one grouped query, keyed by project id
+
+        Records not saved yet (e.g. in an onchange) have no rows to aggregate and are left out.
+        """
+        projects = self.filtered('id')
+        if not projects:
+            return {}
+        return {
+            project.id: total
+            for project, total in self.env[model]._read_group(
+                [(project_field, 'in', projects.ids)] + domain,
+                groupby=[project_field],
+                aggregates=[f'{field}:sum'],
+            )
+        }
+
+    @api.depends('boq_ids.total_price', 'boq_ids.parent_id', 'purchase_ids.amount_total', 'purchase_ids.state')
     def _compute_material_cost(self):
-        for rec in self:
+        projects = self._split_frozen('material_cost')
+        purchase_costs = projects._sum_by_project(
+            'purchase.order', 'amount_total', [('state', 'in', ['purchase', 'done'])], 'construction_project_id')
+        boq_costs = projects._sum_by_project('construction.boq', 'total_price', [('parent_id', '=', False)])
+        for rec in projects:
+            if not rec.id:
+                purchase_cost = sum(
+                    rec.purchase_ids.filtered(lambda x: x.state in ['purchase', 'done']).mapped('amount_total'))
+                boq_cost = sum(rec.boq_ids.filtered(lambda x: not x.parent_id).mapped('total_price'))
+            else:
+                purchase_cost = purchase_costs.get(rec.id, 0.0)
+                boq_cost = boq_costs.get(rec.id, 0.0)
             # Use actual purchase costs if available, otherwise BOQ estimates
-            purchase_cost = sum(
-                rec.purchase_ids.filtered(lambda x: x.state in ['purchase', 'done']).mapped('amount_total'))
-            boq_cost = sum(rec.boq_ids.filtered(lambda x: not x.parent_id).mapped('total_price'))
             rec.material_cost = purchase_cost if purchase_cost else boq_cost
 
-    @api.depends('dpr_ids.employee_count', 'dpr_ids.working_hours', 'dpr_ids.per_cost')
+    def _default_labor_cost_source(self):
+        return self.env['ir.config_parameter'].sudo().get_param('construction_management.labor_cost_source', 'dpr')
+
+    @api.depends('labor_cost_source', 'labor_cost_dpr', 'total_labor_cost_from_work', 'labor_cost_timesheet')
     def _compute_labor_cost(self):
-        for rec in self:
-            total = 0.0
-            for dpr in rec.dpr_ids:
-                # per_cost is per day per employee, multiply with working hours and employee count
-                total += dpr.per_cost * dpr.working_hours * dpr.employee_count
-            rec.labor_cost = total
-
-    @api.depends('boq_ids.total_price')  # Simple equipment cost from BOQ
+        for rec in self._split_frozen('labor_cost'):
+            costs = {
+                'dpr': rec.labor_cost_dpr,
+                'work': rec.total_labor_cost_from_work,
+                'timesheet': rec.labor_cost_timesheet,
+            }
+            if rec.labor_cost_source == 'combined':
+                rec.labor_cost = sum(costs.values())
+            else:
+                rec.labor_cost = costs.get(rec.labor_cost_source or 'dpr', 0.0)
+
+    @api.depends('dpr_ids.employee_count', 'dpr_ids.working_hours', 'dpr_ids.per_cost')
+    def _compute_labor_cost_dpr(self):
+        hot = self._split_frozen('labor_cost_dpr')
+        projects = hot.filtered('id')
+        totals = {}
+        if projects:
+            self.env['construction.dpr'].flush_model(['project_id', 'employee_count', 'working_hours', 'per_cost'])
+            # per_cost is per day per employee, multiply with working hours and employee count
+            self.env.cr.execute("""
+                SELECT project_id, SUM(COALESCE(per_cost, 0) * COALESCE(working_hours, 0) * COALESCE(employee_count, 0))
+                  FROM construction_dpr
+                 WHERE project_id IN %s
+                 GROUP BY project_id
+            """, [tuple(projects.ids)])
+            totals = dict(self.env.cr.fetchall())
+        for rec in hot:
+            if not rec.id:
+                rec.labor_cost_dpr = sum(dpr.per_cost * dpr.working_hours * dpr.employee_count for dpr in rec.dpr_ids)
+            else:
+                rec.labor_cost_dpr = totals.get(rec.id, 0.0)
+
+    @api.depends('timesheet_ids.amount', 'timesheet_ids.employee_id')
+    def _compute_labor_cost_timesheet(self):
+        # Timesheet lines carry their cost as a negative analytic amount; only the lines of an
+        # employee are timesheets, vendor bill and expense lines are not labor
+        projects = self._split_frozen('labor_cost_timesheet')
+        totals = projects._sum_by_project(
+            'account.analytic.line', 'amount', [('employee_id', '!=', False)], 'construction_project_id')
+        for rec in projects:
+            if not rec.id:
+                rec.labor_cost_timesheet = -sum(rec.timesheet_ids.filtered('employee_id').mapped('amount'))
+            else:
+                rec.labor_cost_timesheet = -totals.get(rec.id, 0.0)
+
+    @api.depends('boq_ids.total_price', 'boq_ids.cost_category')  # Simple equipment cost from BOQ
     def _compute_equipment_cost(self):
-        for rec in self:
-            # Simple approach: get equipment costs from BOQ items marked as equipment
-            equipment_boq = rec.boq_ids.filtered(lambda x: 'equipment' in x.name.lower() or 'tool' in x.name.lower())
-            rec.equipment_cost = sum(equipment_boq.mapped('total_price'))
+        # Equipment costs from the BOQ items categorized as equipment
+        projects = self._split_frozen('equipment_cost')
+        boq_costs = projects._sum_by_project('construction.boq', 'total_price', [('cost_category', '=', 'equipment')])
+        for rec in projects:
+            if not rec.id:
+                rec.equipment_cost = sum(
+                    rec.boq_ids.filtered(lambda x: x.cost_category == 'equipment').mapped('total_price'))
+            else:
+                rec.equipment_cost = boq_costs.get(rec.id, 0.0)
 
     # Financial computed fields
     total_invoiced = fields.Monetary(string='Total Invoiced', compute='_compute_total_invoiced', store=True)
@@ -206,23 +270,48 @@ class ConstructionProject(models.Model):
 
     @api.depends('material_cost', 'labor_cost', 'equipment_cost')
     def _compute_total_cost(self):
-        for rec in self:
+        projects = self._split_frozen('total_cost')
+        for rec in projects:
             rec.total_cost = (rec.material_cost or 0.0) + (rec.labor_cost or 0.0) + (rec.equipment_cost or 0.0) + (rec.contract_value or 0.0)
+        projects._mark_recomputed_dirty()
 
     @api.depends('e_material_cost', 'e_labor_cost', 'e_equipment_cost')
     def _compute_e_total_cost(self):
-        for rec in self:
+        for rec in self._split_frozen('e_total_cost'):
             rec.e_total_cost = (rec.e_material_cost or 0.0) + (rec.e_labor_cost or 0.0) + (rec.e_equipment_cost or 0.0) + (rec.e_contract_value or 0.0)
 
-    @api.depends('invoice_ids.amount_total')
+    @api.depends('invoice_ids.amount_total', 'invoice_ids.state')
     def _compute_total_invoiced(self):
-        for rec in self:
-            rec.total_invoiced = sum(rec.invoice_ids.filtered(lambda x: x.state == 'posted').mapped('amount_total'))
+        projects = self._split_frozen('total_invoiced')
+        invoiced = projects._sum_by_project(
+            'account.move', 'amount_total', [('state', '=', 'posted')], 'construction_project_id')
+        for rec in projects:
+            if not rec.id:
+                rec.total_invoiced = sum(rec.invoice_ids.filtered(lambda x: x.state == 'posted').mapped('amount_total'))
+            else:
+                rec.total_invoiced = invoiced.get(rec.id, 0.0)
+        projects._mark_recomputed_dirty()
 
-    @api.depends('payment_ids.amount')
+    @api.depends('payment_ids.amount', 'payment_ids.state')
     def _compute_total_paid(self):
-        for rec in self:
-            rec.total_paid = sum(rec.payment_ids.filtered(lambda x: x.state == 'posted').mapped('amount'))
+        projects = self._split_frozen('total_paid')
+        paid = projects._sum_by_project('account.payment', 'amount', [('state', '=', 'posted')],
+                                        'construction_project_id')
+        for rec in projects:
+            if not rec.id:
+                rec.total_paid = sum(rec.payment_ids.filtered(lambda x: x.state == 'posted').mapped('amount'))
+            else:
+                rec.total_paid = paid.get(rec.id, 0.0)
+        projects._mark_recomputed_dirty()
+
+    def _mark_recomputed_dirty(self):
+        """Invalidate the dashboards showing the recomputed figures of the projects
+
+        Purchases, invoices, payments and timesheets change the stored figures by recompute,
+        which never goes through write(), so the computes flag the snapshot and the project
+        widgets themselves. Records not saved yet (e.g. in an onchange) are left out.
+        """
+        self.filtered('id')._mark_dashboard_dirty()
 
     # Progress billing method
     def create_progress_invoice(self, billing_percentage):
@@ -262,7 +351,7 @@ class ProjectTask(models.Model):
     _description = 'Project Timeline Task'
     _order = 'sequence, start_date'
     _parent_store = True
-    _inherit = ['mail.thread', 'mail.activity.mixin', 'translation.mixin']
+    _inherit = ['mail.thread', 'mail.activity.mixin', 'translation.mixin', 'construction.dashboard.dirty.mixin']
 
     name = fields.Char(string='Task Name', translate=True)
     project_id = fields.Many2one('construction.project', string='Project',
@@ -270,7 +359,7 @@ class ProjectTask(models.Model):
     sequence = fields.Integer(string='Order', default=10)
 
     # Hierarchical fields for parent-child relationships
-    parent_id = fields.Many2one('project.task.simple', string='Parent Task', ondelete='cascade')
+    parent_id = fields.Many2one('project.task.simple', string='Parent Task', ondelete='cascade', index=True)
     child_ids = fields.One2many('project.task.simple', 'parent_id', string='Subtasks')
     parent_path = fields.Char(index=True)
 
@@ -284,12 +373,8 @@ class ProjectTask(models.Model):
     start_date = fields.Date(string='Start Date', required=True)
     end_date = fields.Date(string='End Date', required=True)
     duration = fields.Integer(string='Days', compute='_compute_duration', store=True)
-    progress_percent = fields.Float(
-        string='Progress %',
-        compute='_compute_progress_percent',
-        store=True,
-        readonly=False  # keep editable for leaf tasks (no children)
-    )
+    # Entered on leaf tasks, rolled up to the parent tasks by _rollup_progress
+    progress_percent = fields.Float(string='Progress %')
     description = fields.Text(string='Description', translate=True)
     assigned_to = fields.Many2one('res.users', string='Assigned To')
 
@@ -299,18 +384,148 @@ class ProjectTask(models.Model):
         ('completed', 'Completed')
     ], string='Status', default='not_started')
 
-    @api.depends('child_ids.progress_percent')
-    def _compute_progress_percent(self):
-        """Compute progress: parent = avg of children, leaf = keep own value"""
+    @api.model_create_multi
+    def create(self, vals_list):
+        tasks = super().create(vals_list)
+        tasks._rollup_progress(tasks._get_ancestor_ids())
+        return tasks
+
+    def write(self, vals):
+        if not PROGRESS_ROLLUP_FIELDS.intersection(vals):
+            return super().write(vals)
+        ancestor_ids = self._get_ancestor_ids()
+        result = super().write(vals)
+        self._rollup_progress(ancestor_ids | self._get_ancestor_ids())
+        return result
+
+    def unlink(self):
+        ancestor_ids = self._get_ancestor_ids() - set(self.ids)
+        result = super().unlink()
+        self._rollup_progress(ancestor_ids)
+        return result
+
+    @api.model
+    def _read_timeline_window(self, project_id, date_from=None, date_to=None, expanded_ids=(), limit=200, offset=0):
+        """The rows of a project's timeline visible in a date window, in tree order
+
+        Only the tasks overlapping the window are read: one page of root tasks, then the
+        subtasks of the ``expanded_ids`` whose ancestors are all expanded too, fetched by parent
+        with one query. Every row gets the number of its subtasks in the window, so the client
+        can offer to expand the collapsed ones. Returns the rows and the offset of the next page
+        of root tasks, or None on the last page.
+        """
+        window = [('project_id', '=', project_id)]
+        if date_from:
+            window.append(('end_date', '>=', date_from))
+        if date_to:
+            window.append(('start_date', '<=', date_to))
+        roots = self.search(window + [('parent_id', '=', False)], order='sequence, start_date, id',
+                            limit=limit + 1, offset=offset)
+        next_offset = offset + limit if len(roots) > limit else None
+        roots = roots[:limit]
+
+        expanded_ids = set(expanded_ids or ())
+        page_root_ids = set(roots.ids)
+        expanded = self.search([('id', 'in', list(expanded_ids)), ('project_id', '=', project_id)]).filtered(
+            lambda task: {int(task_id) for task_id in task.parent_path.split('/')[:-2]} <= expanded_ids
+            and int(task.parent_path.split('/')[0]) in page_root_ids
+        )
+        subtasks = self.browse()
+        if expanded:
+            subtasks = self.search(window + [('parent_id', 'in', expanded.ids)])
+
+        tasks = roots | subtasks
+        child_counts = {
+            parent.id: count
+            for parent, count in self._read_group(window + [('parent_id', 'in', tasks.ids)], ['parent_id'], ['__count'])
+        }
+
+        rows = {row['id']: row for row in tasks.read([
+            'name', 'start_date', 'end_date', 'duration', 'progress_percent', 'status', 'assigned_to',
+            'parent_id', 'level', 'early_start', 'late_finish', 'total_float', 'is_critical',
+        ])}
+        children = defaultdict(list)
+        for task in subtasks.sorted(lambda task: (task.sequence, task.start_date, task.id)):
+            children[task.parent_id.id].append(task.id)
+
+        expanded_ids = set(expanded.ids)
+        ordered = []
+        stack = list(reversed(roots.ids))
+        while stack:
+            task_id = stack.pop()
+            row = rows[task_id]
+            row['expanded'] = task_id in expanded_ids
+            row['childCount'] = child_counts.get(task_id, 0)
+            ordered.append(row)
+            stack.extend(reversed(children.get(task_id, [])))
+        return ordered, next_offset
+
+    def _get_ancestor_ids(self):
+        """Ids of the ancestors of the tasks, read from their parent_path"""
+        ancestor_ids = set()
         for task in self:
-            if task.child_ids:
-                total_progress = sum(task.child_ids.mapped('progress_percent'))
-                count = len(task.child_ids)
-                task.progress_percent = total_progress / count if count > 0 else 0.0
-            else:
-                # For leaf tasks, keep existing value (default/manual entry)
-                if not task.progress_percent:
-                    task.progress_percent = 0.0
+            if task.parent_path:
+                ancestor_ids.update(int(task_id) for task_id in task.parent_path.split('/')[:-2])
+        return ancestor_ids
+
+    @api.model
+    def _rollup_progress(self, ancestor_ids):
+        """Recompute the progress of the given parent tasks from their subtasks, in one batch
+
+        Parent progress is the average of the subtasks' progress, weighted by their duration
+        when the project says so. All the subtasks of the affected ancestors are read with one
+        query, the ancestors are recomputed deepest first in memory and written back with one
+        UPDATE, so updating many leaves of a tree does not recompute it level by level.
+        """
+        if not ancestor_ids:
+            return
+        self.flush_model(['progress_percent', 'duration', 'parent_id', 'project_id'])
+        cr = self.env.cr
+        cr.execute("""
+            SELECT t.id, t.parent_path, p.progress_rollup
+              FROM project_task_simple t
+              LEFT JOIN construction_project p ON p.id = t.project_id
+             WHERE t.id IN %s
+        """, [tuple(ancestor_ids)])
+        ancestors = {task_id: (parent_path.count('/'), rollup) for task_id, parent_path, rollup in cr.fetchall()}
+        if not ancestors:
+            return
+        cr.execute("""
+            SELECT id, parent_id, progress_percent, duration
+              FROM project_task_simple
+             WHERE parent_id IN %s
+        """, [tuple(ancestors)])
+        children = defaultdict(list)
+        for task_id, parent_id, progress, duration in cr.fetchall():
+            children[parent_id].append((task_id, progress or 0.0, max(duration or 0, 1)))
+
+        progress = {}
+        for task_id in sorted(ancestors, key=lambda task_id: ancestors[task_id][0], reverse=True):
+            subtasks = children.get(task_id)
+            if not subtasks:
+                # The last subtask is gone: the task is a leaf again and keeps its progress
+                continue
+            weighted = ancestors[task_id][1] == 'duration'
+            total = weight = 0.0
+            for subtask_id, subtask_progress, duration in subtasks:
+                subtask_weight = duration if weighted else 1
+                total += progress.get(subtask_id, subtask_progress) * subtask_weight
+                weight += subtask_weight
+            progress[task_id] = total / weight
+
+        if not progress:
+            return
+        cr.execute("""
+            UPDATE project_task_simple t
+               SET progress_percent = v.progress
+              FROM unnest(%s::int[], %s::float8[]) AS v(id, progress)
+             WHERE t.id = v.id
+        """, [list(progress), list(progress.values())])
+        tasks = self.browse(list(progress))
+        tasks.invalidate_recordset(['progress_percent'])
+        # Parent tasks were written in SQL, so the project progress is queued for recompute by hand
+        projects = tasks.project_id
+        self.env.add_to_compute(projects._fields['progress_percent'], projects)
 
     @api.depends('parent_id')
     def _compute_is_subtask(self):
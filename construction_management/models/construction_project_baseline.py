@@ -0,0 +1,100 @@
+from odoo import models, fields, api
+from odoo.exceptions import UserError
+
+# Project figures copied into each baseline, as (baseline column, project column)
+BASELINE_FIGURES = [
+    ('material_cost', 'material_cost'),
+    ('labor_cost', 'labor_cost'),
+    ('equipment_cost', 'equipment_cost'),
+    ('total_cost', 'total_cost'),
+    ('progress_percent', 'progress_percent'),
+    ('total_invoiced', 'total_invoiced'),
+    ('total_paid', 'total_paid'),
+]
+
+
+class ConstructionProjectBaseline(models.Model):
+    _name = 'construction.project.baseline'
+    _description = 'Construction Project Baseline'
+    _order = 'project_id, date'
+    _rec_name = 'date'
+    # Append-only history: rows are never written again, so they carry no audit columns
+    _log_access = False
+
+    project_id = fields.Many2one('construction.project', string='Project', required=True,
+                                 ondelete='cascade', readonly=True)
+    date = fields.Date(string='Date', required=True, readonly=True)
+    currency_id = fields.Many2one(related='project_id.currency_id')
+    material_cost = fields.Monetary(string='Material Cost', readonly=True)
+    labor_cost = fields.Monetary(string='Labor Cost', readonly=True)
+    equipment_cost = fields.Monetary(string='Equipment Cost', readonly=True)
+    total_cost = fields.Monetary(string='Total Cost', readonly=True)
+    progress_percent = fields.Float(string='Progress %', readonly=True)
+    total_invoiced = fields.Monetary(string='Total Invoiced', readonly=True)
+    total_paid = fields.Monetary(string='Total Paid', readonly=True)
+
+    _sql_constraints = [
+        # Also the (project, date) index the trend charts read along
+        ('project_date_uniq', 'unique(project_id, date)', 'A project can only have one baseline per day.'),
+    ]
+
+    def write(self, vals):
+        raise UserError('Project baselines are a history and cannot be modified.')
+
+    @api.model
+    def _take_baseline(self, date=None):
+        """Record the current figures of every open project, with one INSERT for all of them
+
+        Frozen projects are recorded from their summaries, so the portfolio curves keep their
+        final figures instead of dropping on the day they are frozen. A project already
+        recorded on ``date`` (today by default) keeps its first baseline of the day. Returns
+        the number of baselines added.
+        """
+        date = date or fields.Date.context_today(self)
+        columns = [column for column, _source in BASELINE_FIGURES]
+        self.env['construction.project'].flush_model(
+            [source for _column, source in BASELINE_FIGURES] + ['state', 'is_frozen'])
+        values = ', '.join(
+            f'CASE WHEN p.is_frozen THEN s.{source} ELSE p.{source} END' for _column, source in BASELINE_FIGURES)
+        self.env.cr.execute(f"""
+            INSERT INTO {self._table} (project_id, date, {', '.join(columns)})
+            SELECT p.id, %s, {values}
+              FROM construction_project p
+              LEFT JOIN construction_project_summary s ON s.project_id = p.id
+             WHERE p.state != 'cancelled'
+            ON CONFLICT (project_id, date) DO NOTHING
+        """, [date])
+        added = self.env.cr.rowcount
+        if added:
+            self.env['construction.dashboard.snapshot'].sudo()._mark_dirty(['costTrend'])
+        return added
+
+    @api.model
+    def _cron_take_baseline(self):
+        """Daily by default; set the scheduled action to weekly for a weekly history"""
+        self._take_baseline()
+        return True
+
+    @api.model
+    def _read_trend(self, project_ids=None, date_from=None, date_to=None):
+        """Baseline figures per day, summed over the given projects (all of them when None)
+
+        An empty ``project_ids`` gives an empty trend. Progress is averaged over the projects instead of summed. Returns one dict per date.
+        """
+        domain = []
+        if project_ids is not None:
+            domain.append(('project_id', 'in', list(project_ids)))
+        if date_from:
+            domain.append(('date', '>=', date_from))
+        if date_to:
+            domain.append(('date', '<=', date_to))
+        aggregates = [
+            f'{column}:avg' if column == 'progress_percent' else f'{column}:sum'
+            for column, _source in BASELINE_FIGURES
+        ]
+        trend = []
+        for day, *values in self._read_group(domain, ['date:day'], aggregates, order='date:day'):
+            point = {'date': fields.Date.to_string(day)}
+            point.update({column: value or 0.0 for (column, _source), value in zip(BASELINE_FIGURES, values)})
+            trend.append(point)
+        return trend
@@ -0,0 +1,175 @@
+from odoo import models, fields, api
+from odoo.exceptions import UserError
+from datetime import timedelta
+
+# Project states whose figures no longer move and can be frozen
+CLOSED_STATES = ('completed', 'cancelled')
+
+# Stored project figures kept in the summary of a frozen project; the computed ones stop being recomputed
+SUMMARY_FIGURES = [
+    'material_cost',
+    'labor_cost',
+    'labor_cost_dpr',
+    'labor_cost_timesheet',
+    'equipment_cost',
+    'total_cost',
+    'e_material_cost',
+    'e_labor_cost',
+    'e_equipment_cost',
+    'e_total_cost',
+    'contract_value',
+    'total_invoiced',
+    'total_paid',
+    'progress_percent',
+]
+
+# Project inputs of the frozen figures, locked while the project is frozen
+FROZEN_INPUTS = {
+    'contract_value', 'e_contract_value', 'e_material_cost', 'e_labor_cost', 'e_equipment_cost',
+    'labor_cost_source', 'progress_rollup',
+}
+
+
+class ConstructionProjectSummary(models.Model):
+    _name = 'construction.project.summary'
+    _description = 'Construction Project Frozen Summary'
+    _order = 'frozen_on desc, id desc'
+    _rec_name = 'project_id'
+    # Written once in SQL when the project is frozen and removed when it is unfrozen
+    _log_access = False
+
+    project_id = fields.Many2one('construction.project', string='Project', required=True,
+                                 ondelete='cascade', readonly=True)
+    company_id = fields.Many2one('res.company', string='Company', readonly=True)
+    currency_id = fields.Many2one('res.currency', string='Currency', readonly=True)
+    state = fields.Selection([
+        ('completed', 'Completed'),
+        ('cancelled', 'Cancelled'),
+    ], string='Status', readonly=True)
+    frozen_on = fields.Datetime(string='Frozen On', readonly=True)
+    material_cost = fields.Monetary(string='Material Cost', readonly=True)
+    labor_cost = fields.Monetary(string='Labor Cost', readonly=True)
+    labor_cost_dpr = fields.Monetary(string='Labor Cost (DPR)', readonly=True)
+    labor_cost_timesheet = fields.Monetary(string='Labor Cost (Timesheets)', readonly=True)
+    equipment_cost = fields.Monetary(string='Equipment Cost', readonly=True)
+    total_cost = fields.Monetary(string='Total Cost', readonly=True)
+    e_material_cost = fields.Monetary(string='Expected Material Cost', readonly=True)
+    e_labor_cost = fields.Monetary(string='Expected Labor Cost', readonly=True)
+    e_equipment_cost = fields.Monetary(string='Expected Equipment Cost', readonly=True)
+    e_total_cost = fields.Monetary(string='Expected Total Cost', readonly=True)
+    contract_value = fields.Monetary(string='Contract Value', readonly=True)
+    total_invoiced = fields.Monetary(string='Total Invoiced', readonly=True)
+    total_paid = fields.Monetary(string='Total Paid', readonly=True)
+    progress_percent = fields.Float(string='Progress %', readonly=True)
+
+    _sql_constraints = [
+        ('project_uniq', 'unique(project_id)', 'A project can only have one frozen summary.'),
+    ]
+
+    def write(self, vals):
+        raise UserError('Frozen project summaries cannot be modified; unfreeze the project instead.')
+
+    @api.model
+    def _freeze(self, projects):
+        """Copy the current figures of the projects into their summaries, with one INSERT for all of them
+
+        Pending recomputes of the figures are flushed first, so the summaries hold final values.
+        """
+        projects.flush_recordset(SUMMARY_FIGURES + ['state', 'company_id', 'currency_id'])
+        self.env.cr.execute(f"""
+            INSERT INTO {self._table} (project_id, company_id, currency_id, state, frozen_on,
+                                       {', '.join(SUMMARY_FIGURES)})
+            SELECT id, company_id, currency_id, state, %s, {', '.join(SUMMARY_FIGURES)}
+              FROM construction_project
+             WHERE id IN %s
+            ON CONFLICT (project_id) DO NOTHING
+        """, [fields.Datetime.now(), tuple(projects.ids)])
+
+    @api.model
+    def _get_figures(self, project_ids):
+        """Frozen figures of the projects, as ``{project_id: {figure: value}}``"""
+        summaries = self.search_read([('project_id', 'in', list(project_ids))], ['project_id'] + SUMMARY_FIGURES)
+        return {summary.pop('project_id')[0]: summary for summary in summaries}
+
+
+class ConstructionProject(models.Model):
+    _inherit = 'construction.project'
+
+    is_frozen = fields.Boolean(string='Frozen', readonly=True, copy=False, index=True,
+                               help="Closed project whose figures are frozen into a summary: they are no "
+                                    "longer recomputed and the portfolio dashboard reads them from the summary.")
+    date_closed = fields.Date(string='Closed On', readonly=True, copy=False,
+                              help="Day the project was last completed or cancelled.")
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        today = fields.Date.context_today(self)
+        for vals in vals_list:
+            if vals.get('state') in CLOSED_STATES:
+                vals.setdefault('date_closed', today)
+        return super().create(vals_list)
+
+    def write(self, vals):
+        reopened = 'state' in vals and vals['state'] not in CLOSED_STATES
+        if not reopened and FROZEN_INPUTS.intersection(vals) and any(self.mapped('is_frozen')):
+            raise UserError('The figures of a frozen project cannot be changed; unfreeze it first.')
+        closing = self.browse()
+        if reopened:
+            vals = dict(vals, date_closed=False)
+        elif 'state' in vals:
+            closing = self.filtered(lambda project: project.state not in CLOSED_STATES)
+        result = super().write(vals)
+        if closing:
+            closing.write({'date_closed': fields.Date.context_today(self)})
+        if reopened:
+            # Reopened: its figures follow the records again
+            self.filtered('is_frozen').action_unfreeze()
+        return result
+
+    def action_freeze(self):
+        """Freeze the figures of the closed projects, which stops their cost and progress recomputes"""
+        projects = self.filtered(lambda project: project.state in CLOSED_STATES and not project.is_frozen)
+        if not projects:
+            raise UserError('Only completed or cancelled projects can be frozen.')
+        self.env['construction.project.summary'].sudo()._freeze(projects)
+        projects.write({'is_frozen': True})
+        return True
+
+    def action_unfreeze(self):
+        """Drop the frozen summaries and recompute the figures of the projects from their records"""
+        projects = self.filtered('is_frozen')
+        self.env['construction.project.summary'].sudo().search([('project_id', 'in', projects.ids)]).unlink()
+        projects.write({'is_frozen': False})
+        for name in SUMMARY_FIGURES:
+            if self._fields[name].compute:
+                self.env.add_to_compute(self._fields[name], projects)
+        return True
+
+    def _split_frozen(self, field_name):
+        """Assign ``field_name`` of the frozen projects from their summaries; return the others to compute"""
+        frozen = self.filtered('is_frozen')
+        if not frozen:
+            return self
+        figures = self.env['construction.project.summary'].sudo()._get_figures(frozen.ids)
+        for project in frozen:
+            project[field_name] = figures.get(project.id, {}).get(field_name) or 0.0
+        return self - frozen
+
+    @api.model
+    def _cron_freeze_closed_projects(self):
+        """Freeze the projects closed for longer than the configured number of days (30 by default)
+
+        Projects closed before the closing day was recorded fall back on their last change.
+        """
+        days = int(self.env['ir.config_parameter'].sudo().get_param(
+            'construction_management.freeze_closed_after_days', 30))
+        limit = fields.Date.context_today(self) - timedelta(days=days)
+        projects = self.search([
+            ('state', 'in', CLOSED_STATES),
+            ('is_frozen', '=', False),
+            '|', ('date_closed', '<', limit),
+            '&', ('date_closed', '=', False), ('write_date', '<', limit),
+        ])
+        if projects:
+            projects.action_freeze()
+        return True
@@ -0,0 +1,333 @@
+from odoo import models, fields, api
+from odoo.exceptions import ValidationError
+from collections import defaultdict, deque
+from datetime import date
+
+# Task fields moving a task on the critical path schedule
+CPM_SCHEDULE_FIELDS = {'start_date', 'end_date'}
+CPM_RESULT_FIELDS = ['early_start', 'early_finish', 'late_start', 'late_finish', 'total_float', 'is_critical']
+
+
+class ProjectTaskDependency(models.Model):
+    _name = 'project.task.simple.dependency'
+    _description = 'Project Timeline Task Dependency'
+    _rec_name = 'predecessor_id'
+
+    predecessor_id = fields.Many2one('project.task.simple', string='Predecessor', required=True,
+                                     ondelete='cascade', index=True)
+    successor_id = fields.Many2one('project.task.simple', string='Successor', required=True,
+                                   ondelete='cascade', index=True)
+    project_id = fields.Many2one(related='successor_id.project_id', store=True, index=True)
+    dependency_type = fields.Selection([
+        ('fs', 'Finish to Start'),
+        ('ss', 'Start to Start'),
+        ('ff', 'Finish to Finish'),
+    ], string='Type', default='fs', required=True)
+    lag_days = fields.Integer(string='Lag (Days)', help='Days to wait after the predecessor; negative for a lead.')
+
+    _sql_constraints = [
+        ('dependency_uniq', 'unique(predecessor_id, successor_id)', 'These tasks are already linked.'),
+        ('dependency_not_self', 'CHECK(predecessor_id != successor_id)', 'A task cannot depend on itself.'),
+    ]
+
+    @api.constrains('predecessor_id', 'successor_id')
+    def _check_dependency_graph(self):
+        for dependency in self:
+            if dependency.predecessor_id.project_id != dependency.successor_id.project_id:
+                raise ValidationError('Dependent tasks must belong to the same project.')
+        Task = self.env['project.task.simple']
+        nodes, successors, _summaries = Task._load_cpm_graph(self.successor_id.project_id.ids)
+        for project_nodes in nodes.values():
+            if Task._cpm_order(project_nodes, successors) is None:
+                raise ValidationError('Task dependencies cannot form a cycle.')
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        dependencies = super().create(vals_list)
+        (dependencies.predecessor_id | dependencies.successor_id)._update_critical_path()
+        return dependencies
+
+    def write(self, vals):
+        linked = self.predecessor_id | self.successor_id
+        result = super().write(vals)
+        (linked | self.predecessor_id | self.successor_id)._update_critical_path()
+        return result
+
+    def unlink(self):
+        linked = self.predecessor_id | self.successor_id
+        result = super().unlink()
+        linked.exists()._update_critical_path()
+        return result
+
+
+class ProjectTask(models.Model):
+    _inherit = 'project.task.simple'
+
+    predecessor_ids = fields.One2many('project.task.simple.dependency', 'successor_id', string='Predecessors')
+    successor_ids = fields.One2many('project.task.simple.dependency', 'predecessor_id', string='Successors')
+
+    # Critical path schedule, written in SQL by _update_critical_path
+    early_start = fields.Date(string='Early Start', readonly=True, copy=False)
+    early_finish = fields.Date(string='Early Finish', readonly=True, copy=False)
+    late_start = fields.Date(string='Late Start', readonly=True, copy=False)
+    late_finish = fields.Date(string='Late Finish', readonly=True, copy=False)
+    total_float = fields.Integer(string='Float (Days)', readonly=True, copy=False)
+    is_critical = fields.Boolean(string='Critical', readonly=True, copy=False, index=True)
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        tasks = super().create(vals_list)
+        tasks._update_critical_path()
+        return tasks
+
+    def write(self, vals):
+        if 'project_id' in vals or 'parent_id' in vals:
+            # Moves tasks between projects or changes which tasks are summaries: start from scratch
+            projects = self.project_id
+            result = super().write(vals)
+            self._update_project_critical_path((projects | self.project_id).ids)
+            return result
+        result = super().write(vals)
+        if CPM_SCHEDULE_FIELDS.intersection(vals):
+            self._update_critical_path()
+        return result
+
+    def unlink(self):
+        # The subtasks and dependencies go with the tasks in SQL, their neighbours and parents are
+        # rescheduled from here. Removing a task finishing the project moves the finish every late
+        # date is pulled back from, so those projects are rescheduled from scratch.
+        doomed = self.search([('id', 'child_of', self.ids)])
+        linked = (doomed.predecessor_ids.predecessor_id | doomed.successor_ids.successor_id | doomed.parent_id) - doomed
+        finishes = {
+            project.id: finish
+            for project, finish in self._read_group(
+                [('project_id', 'in', doomed.project_id.ids)], ['project_id'], ['early_finish:max'])
+        }
+        rescheduled = {
+            task.project_id.id for task in doomed
+            if task.project_id and task.early_finish and task.early_finish >= finishes[task.project_id.id]
+        }
+        result = super().unlink()
+        if rescheduled:
+            self._update_project_critical_path(list(rescheduled))
+        linked.exists().filtered(lambda task: task.project_id.id not in rescheduled)._update_critical_path()
+        return result
+
+    def _update_critical_path(self):
+        """Reschedule the tasks' projects from the tasks that changed"""
+        tasks_by_project = defaultdict(set)
+        for task in self:
+            if task.project_id:
+                tasks_by_project[task.project_id.id].add(task.id)
+        if tasks_by_project:
+            self._update_project_critical_path(list(tasks_by_project), tasks_by_project)
+
+    @api.model
+    def _load_cpm_graph(self, project_ids):
+        """Tasks and dependencies of the projects, with two queries whatever their size
+
+        Only leaf tasks are activities of the network; a parent task summarizes its subtasks,
+        and a dependency to or from it applies to each of its leaf tasks. Returns the leaf
+        tasks of each project as ``{project_id: {task_id: node}}``, where a node holds the start
+        date and duration as day ordinals and the stored schedule, the successors of each leaf
+        as ``{task_id: [(successor_id, type, lag)]}``, and the parent tasks of each project as
+        ``{project_id: {task_id: {'stored': schedule, 'leaves': [task_id]}}}``.
+        """
+        if not project_ids:
+            return {}, {}, {}
+        self.flush_model(['project_id', 'parent_id', 'start_date', 'duration'] + CPM_RESULT_FIELDS)
+        self.env['project.task.simple.dependency'].flush_model()
+        cr = self.env.cr
+        cr.execute("""
+            SELECT t.id, t.project_id, t.parent_path, t.start_date, t.duration,
+                   EXISTS(SELECT 1 FROM project_task_simple c WHERE c.parent_id = t.id AND c.project_id = t.project_id),
+                   t.early_start, t.early_finish, t.late_start, t.late_finish, t.total_float, t.is_critical
+              FROM project_task_simple t
+             WHERE t.project_id IN %s
+        """, [tuple(project_ids)])
+        nodes = defaultdict(dict)
+        summaries = defaultdict(dict)
+        for task_id, project_id, parent_path, start, duration, is_parent, *schedule in cr.fetchall():
+            stored = tuple(value.toordinal() if isinstance(value, date) else value for value in schedule)
+            if is_parent:
+                summaries[project_id][task_id] = {'stored': stored, 'leaves': []}
+            else:
+                nodes[project_id][task_id] = {
+                    'start': start.toordinal(),
+                    'duration': max(duration or 0, 1),
+                    'stored': stored,
+                    'ancestors': [int(ancestor_id) for ancestor_id in (parent_path or '').split('/')[:-2]],
+                }
+        leaves = {}
+        for project_id, project_nodes in nodes.items():
+            for task_id, node in project_nodes.items():
+                for ancestor_id in node['ancestors']:
+                    if ancestor_id in summaries[project_id]:
+                        summaries[project_id][ancestor_id]['leaves'].append(task_id)
+            leaves.update((summary_id, summary['leaves']) for summary_id, summary in summaries[project_id].items())
+
+        cr.execute("""
+            SELECT d.predecessor_id, d.successor_id, d.dependency_type, COALESCE(d.lag_days, 0)
+              FROM project_task_simple_dependency d
+              JOIN project_task_simple p ON p.id = d.predecessor_id AND p.project_id = d.project_id
+             WHERE d.project_id IN %s
+        """, [tuple(project_ids)])
+        successors = defaultdict(list)
+        for predecessor_id, successor_id, dependency_type, lag in cr.fetchall():
+            for leaf_id in leaves.get(predecessor_id, [predecessor_id]):
+                successors[leaf_id].extend(
+                    (successor_leaf_id, dependency_type, lag)
+                    for successor_leaf_id in leaves.get(successor_id, [successor_id])
+                )
+        return nodes, successors, summaries
+
+    @api.model
+    def _cpm_order(self, subset, edges):
+        """Topological order of ``subset`` along ``edges`` (Kahn), or None on a cycle"""
+        in_degree = dict.fromkeys(subset, 0)
+        for task_id in subset:
+            for linked_id, _type, _lag in edges.get(task_id, ()):
+                if linked_id in in_degree:
+                    in_degree[linked_id] += 1
+        queue = deque(task_id for task_id, degree in in_degree.items() if not degree)
+        order = []
+        while queue:
+            task_id = queue.popleft()
+            order.append(task_id)
+            for linked_id, _type, _lag in edges.get(task_id, ()):
+                if linked_id in in_degree:
+                    in_degree[linked_id] -= 1
+                    if not in_degree[linked_id]:
+                        queue.append(linked_id)
+        return order if len(order) == len(in_degree) else None
+
+    @api.model
+    def _cpm_reach(self, seeds, edges):
+        """Tasks reachable from ``seeds`` along ``edges``, the seeds included"""
+        reached = set(seeds)
+        queue = deque(reached)
+        while queue:
+            for linked_id, _type, _lag in edges.get(queue.popleft(), ()):
+                if linked_id not in reached:
+                    reached.add(linked_id)
+                    queue.append(linked_id)
+        return reached
+
+    @api.model
+    def _update_project_critical_path(self, project_ids, changed_ids=None):
+        """Compute the critical path schedule of the projects, in O(V + E) per project
+
+        Dates are inclusive, as for ``duration``: a finish-to-start successor starts the day
+        after its predecessor finishes, plus the lag. The early dates start no earlier than the
+        task's own start date; the late dates are pulled back from the project finish, the
+        latest early finish. Total float is late start minus early start, critical tasks have
+        none left.
+
+        Parent tasks span the schedule of their leaf tasks, keep their smallest float and are
+        critical when one of them is.
+
+        When ``changed_ids`` gives the tasks that changed in each project, only the tasks
+        downstream of them get new early dates and only the tasks upstream of them get new
+        late dates, unless the project finish moved. Only rows whose schedule changed are
+        written back, with one UPDATE for all the projects.
+        """
+        nodes, successors, summaries = self._load_cpm_graph(project_ids)
+        predecessors = defaultdict(list)
+        for predecessor_id, links in successors.items():
+            for successor_id, dependency_type, lag in links:
+                predecessors[successor_id].append((predecessor_id, dependency_type, lag))
+
+        updates = {}
+        for project_id, project_nodes in nodes.items():
+            project_summaries = summaries.get(project_id, {})
+            seeds = set()
+            for task_id in (changed_ids or {}).get(project_id, ()):
+                if task_id in project_summaries:
+                    seeds.update(project_summaries[task_id]['leaves'])
+                elif task_id in project_nodes:
+                    seeds.add(task_id)
+            forward = self._cpm_reach(seeds, successors) if seeds else set(project_nodes)
+            if any(project_nodes[task_id]['stored'][0] is None for task_id in project_nodes.keys() - seeds):
+                # Never scheduled, e.g. created before the engine existed: start from scratch
+                seeds = set()
+                forward = set(project_nodes)
+            order = self._cpm_order(forward, successors)
+            if order is None:
+                raise ValidationError('Task dependencies cannot form a cycle.')
+
+            early = {task_id: project_nodes[task_id]['stored'][:2] for task_id in project_nodes.keys() - forward}
+            for task_id in order:
+                node = project_nodes[task_id]
+                start = node['start']
+                for predecessor_id, dependency_type, lag in predecessors.get(task_id, ()):
+                    predecessor_start, predecessor_finish = early[predecessor_id]
+                    if dependency_type == 'fs':
+                        start = max(start, predecessor_finish + 1 + lag)
+                    elif dependency_type == 'ss':
+                        start = max(start, predecessor_start + lag)
+                    else:
+                        start = max(start, predecessor_finish + lag - node['duration'] + 1)
+                early[task_id] = (start, start + node['duration'] - 1)
+
+            finish = max(early_finish for _start, early_finish in early.values())
+            stored_finish = max((node['stored'][1] for node in project_nodes.values()
+                                 if node['stored'][1] is not None), default=None)
+            if seeds and finish == stored_finish:
+                backward = self._cpm_reach(seeds, predecessors)
+            else:
+                backward = set(project_nodes)
+            late = {task_id: project_nodes[task_id]['stored'][2:4] for task_id in project_nodes.keys() - backward}
+            for task_id in reversed(self._cpm_order(backward, successors) or []):
+                node = project_nodes[task_id]
+                late_finish = finish
+                for successor_id, dependency_type, lag in successors.get(task_id, ()):
+                    successor_start, successor_finish = late[successor_id]
+                    if dependency_type == 'fs':
+                        late_finish = min(late_finish, successor_start - 1 - lag)
+                    elif dependency_type == 'ss':
+                        late_finish = min(late_finish, successor_start - lag + node['duration'] - 1)
+                    else:
+                        late_finish = min(late_finish, successor_finish - lag)
+                late[task_id] = (late_finish - node['duration'] + 1, late_finish)
+
+            for task_id in forward | backward:
+                total_float = late[task_id][0] - early[task_id][0]
+                schedule = early[task_id] + late[task_id] + (total_float, total_float <= 0)
+                if schedule != project_nodes[task_id]['stored']:
+                    updates[task_id] = schedule
+            for summary_id, summary in project_summaries.items():
+                leaf_ids = summary['leaves']
+                floats = [late[leaf_id][0] - early[leaf_id][0] for leaf_id in leaf_ids]
+                schedule = (
+                    min(early[leaf_id][0] for leaf_id in leaf_ids),
+                    max(early[leaf_id][1] for leaf_id in leaf_ids),
+                    min(late[leaf_id][0] for leaf_id in leaf_ids),
+                    max(late[leaf_id][1] for leaf_id in leaf_ids),
+                    min(floats),
+                    min(floats) <= 0,
+                )
+                if schedule != summary['stored']:
+                    updates[summary_id] = schedule
+
+        if not updates:
+            return
+        columns = list(zip(*updates.values()))
+        to_dates = lambda ordinals: [date.fromordinal(ordinal) for ordinal in ordinals]
+        self.env.cr.execute("""
+            UPDATE project_task_simple t
+               SET early_start = v.early_start, early_finish = v.early_finish,
+                   late_start = v.late_start, late_finish = v.late_finish,
+                   total_float = v.total_float, is_critical = v.is_critical
+              FROM unnest(%s::int[], %s::date[], %s::date[], %s::date[], %s::date[], %s::int[], %s::bool[])
+                   AS v(id, early_start, early_finish, late_start, late_finish, total_float, is_critical)
+             WHERE t.id = v.id
+        """, [list(updates)] + [to_dates(values) for values in columns[:4]] + [list(columns[4]), list(columns[5])])
+        self.browse(list(updates)).invalidate_recordset(CPM_RESULT_FIELDS)
+
+
+class ConstructionProject(models.Model):
+    _inherit = 'construction.project'
+
+    def action_update_critical_path(self):
+        """Reschedule every task of the projects from scratch"""
+        self.env['project.task.simple']._update_project_critical_path(self.ids)
@@ -0,0 +1,123 @@
+from odoo import models, fields, api
+from odoo.exceptions import UserError, ValidationError
+from collections import defaultdict
+from datetime import timedelta
+
+
+class ConstructionTimelineTemplate(models.Model):
+    _name = 'construction.timeline.template'
+    _description = 'Construction Timeline Template'
+    _order = 'name'
+
+    name = fields.Char(string='Template Name', required=True, translate=True)
+    description = fields.Text(string='Description')
+    active = fields.Boolean(default=True)
+    line_ids = fields.One2many('construction.timeline.template.line', 'template_id', string='Tasks', copy=True)
+    task_count = fields.Integer(string='Tasks', compute='_compute_task_count')
+
+    @api.depends('line_ids')
+    def _compute_task_count(self):
+        for template in self:
+            template.task_count = len(template.line_ids)
+
+    def _instantiate(self, projects):
+        """Build the task tree of the template on every project, with one create per tree level
+
+        Tasks start at their offset from the project start, or from today for projects without
+        one. The tasks of all the projects are created together level by level, each level
+        knowing its parents' ids from the one before, then the dependencies with one more
+        create; mail tracking and the automatic translation of the task names are disabled, so
+        each batch costs a handful of queries. Returns the created tasks.
+        """
+        self.ensure_one()
+        Task = self.env['project.task.simple'].with_context(tracking_disable=True, skip_translation=True)
+        lines = self.line_ids
+        levels = defaultdict(list)
+        for line in lines:
+            levels[line.parent_path.count('/') - 1].append(line)
+
+        today = fields.Date.today()
+        task_ids = {}
+        for depth in sorted(levels):
+            vals_list, keys = [], []
+            for project in projects:
+                project_start = project.start_date or project.e_start_date or today
+                for line in levels[depth]:
+                    start_date = project_start + timedelta(days=line.start_offset)
+                    vals_list.append({
+                        'name': line.name,
+                        'project_id': project.id,
+                        'parent_id': task_ids[project.id, line.parent_id.id] if line.parent_id else False,
+                        'sequence': line.sequence,
+                        'start_date': start_date,
+                        'end_date': start_date + timedelta(days=max(line.duration, 1) - 1),
+                        'description': line.description,
+                    })
+                    keys.append((project.id, line.id))
+            task_ids.update(zip(keys, Task.create(vals_list).ids))
+
+        dependency_vals = [
+            {
+                'predecessor_id': task_ids[project.id, predecessor.id],
+                'successor_id': task_ids[project.id, line.id],
+                'dependency_type': 'fs',
+            }
+            for line in lines for predecessor in line.predecessor_ids for project in projects
+        ]
+        if dependency_vals:
+            self.env['project.task.simple.dependency'].create(dependency_vals)
+        return Task.browse(list(task_ids.values()))
+
+
+class ConstructionTimelineTemplateLine(models.Model):
+    _name = 'construction.timeline.template.line'
+    _description = 'Construction Timeline Template Task'
+    _order = 'sequence, start_offset, id'
+    _parent_store = True
+    _inherit = ['translation.mixin']
+
+    template_id = fields.Many2one('construction.timeline.template', string='Template', required=True,
+                                  ondelete='cascade', index=True)
+    name = fields.Char(string='Task Name', required=True, translate=True)
+    sequence = fields.Integer(string='Order', default=10)
+    parent_id = fields.Many2one('construction.timeline.template.line', string='Parent Task', ondelete='cascade',
+                                domain="[('template_id', '=', template_id)]")
+    child_ids = fields.One2many('construction.timeline.template.line', 'parent_id', string='Subtasks')
+    parent_path = fields.Char(index=True)
+    start_offset = fields.Integer(string='Start (Day)', help='Days from the project start to the task start.')
+    duration = fields.Integer(string='Days', default=1, required=True)
+    predecessor_ids = fields.Many2many('construction.timeline.template.line',
+                                       'construction_timeline_template_line_dependency_rel',
+                                       'successor_id', 'predecessor_id', string='Starts After',
+                                       domain="[('template_id', '=', template_id)]")
+    description = fields.Text(string='Description', translate=True)
+
+    @api.constrains('parent_id')
+    def _check_parent_recursion(self):
+        if not self._check_recursion():
+            raise ValidationError('You cannot create recursive task hierarchies.')
+
+    @api.constrains('parent_id', 'predecessor_ids', 'template_id')
+    def _check_same_template(self):
+        for line in self:
+            if (line.parent_id | line.predecessor_ids).template_id - line.template_id:
+                raise ValidationError('Template tasks can only be linked to tasks of the same template.')
+
+
+class ConstructionProject(models.Model):
+    _inherit = 'construction.project'
+
+    timeline_template_id = fields.Many2one('construction.timeline.template', string='Timeline Template',
+                                           help="Template to build the project timeline from; cleared once applied.")
+
+    def action_apply_timeline_template(self):
+        """Build the timeline of each project from its template, one batch per template
+
+        The template is cleared once applied, so applying again cannot duplicate the timeline.
+        """
+        projects = self.filtered('timeline_template_id')
+        if not projects:
+            raise UserError('Select a timeline template on the projects first.')
+        for template in projects.timeline_template_id:
+            template._instantiate(projects.filtered(lambda project: project.timeline_template_id == template))
+        projects.timeline_template_id = False
@@ -17,6 +17,8 @@ class ConstructionDashboard extends Component {
     setup() {
         this.orm = useService("orm");
         this.actionService = useService("action");
+        this.busService = useService("bus_service");
+        this.companyService = useService("company");
         this.state = useState({
             loading: true,
             kpis: {
@@ -28,15 +30,35 @@ class ConstructionDashboard extends Component {
             chartData: {},
         });
 
-        onWillStart(() => this.fetchKPIs());
+        // Canvas id -> widget served by get_dashboard_widget and the method drawing it
+        this.chartWidgets = {
+            projectProgressChart: { key: "projectProgressChart", render: this.renderProjectProgressChart },
+            assetsEstimationChart: { key: "assetsEstimationChart", render: this.renderAssetsEstimationChart },
+            costComparison: { key: "costComparison", render: this.rendercostComparison },
+            costBreakdownChart: { key: "costBreakdown", render: this.renderCostBreakdownChart },
+            equipmentAllocationChart: { key: "equipmentAllocation", render: this.renderEquipmentAllocationChart },
+            inventoryAllocationChart: { key: "inventoryAllocationChart", render: this.renderInventoryAllocationChart },
+            costTrendChart: { key: "costTrend", render: this.renderCostTrendChart },
+        };
+        this.loadedCharts = new Set();
+
+        onWillStart(() => Promise.all([this.fetchKPIs(), this.fetchEarnedValue()]));
+
+        // The server pushes the refreshed snapshot sections instead of us polling for them, on the
+        // channel of the snapshots of our companies
+        this.onDashboardDelta = this.onDashboardDelta.bind(this);
+        this.channel = `construction_dashboard/${[...this.companyService.activeCompanyIds].sort((a, b) => a - b).join(",")}`;
 
         onMounted(() => {
-            this._interval = setInterval(() => this.fetchKPIs(), 60000);
-            this.renderCharts();
+            this.busService.addChannel(this.channel);
+            this.busService.subscribe("construction.dashboard/delta", this.onDashboardDelta);
+            this.observeCharts();
         });
 
         onWillUnmount(() => {
-            if (this._interval) clearInterval(this._interval);
+            this.busService.unsubscribe("construction.dashboard/delta", this.onDashboardDelta);
+            this.busService.deleteChannel(this.channel);
+            if (this.chartObserver) this.chartObserver.disconnect();
             if (this.projectProgressChartInstance) this.projectProgressChartInstance.destroy();
             if (this.costBreakdownChartInstance) this.costBreakdownChartInstance.destroy();
             if (this.monthlyProgressChartInstance) this.monthlyProgressChartInstance.destroy();
@@ -44,21 +66,35 @@ class ConstructionDashboard extends Component {
             if (this.costComparisonInstance) this.costComparisonInstance.destroy();
             if (this.InventoryAllocationChartInstance) this.InventoryAllocationChartInstance.destroy();
             if (this.assetsEstimationChartInstance) this.assetsEstimationChartInstance.destroy();
+            if (this.costTrendChartInstance) this.costTrendChartInstance.destroy();
         });
     }
 
+    async fetchWidget(widgetKey, params = {}) {
+        const result = await this.orm.call(
+            "construction.dashboard.service",
+            "get_dashboard_widget",
+            [widgetKey, params],
+            {}
+        );
+        if (result.error) {
+            throw new Error(result.error);
+        }
+        if (result.metrics) {
+            // Only sent in debug mode: wall time, queries and rows of the builders behind the widget
+            console.table(result.metrics);
+        }
+        return result;
+    }
+
     async fetchKPIs() {
         try {
-            this.state.loading = true;
-            const result = await this.orm.call(
-                "construction.dashboard.service",
-                "get_dashboard_data",
-                [],
-                {}
-            );
-            this.state.kpis = Object.assign(this.state.kpis, result.kpis || {});
-            this.state.chartData = result.chartData || {};
-            setTimeout(() => this.renderCharts(), 100);
+            const result = await this.fetchWidget("kpis", { token: this.token });
+            if (result.unchanged) {
+                return;
+            }
+            this.token = result.token;
+            this.state.kpis = Object.assign(this.state.kpis, result.data || {});
         } catch (e) {
             console.warn("Construction Dashboard fetch failed", e);
         } finally {
@@ -66,6 +102,63 @@ class ConstructionDashboard extends Component {
         }
     }
 
+    async fetchEarnedValue() {
+        try {
+            const result = await this.fetchWidget("earnedValue");
+            this.state.chartData.earnedValue = result.data;
+        } catch (e) {
+            console.warn("Construction Dashboard earned value fetch failed", e);
+        }
+    }
+
+    async loadChart(canvasId) {
+        const widget = this.chartWidgets[canvasId];
+        try {
+            const result = await this.fetchWidget(widget.key);
+            this.state.chartData[widget.key] = result.data;
+            this.loadedCharts.add(canvasId);
+            widget.render();
+        } catch (e) {
+            console.warn(`Construction Dashboard widget ${widget.key} failed`, e);
+        }
+    }
+
+    observeCharts() {
+        // Charts are fetched independently, only once their canvas scrolls into view
+        if (this.chartObserver) this.chartObserver.disconnect();
+        this.chartObserver = new IntersectionObserver((entries) => {
+            for (const entry of entries) {
+                if (entry.isIntersecting) {
+                    this.chartObserver.unobserve(entry.target);
+                    this.loadChart(entry.target.id);
+                }
+            }
+        }, { rootMargin: "200px" });
+
+        for (const canvasId of Object.keys(this.chartWidgets)) {
+            const canvas = document.getElementById(canvasId);
+            if (canvas && !this.loadedCharts.has(canvasId)) {
+                this.chartObserver.observe(canvas);
+            }
+        }
+    }
+
+    onDashboardDelta(payload) {
+        if (payload.scope !== "portfolio") return;
+        const keys = new Set(payload.keys);
+        if (keys.has("kpis")) {
+            this.fetchKPIs();
+        }
+        if (keys.has("earnedValue")) {
+            this.fetchEarnedValue();
+        }
+        for (const canvasId of this.loadedCharts) {
+            if (keys.has(this.chartWidgets[canvasId].key)) {
+                this.loadChart(canvasId);
+            }
+        }
+    }
+
     openModel = (model) => {
         this.actionService.doAction({
             type: "ir.actions.act_window",
@@ -177,6 +270,41 @@ class ConstructionDashboard extends Component {
         });
     }
 
+    renderCostTrendChart = () => {
+        const canvas = document.getElementById('costTrendChart');
+        if (!canvas || !this.state.chartData.costTrend) return;
+        const ctx = canvas.getContext('2d');
+        const data = this.state.chartData.costTrend;
+
+        if (this.costTrendChartInstance) {
+            this.costTrendChartInstance.destroy();
+        }
+
+        // S-curves of the recorded baselines: cumulative cost and billing against progress
+        this.costTrendChartInstance = new Chart(ctx, {
+            type: 'line',
+            data: {
+                labels: data.map(item => item.date),
+                datasets: [
+                    { label: 'Total Cost', data: data.map(item => item.totalCost), borderColor: '#e74c3c', fill: false, yAxisID: 'y' },
+                    { label: 'Invoiced', data: data.map(item => item.invoiced), borderColor: '#3498db', fill: false, yAxisID: 'y' },
+                    { label: 'Paid', data: data.map(item => item.paid), borderColor: '#27ae60', fill: false, yAxisID: 'y' },
+                    { label: 'Progress (%)', data: data.map(item => item.progress), borderColor: '#f39c12', borderDash: [5, 5], fill: false, yAxisID: 'y1' },
+                ]
+            },
+            options: {
+                responsive: true,
+                plugins: {
+                    title: { display: true, text: 'Portfolio Cost and Progress Trend' }
+                },
+                scales: {
+                    y: { type: 'linear', position: 'left', beginAtZero: true },
+                    y1: { type: 'linear', position: 'right', min: 0, max: 100, grid: { drawOnChartArea: false } }
+                }
+            }
+        });
+    }
+
     renderMonthlyProgressChart = () => {
         const canvas = document.getElementById('monthlyProgressChart');
         if (!canvas || !this.state.chartData.monthlyProgress) return;
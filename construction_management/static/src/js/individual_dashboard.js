@@ -18,6 +18,7 @@ class ProjectDashboard extends Component {
         this.orm = useService("orm");
         this.actionService = useService("action");
         this.notification = useService("notification");
+        this.busService = useService("bus_service");
 
         // Get project_id from context
         const context = this.props.action?.context || {};
@@ -29,22 +30,64 @@ class ProjectDashboard extends Component {
             kpis: {},
             chartData: {},
             recentActivities: [],
+            activitiesCursor: null,
+            timeline: [],
+            timelineNextOffset: null,
             error: null,
         });
 
-        onWillStart(() => this.fetchProjectData());
+        // Timeline rows are read by date window: main tasks page by page, subtasks once expanded
+        this.timelinePageSize = 50;
+        this.expandedTaskIds = new Set();
+
+        // Canvas id -> widget served by get_dashboard_widget and the method drawing it
+        this.chartWidgets = {
+            projectCostComparisonChart: { key: "project.costComparison", dataKey: "costComparison", render: () => this.renderCostComparisonChart() },
+            projectMaterialConsumptionChart: { key: "project.materialConsumption", dataKey: "materialConsumption", render: () => this.renderMaterialConsumptionChart() },
+            projectCostBreakdownChart: { key: "project.costBreakdown", dataKey: "costBreakdown", render: () => this.renderCostBreakdownChart() },
+            projectLaborUtilizationChart: { key: "project.laborUtilization", dataKey: "laborUtilization", render: () => this.renderLaborUtilizationChart() },
+            projectTaskProgressChart: { key: "project.taskProgress", dataKey: "taskProgress", render: () => this.renderTaskProgressChart() },
+            projectMonthlyProgressChart: { key: "project.monthlyProgress", dataKey: "monthlyProgress", render: () => this.renderMonthlyProgressChart() },
+            projectTrendChart: { key: "project.trend", dataKey: "trend", render: () => this.renderTrendChart() },
+        };
+        this.loadedCharts = new Set();
+
+        onWillStart(() => Promise.all([this.fetchProjectData(), this.fetchTimeline()]));
+
+        // The server pushes the widgets changed by each transaction instead of us polling for them
+        this.onDashboardDelta = this.onDashboardDelta.bind(this);
 
         onMounted(() => {
-            this._interval = setInterval(() => this.fetchProjectData(), 300000); // Refresh every 5 minutes
-            this.renderCharts();
+            this.busService.addChannel("construction_dashboard");
+            this.busService.subscribe("construction.dashboard/delta", this.onDashboardDelta);
+            this.observeCharts();
         });
 
         onWillUnmount(() => {
-            if (this._interval) clearInterval(this._interval);
+            this.busService.unsubscribe("construction.dashboard/delta", this.onDashboardDelta);
+            this.busService.deleteChannel("construction_dashboard");
+            if (this.chartObserver) this.chartObserver.disconnect();
             this.destroyCharts();
         });
     }
 
+    async fetchWidget(widgetKey, params = {}) {
+        const result = await this.orm.call(
+            "construction.dashboard.service",
+            "get_dashboard_widget",
+            [widgetKey, { project_id: this.projectId, ...params }],
+            {}
+        );
+        if (result.error) {
+            throw new Error(result.error);
+        }
+        if (result.metrics) {
+            // Only sent in debug mode: wall time, queries and rows of the builders behind the widget
+            console.table(result.metrics);
+        }
+        return result;
+    }
+
     async fetchProjectData() {
         if (!this.projectId) {
             this.state.error = "No project selected";
@@ -53,33 +96,157 @@ class ProjectDashboard extends Component {
         }
 
         try {
-            this.state.loading = true;
-            const result = await this.orm.call(
-                "construction.dashboard.service",
-                "get_project_dashboard_data",
-                [this.projectId],
-                {}
-            );
-
-            if (result.error) {
-                this.state.error = result.error;
-                this.notification.add(result.error, { type: "danger" });
-            } else {
-                this.state.kpis = result.kpis || {};
-                this.state.chartData = result.chartData || {};
-                this.state.recentActivities = result.recentActivities || [];
-                this.state.error = null;
-                setTimeout(() => this.renderCharts(), 100);
+            // KPIs first so the page paints before any chart is computed
+            const result = await this.fetchWidget("project.kpis", { token: this.token });
+            if (result.unchanged) {
+                return;
             }
+            this.token = result.token;
+            this.state.kpis = result.data || {};
+            this.state.error = null;
+            this.fetchRecentActivities();
         } catch (e) {
             console.error("Project Dashboard fetch failed", e);
-            this.state.error = "Failed to load dashboard data";
-            this.notification.add("Failed to load dashboard data", { type: "danger" });
+            this.state.error = e.message || "Failed to load dashboard data";
+            this.notification.add(this.state.error, { type: "danger" });
         } finally {
             this.state.loading = false;
         }
     }
 
+    async fetchActivityPage(cursor = null) {
+        const result = await this.orm.call(
+            "construction.dashboard.service",
+            "get_project_activities",
+            [this.projectId],
+            { limit: 10, cursor }
+        );
+        if (result.error) {
+            throw new Error(result.error);
+        }
+        return result;
+    }
+
+    async fetchRecentActivities() {
+        try {
+            const result = await this.fetchActivityPage();
+            this.state.recentActivities = result.activities || [];
+            this.state.activitiesCursor = result.cursor;
+        } catch (e) {
+            console.warn("Project Dashboard activities fetch failed", e);
+        }
+    }
+
+    async loadMoreActivities() {
+        // Keyset pagination: the cursor of the last page picks up right after its last activity
+        if (!this.state.activitiesCursor) return;
+        try {
+            const result = await this.fetchActivityPage(this.state.activitiesCursor);
+            this.state.recentActivities = [...this.state.recentActivities, ...(result.activities || [])];
+            this.state.activitiesCursor = result.cursor;
+        } catch (e) {
+            console.warn("Project Dashboard activities fetch failed", e);
+        }
+    }
+
+    async fetchTimelinePage(offset, limit) {
+        const result = await this.orm.call(
+            "construction.dashboard.service",
+            "get_project_timeline",
+            [this.projectId],
+            { expanded_ids: [...this.expandedTaskIds], limit, offset }
+        );
+        if (result.error) {
+            throw new Error(result.error);
+        }
+        return result;
+    }
+
+    async fetchTimeline() {
+        // Reload the main tasks already shown, with the subtasks of the expanded ones
+        if (!this.projectId) return;
+        const loadedRoots = this.state.timeline.filter((task) => !task.parentId).length;
+        try {
+            const result = await this.fetchTimelinePage(0, Math.max(loadedRoots, this.timelinePageSize));
+            this.state.timeline = result.tasks || [];
+            this.state.timelineNextOffset = result.nextOffset;
+        } catch (e) {
+            console.warn("Project Dashboard timeline fetch failed", e);
+        }
+    }
+
+    async loadMoreTimeline() {
+        if (this.state.timelineNextOffset === null) return;
+        try {
+            const result = await this.fetchTimelinePage(this.state.timelineNextOffset, this.timelinePageSize);
+            this.state.timeline = [...this.state.timeline, ...(result.tasks || [])];
+            this.state.timelineNextOffset = result.nextOffset;
+        } catch (e) {
+            console.warn("Project Dashboard timeline fetch failed", e);
+        }
+    }
+
+    toggleTimelineTask(task) {
+        if (!task.childCount) return;
+        if (task.expanded) {
+            this.expandedTaskIds.delete(task.id);
+        } else {
+            this.expandedTaskIds.add(task.id);
+        }
+        this.fetchTimeline();
+    }
+
+    async loadChart(canvasId) {
+        const widget = this.chartWidgets[canvasId];
+        try {
+            const result = await this.fetchWidget(widget.key);
+            this.state.chartData[widget.dataKey] = result.data;
+            this.loadedCharts.add(canvasId);
+            widget.render();
+        } catch (e) {
+            console.warn(`Project Dashboard widget ${widget.key} failed`, e);
+        }
+    }
+
+    observeCharts() {
+        // Charts are fetched independently, only once their canvas scrolls into view
+        if (this.chartObserver) this.chartObserver.disconnect();
+        if (this.state.error) return;
+        this.chartObserver = new IntersectionObserver((entries) => {
+            for (const entry of entries) {
+                if (entry.isIntersecting) {
+                    this.chartObserver.unobserve(entry.target);
+                    this.loadChart(entry.target.id);
+                }
+            }
+        }, { rootMargin: "200px" });
+
+        for (const canvasId of Object.keys(this.chartWidgets)) {
+            const canvas = document.getElementById(canvasId);
+            if (canvas && !this.loadedCharts.has(canvasId)) {
+                this.chartObserver.observe(canvas);
+            }
+        }
+    }
+
+    onDashboardDelta(payload) {
+        if (payload.scope !== "project" || !payload.projectIds.includes(this.projectId)) return;
+        const keys = new Set(payload.keys);
+        if (keys.has("project.kpis")) {
+            this.fetchProjectData();
+        } else if (keys.has("project.recentActivities")) {
+            this.fetchRecentActivities();
+        }
+        if (keys.has("project.timeline")) {
+            this.fetchTimeline();
+        }
+        for (const canvasId of this.loadedCharts) {
+            if (keys.has(this.chartWidgets[canvasId].key)) {
+                this.loadChart(canvasId);
+            }
+        }
+    }
+
     destroyCharts() {
         const chartInstances = [
             'taskProgressChartInstance',
@@ -88,7 +255,8 @@ class ProjectDashboard extends Component {
             'materialConsumptionChartInstance',
             'laborUtilizationChartInstance',
             'timelineChartInstance',
-            'costComparisonChartInstance'
+            'costComparisonChartInstance',
+            'trendChartInstance'
         ];
 
         chartInstances.forEach(instance => {
@@ -202,6 +370,41 @@ class ProjectDashboard extends Component {
         });
     }
 
+    renderTrendChart() {
+        const canvas = document.getElementById('projectTrendChart');
+        if (!canvas || !this.state.chartData.trend) return;
+        const ctx = canvas.getContext('2d');
+        const data = this.state.chartData.trend;
+
+        if (this.trendChartInstance) {
+            this.trendChartInstance.destroy();
+        }
+
+        // S-curves of the recorded baselines: cumulative cost and billing against progress
+        this.trendChartInstance = new Chart(ctx, {
+            type: 'line',
+            data: {
+                labels: data.map(item => item.date),
+                datasets: [
+                    { label: 'Total Cost', data: data.map(item => item.totalCost), borderColor: '#e74c3c', fill: false, yAxisID: 'y' },
+                    { label: 'Invoiced', data: data.map(item => item.invoiced), borderColor: '#3498db', fill: false, yAxisID: 'y' },
+                    { label: 'Paid', data: data.map(item => item.paid), borderColor: '#27ae60', fill: false, yAxisID: 'y' },
+                    { label: 'Progress (%)', data: data.map(item => item.progress), borderColor: '#f39c12', borderDash: [5, 5], fill: false, yAxisID: 'y1' },
+                ]
+            },
+            options: {
+                responsive: true,
+                plugins: {
+                    title: { display: true, text: 'Cost and Progress Trend' }
+                },
+                scales: {
+                    y: { type: 'linear', position: 'left', beginAtZero: true },
+                    y1: { type: 'linear', position: 'right', min: 0, max: 100, grid: { drawOnChartArea: false } }
+                }
+            }
+        });
+    }
+
     renderMonthlyProgressChart() {
         const canvas = document.getElementById('projectMonthlyProgressChart');
         if (!canvas || !this.state.chartData.monthlyProgress) return;
@@ -436,11 +639,6 @@ class ProjectDashboard extends Component {
             target: "current",
         });
     }
-
-    refreshDashboard() {
-        this.fetchProjectData();
-        this.notification.add("Dashboard refreshed", { type: "success" });
-    }
 }
 
 ProjectDashboard.template = "construction.ProjectDashboard";
@@ -0,0 +1,103 @@
+from datetime import date
+
+from odoo.exceptions import ValidationError
+from odoo.tests import TransactionCase, tagged
+
+
+@tagged('post_install', '-at_install')
+class TestCriticalPath(TransactionCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.env = cls.env(context=dict(cls.env.context, tracking_disable=True))
+        cls.project = cls.env['construction.project'].create({'name': 'Critical Path Project'})
+
+    def _task(self, name, start_day, days, parent=None):
+        return self.env['project.task.simple'].create({
+            'name': name,
+            'project_id': self.project.id,
+            'parent_id': parent.id if parent else False,
+            'start_date': date(2025, 1, start_day),
+            'end_date': date(2025, 1, start_day + days - 1),
+        })
+
+    def _link(self, predecessor, successor, dependency_type='fs', lag=0):
+        return self.env['project.task.simple.dependency'].create({
+            'predecessor_id': predecessor.id,
+            'successor_id': successor.id,
+            'dependency_type': dependency_type,
+            'lag_days': lag,
+        })
+
+    def test_forward_and_backward_pass(self):
+        foundation = self._task('Foundation', 1, 3)
+        walls = self._task('Walls', 1, 4)
+        fence = self._task('Fence', 1, 2)
+        self._link(foundation, walls)
+
+        # Walls start the day after the foundation finishes and end the project
+        self.assertEqual((walls.early_start, walls.early_finish), (date(2025, 1, 4), date(2025, 1, 7)))
+        self.assertEqual((foundation.late_start, foundation.late_finish), (date(2025, 1, 1), date(2025, 1, 3)))
+        self.assertTrue(foundation.is_critical)
+        self.assertTrue(walls.is_critical)
+        # The fence can slip until the project finish
+        self.assertEqual(fence.late_finish, date(2025, 1, 7))
+        self.assertEqual(fence.total_float, 5)
+        self.assertFalse(fence.is_critical)
+
+    def test_lag_types(self):
+        excavation = self._task('Excavation', 1, 4)
+        shoring = self._task('Shoring', 1, 4)
+        survey = self._task('Survey', 1, 2)
+        cleanup = self._task('Cleanup', 1, 1)
+        self._link(excavation, shoring, 'ss', 2)
+        self._link(excavation, survey, 'ff', 1)
+        self._link(excavation, cleanup, 'fs', -1)
+
+        self.assertEqual(shoring.early_start, date(2025, 1, 3))
+        self.assertEqual(survey.early_finish, date(2025, 1, 5))
+        self.assertEqual(cleanup.early_start, date(2025, 1, 4))
+        self.assertEqual(shoring.early_finish, date(2025, 1, 6))
+        self.assertTrue(shoring.is_critical)
+
+    def test_reschedule_on_date_change(self):
+        foundation = self._task('Foundation', 1, 3)
+        walls = self._task('Walls', 1, 4)
+        self._link(foundation, walls)
+
+        foundation.write({'start_date': date(2025, 1, 3), 'end_date': date(2025, 1, 5)})
+        self.assertEqual(walls.early_start, date(2025, 1, 6))
+
+    def test_cycle_rejected(self):
+        first = self._task('First', 1, 1)
+        second = self._task('Second', 1, 1)
+        third = self._task('Third', 1, 1)
+        self._link(first, second)
+        self._link(second, third)
+        with self.assertRaises(ValidationError):
+            self._link(third, first)
+
+    def test_parent_task_spans_its_subtasks(self):
+        structure = self._task('Structure', 1, 10)
+        columns = self._task('Columns', 1, 2, parent=structure)
+        slabs = self._task('Slabs', 1, 3, parent=structure)
+        roof = self._task('Roof', 1, 2)
+        self._link(columns, slabs)
+        self._link(structure, roof)
+
+        # The parent is no activity of its own: it spans its subtasks, and its link holds for each of them
+        self.assertEqual((structure.early_start, structure.early_finish), (date(2025, 1, 1), date(2025, 1, 5)))
+        self.assertEqual(roof.early_start, date(2025, 1, 6))
+        self.assertEqual(structure.total_float, 0)
+        self.assertTrue(structure.is_critical)
+
+    def test_unlink_finishing_task_reschedules_project(self):
+        short = self._task('Short', 1, 2)
+        longest = self._task('Longest', 1, 6)
+        self.assertEqual(short.total_float, 4)
+
+        longest.unlink()
+        self.assertEqual(short.late_finish, date(2025, 1, 2))
+        self.assertEqual(short.total_float, 0)
+        self.assertTrue(short.is_critical)
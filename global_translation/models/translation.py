@@ -82,6 +82,9 @@ class TranslationMixin(models.AbstractModel):
 
     @api.model_create_multi
     def create(self, vals_list):
+        if self.env.context.get('skip_translation'):
+            return super().create(vals_list)
+
         start_time = datetime.now()
         user_lang = self.env.user.lang or 'en_US'
         lang_record = self.env['res.lang'].search([('code', '=', user_lang)], limit=1)